@@ -0,0 +1,95 @@
+"""
+Microbenchmark of the activation functions.
+
+Compares, on a large array, the previous implementations of the activation
+functions with the current ones, both allocating their result and writing
+it in a preallocated `out` buffer.
+
+The derivatives are also timed when computed from the cached activation
+values, as done by the backpropagation.
+
+Note that the previous Softplus overflows for input values >709 while the
+current one relies on `np.logaddexp`, which is slower but stable.
+
+>>> python -m benchmarks.bench_activation
+"""
+
+import numpy as np
+from pybann import Activation
+from benchmarks.suite import bench
+
+
+# Previous implementations
+def sigmoid(wsum, deriv=False):
+    result = 1.0 / (1.0 + np.exp(-wsum))
+    if not deriv:
+        return result
+    return result * (1.0 - result)
+
+
+def tanhyp(wsum, deriv=False):
+    result = (np.exp(wsum) - np.exp(-wsum)) / (np.exp(wsum) + np.exp(-wsum))
+    if not deriv:
+        return result
+    return 1. - result**2
+
+
+def relu(wsum, deriv=False):
+    if not deriv:
+        return np.where(wsum > 0, wsum, wsum * 0.)
+    return np.where(wsum >= 0, 1., 0.)
+
+
+def softplus(wsum, deriv=False):
+    if not deriv:
+        return np.log(1. + np.exp(wsum))
+    return sigmoid(wsum)
+
+
+def gaussian(wsum, deriv=False):
+    result = np.exp(-(wsum**2))
+    if not deriv:
+        return result
+    return -2 * wsum * result
+
+
+PREVIOUS = {
+    'sigmoid': sigmoid,
+    'tanhyp': tanhyp,
+    'relu': relu,
+    'softplus': softplus,
+    'gaussian': gaussian,
+}
+
+
+if __name__ == "__main__":
+
+    np.random.seed(0)
+    size = 1000000
+    x = np.random.randn(size) * 5.
+    out = np.empty_like(x)
+
+    print("Activation functions on {} values (best time per call, ms)".format(size))
+    print("{:<20}{:>12}{:>12}{:>12}{:>10}".format(
+        "function", "previous", "current", "out=", "speedup"))
+    for name, previous in PREVIOUS.items():
+        current = getattr(Activation, name)
+        for deriv in [False, True]:
+            label = name + (" (deriv)" if deriv else "")
+            with np.errstate(over='ignore'):
+                tprevious = bench(lambda: previous(x, deriv=deriv),
+                                  number=20, unit='ms')
+            tcurrent = bench(lambda: current(x, deriv=deriv), number=20,
+                             unit='ms')
+            tout = bench(lambda: current(x, deriv=deriv, out=out), number=20,
+                         unit='ms')
+            print("{:<20}{:>12.3f}{:>12.3f}{:>12.3f}{:>9.2f}x".format(
+                label, tprevious, tcurrent, tout, tprevious / tout))
+
+        # Derivative computed from the cached activation values
+        activated = current(x)
+        tactivated = bench(
+            lambda: current(x, deriv=True, out=out, activated=activated),
+            number=20, unit='ms')
+        print("{:<20}{:>12}{:>12}{:>12.3f}{:>9.2f}x".format(
+            name + " (activated)", "", "", tactivated, tprevious / tactivated))
@@ -0,0 +1,44 @@
+"""
+Benchmark of the prediction cache.
+
+Compares, for a tiny and a larger network model, the latency of a cache
+hit (`PredictionCache.predict_one`) with the latency of the feed forward
+of a single input vector (`Model.forward` and `FrozenModel.predict_one`),
+and the latency of a cache miss, which includes the insertion and the
+eviction of an entry.
+
+>>> python -m benchmarks.bench_cache
+"""
+
+import numpy as np
+from pybann import Model, PredictionCache
+from benchmarks.suite import bench
+
+
+if __name__ == "__main__":
+
+    np.random.seed(0)
+    print("Prediction cache (best time per call, us)")
+    print("{:<16}{:>10}{:>14}{:>10}{:>10}".format(
+        "layers", "forward", "predict_one", "hit", "miss"))
+    for layers in [[4, 9, 3], [64, 256, 256, 10]]:
+        model = Model()
+        model.addInput(neurons=layers[0])
+        for neurons in layers[1:]:
+            model.addLayer(neurons=neurons, activation="relu")
+        model.build()
+        frozen = model.freeze()
+        row = np.random.randn(layers[0])
+
+        cache = PredictionCache(frozen)
+        cache.predict_one(row)
+        thit = bench(lambda: cache.predict_one(row), number=10000)
+
+        # Every lookup misses and evicts an entry
+        rows = iter(np.random.randn(5 * 10000, layers[0]))
+        missing = PredictionCache(frozen, maxbytes=10 * 8 * (layers[0] + layers[-1]))
+        tmiss = bench(lambda: missing.predict_one(next(rows)), number=10000)
+
+        print("{:<16}{:>10.2f}{:>14.2f}{:>10.2f}{:>10.2f}".format(
+            str(layers), bench(lambda: model.forward(row), number=10000),
+            bench(lambda: frozen.predict_one(row), number=10000), thit, tmiss))
@@ -0,0 +1,50 @@
+"""
+Benchmark of the frozen (inference-only) network models.
+
+Compares the memory held by a trainable network model and by its frozen
+copy (see `Model.freeze`), and the latency of feeding forward a single
+input vector (`Model.forward` and `FrozenModel.predict_one`) and a batch
+of input vectors (`Model.predict` and `FrozenModel.predict`).
+
+>>> python -m benchmarks.bench_frozen
+"""
+
+import numpy as np
+from pybann import Model
+from benchmarks.suite import bench
+
+
+def nbytes(model: Model) -> int:
+    """
+    Return the number of bytes of the buffers of a network model.
+    """
+    return sum(buffer.nbytes for buffer in
+               (model.parameters, model.gradients, model.momentums)
+               if buffer is not None)
+
+
+if __name__ == "__main__":
+
+    np.random.seed(0)
+    print("Frozen network models (best time per call, us)")
+    print("{:<18}{:>10}{:>10}{:>10}{:>12}{:>10}{:>10}{:>12}".format(
+        "layers", "MB", "frozen", "forward", "predict_one", "speedup",
+        "predict", "frozen"))
+    for layers in [[4, 9, 3], [64, 128, 10], [256, 512, 512, 10]]:
+        model = Model()
+        model.addInput(neurons=layers[0])
+        for neurons in layers[1:]:
+            model.addLayer(neurons=neurons, activation="relu")
+        model.build()
+        frozen = model.freeze()
+
+        row = np.random.randn(layers[0])
+        batch = np.random.randn(256, layers[0])
+        tforward = bench(lambda: model.forward(row))
+        tone = bench(lambda: frozen.predict_one(row))
+        tpredict = bench(lambda: model.predict(batch), number=100)
+        tfrozen = bench(lambda: frozen.predict(batch), number=100)
+        print("{:<18}{:>10.3f}{:>10.3f}{:>10.2f}{:>12.2f}{:>9.2f}x{:>10.1f}{:>12.1f}"
+              .format(str(layers), nbytes(model) / 2**20,
+                      frozen.parameters.nbytes / 2**20,
+                      tforward, tone, tforward / tone, tpredict, tfrozen))
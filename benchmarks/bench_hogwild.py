@@ -0,0 +1,101 @@
+"""
+Benchmark of the asynchronous (Hogwild-style) multithreaded training.
+
+Trains the same network on the iris dataset, and on a larger synthetic
+dataset, with the synchronous `GradientDescent` and with
+`HogwildGradientDescent` using an increasing number of threads. Training
+runs by rounds of epochs until the loss on the dataset reaches a target,
+and the wall-clock time to target, the number of rounds and the final
+accuracy are reported.
+
+Note that each thread runs `nepoch` updates on its own shard: with the
+same `nepoch`, the network receives `nthreads` times more updates than
+with the synchronous training.
+
+>>> python -m benchmarks.bench_hogwild
+"""
+
+import time
+import numpy as np
+from pybann import Model, Dataset, CSVLoader
+from pybann import GradientDescent, HogwildGradientDescent
+from benchmarks.suite import create_model
+
+
+def evaluate(model: Model, data: Dataset) -> tuple:
+    """
+    Return the loss and the accuracy of the network model on a dataset.
+    """
+    results = model.predict(data.inputs)
+    loss = np.mean(np.sum((data.targets - results)**2, axis=1))
+    accuracy = np.mean(
+        np.argmax(results, axis=1) == np.argmax(data.targets, axis=1))
+    return loss, accuracy
+
+
+def train(model: Model, data: Dataset, nthreads: int, target: float,
+          batchsize: int, alpha: float, nepoch: int, maxrounds: int) -> tuple:
+    """
+    Train by rounds of `nepoch` epochs until the loss reaches the target.
+
+    Returns the training time (s), the number of rounds, the final loss
+    and the final accuracy.
+    """
+    buffers = (model.parameters, model.gradients, model.momentums)
+    elapsed = 0.
+    for iround in range(1, maxrounds + 1):
+        if nthreads == 0:
+            descent = GradientDescent(
+                data, batchsize, alpha, nepoch, 0.9, model.layers,
+                buffers=buffers, seed=iround)
+        else:
+            descent = HogwildGradientDescent(
+                data, batchsize, alpha, nepoch, 0.9, model,
+                seed=iround, nthreads=nthreads)
+
+        start = time.perf_counter()
+        descent.run()
+        elapsed += time.perf_counter() - start
+
+        loss, accuracy = evaluate(model, data)
+        if loss <= target:
+            break
+    return elapsed, iround, loss, accuracy
+
+
+def bench(name: str, layers: list, data: Dataset, target: float,
+          batchsize: int, alpha: float, nepoch: int, maxrounds: int) -> None:
+
+    print("{}: {} samples, layers {}, batch size {}, target loss {}".format(
+        name, len(data), layers, batchsize, target))
+    print("{:<16}{:>10}{:>10}{:>10}{:>10}".format(
+        "mode", "time (s)", "rounds", "loss", "accuracy"))
+    ninputs, width, noutputs = layers
+    for nthreads in [0, 1, 2, 4]:
+        label = "synchronous" if nthreads == 0 else \
+            "hogwild x{}".format(nthreads)
+        np.random.seed(0)
+        model = create_model(ninputs, width, 1, noutputs,
+                             activation="sigmoid")
+        elapsed, rounds, loss, accuracy = train(
+            model, data, nthreads, target, batchsize, alpha, nepoch,
+            maxrounds)
+        print("{:<16}{:>10.3f}{:>10}{:>10.4f}{:>10.3f}".format(
+            label, elapsed, rounds, loss, accuracy))
+    print()
+
+
+if __name__ == "__main__":
+
+    iris = CSVLoader(
+        'data/iris/iris.data',
+        labels=["Iris-setosa", "Iris-versicolor", "Iris-virginica"]).load()
+    bench("iris", [4, 9, 3], iris, target=0.15,
+          batchsize=10, alpha=0.05, nepoch=100, maxrounds=100)
+
+    rng = np.random.default_rng(0)
+    inputs = rng.standard_normal((20000, 8))
+    labels = np.argmax(inputs[:, :4], axis=1)
+    synthetic = Dataset(inputs, np.eye(4)[labels])
+    bench("synthetic", [8, 64, 4], synthetic, target=0.3,
+          batchsize=256, alpha=0.005, nepoch=50, maxrounds=40)
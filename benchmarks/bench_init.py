@@ -0,0 +1,78 @@
+"""
+Benchmark of the initializers of the weights and biases.
+
+Trains network models of sigmoid and tanh hidden layers of increasing
+widths on the iris dataset, their weights being drawn from unscaled normal
+values (previous default) or by the variance-scaling initializers (Xavier,
+LeCun) with zero biases. The training (whole dataset, momentum) stops when
+the loss on the dataset reaches a target, and the median number of epochs
+to target over several seeds is reported, with the number of seeds
+reaching the target within the maximum number of epochs.
+
+>>> python -m benchmarks.bench_init
+"""
+
+import numpy as np
+from pybann import Model, CSVLoader, Callback
+
+
+class Target(Callback):
+    """
+    Stop the training when the loss reaches a target, and keep the epoch.
+    """
+
+    def __init__(self, target: float) -> None:
+        self.target = target
+        self.epoch = None
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        if logs['loss'] <= self.target:
+            self.epoch = epoch + 1
+            return True
+        return False
+
+
+def epochs_to_target(data, width: int, activation: str, init: str,
+                     bias_init: str, seed: int, target: float,
+                     nepoch: int) -> int:
+    """
+    Return the number of epochs to reach the target loss, or `None`.
+    """
+    model = Model(seed=seed)
+    model.addInput(neurons=4)
+    model.addLayer(neurons=width, activation=activation, init=init,
+                   bias_init=bias_init)
+    model.addLayer(neurons=3, activation="sigmoid", init=init,
+                   bias_init=bias_init)
+    model.build()
+
+    stop = Target(target)
+    model.SGD(data, batchsize=0, alpha=1.e-3, momentum=0.9, nepoch=nepoch,
+              seed=seed, callbacks=[stop], verbose=False)
+    return stop.epoch
+
+
+if __name__ == "__main__":
+
+    loader = CSVLoader('data/iris/iris.data',
+                       labels=["Iris-setosa", "Iris-versicolor",
+                               "Iris-virginica"])
+    data = loader.load()
+    target, nepoch, seeds = 0.15, 5000, range(10)
+
+    print("Epochs to a loss of {} on iris (median over {} seeds, max {})"
+          .format(target, len(seeds), nepoch))
+    print("{:<10}{:>7}{:>12}{:>10}{:>10}".format(
+        "hidden", "width", "init", "epochs", "reached"))
+    for activation in ["sigmoid", "tanhyp"]:
+        for width in [9, 64, 256]:
+            for init, bias_init in [("normal", "normal"), ("xavier", "zeros"),
+                                    ("lecun", "zeros")]:
+                epochs = [epochs_to_target(data, width, activation, init,
+                                           bias_init, seed, target, nepoch)
+                          for seed in seeds]
+                reached = [epoch for epoch in epochs if epoch is not None]
+                print("{:<10}{:>7}{:>12}{:>10}{:>7}/{}".format(
+                    activation, width, init,
+                    int(np.median(reached)) if reached else "-",
+                    len(reached), len(seeds)))
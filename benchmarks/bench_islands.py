@@ -0,0 +1,74 @@
+"""
+Scaling benchmark of the island model of particle swarm optimization.
+
+Trains the same network with `IslandSwarm` using an increasing number of
+islands (worker processes), either with a fixed total number of particles
+shared between the islands (strong scaling), or with a fixed number of
+particles per island (weak scaling). The single-process `ParticleSwarm` is
+the reference. The wall-clock time, the speedup (strong scaling) or
+efficiency (weak scaling) and the final loss are reported.
+
+The speedup is bounded by the number of available cores.
+
+>>> python -m benchmarks.bench_islands
+"""
+
+import os
+import time
+import numpy as np
+from pybann import Dataset, ParticleSwarm, IslandSwarm
+from benchmarks.suite import create_model
+
+
+def train(layers: list, data: Dataset, islands: int, nparticles: int,
+          **options) -> tuple:
+    """
+    Return the training time (s) and the final loss.
+    """
+    ninputs, width, noutputs = layers
+    np.random.seed(0)
+    model = create_model(ninputs, width, 1, noutputs, activation="tanhyp",
+                         output="tanhyp")
+    if islands == 1:
+        swarm = ParticleSwarm(data, model, nparticles=nparticles, **options)
+    else:
+        swarm = IslandSwarm(data, model, nparticles=nparticles,
+                            islands=islands, **options)
+
+    start = time.perf_counter()
+    swarm.run()
+    elapsed = time.perf_counter() - start
+
+    results = model.predict(data.inputs)
+    return elapsed, np.mean(np.sum((data.targets - results)**2, axis=1))
+
+
+if __name__ == "__main__":
+
+    layers = [16, 32, 4]
+    rng = np.random.default_rng(0)
+    inputs = rng.standard_normal((2048, layers[0]))
+    data = Dataset(inputs, np.tanh(inputs[:, :layers[-1]]))
+    options = dict(nepoch=100, batchsize=512, migration=10, seed=0)
+    counts = [n for n in [1, 2, 4, 8] if n <= max(os.cpu_count(), 2)]
+
+    print("Island model PSO, layers {}, {} samples, {} cores".format(
+        layers, len(data), os.cpu_count()))
+    for scaling, total in [("strong", 256), ("weak", 64)]:
+        print()
+        print("{} scaling ({} particles {})".format(
+            scaling, total, "in total" if scaling == "strong" else "per island"))
+        print("{:<10}{:>12}{:>12}{:>12}{:>10}".format(
+            "islands", "particles", "time (s)",
+            "speedup" if scaling == "strong" else "efficiency", "loss"))
+        for islands in counts:
+            nparticles = total // islands if scaling == "strong" else total
+            kwargs = dict(options)
+            if islands == 1:
+                del kwargs['migration']
+            elapsed, loss = train(layers, data, islands, nparticles, **kwargs)
+            if islands == 1:
+                reference = elapsed
+            ratio = reference / elapsed
+            print("{:<10}{:>12}{:>12.3f}{:>12.2f}{:>10.4f}".format(
+                islands, nparticles * islands, elapsed, ratio, loss))
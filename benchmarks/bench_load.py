@@ -0,0 +1,51 @@
+"""
+Benchmark of the loading of network models.
+
+Compares, for networks of increasing size, the time to load a network
+model saved using Pickle with the time to load the binary format, either
+memory-mapped (the default) or read in memory, and the size of the files.
+
+>>> python -m benchmarks.bench_load
+"""
+
+import os
+import tempfile
+import numpy as np
+from pybann import Model
+from benchmarks.suite import bench
+
+
+def load(filename: str, **options) -> Model:
+    model = Model()
+    model.load(filename, **options)
+    return model
+
+
+if __name__ == "__main__":
+
+    print("Loading of network models (best time per call, ms)")
+    print("{:<14}{:>12}{:>10}{:>10}{:>10}{:>10}{:>10}".format(
+        "parameters", "pickle (MB)", "pickle", "bin (MB)", "memmap",
+        "read", "speedup"))
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, "network.pickle")
+        filename = os.path.join(directory, "network.bann")
+
+        for width in [64, 256, 1024, 2048]:
+            model = Model()
+            model.addInput(neurons=width)
+            for _ in range(3):
+                model.addLayer(neurons=width, activation="relu")
+            model.build()
+            model.save(pickled, pickled=True)
+            model.save(filename)
+
+            tpickle = bench(lambda: load(pickled), number=5, unit='ms')
+            tmemmap = bench(lambda: load(filename), number=5, unit='ms')
+            tread = bench(lambda: load(filename, mmap_mode=None), number=5,
+                          unit='ms')
+            print("{:<14}{:>12.1f}{:>10.3f}{:>10.1f}{:>10.3f}{:>10.3f}{:>9.1f}x"
+                  .format(len(model.parameters),
+                          os.path.getsize(pickled) / 2**20, tpickle,
+                          os.path.getsize(filename) / 2**20, tmemmap, tread,
+                          tpickle / tmemmap))
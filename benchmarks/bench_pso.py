@@ -0,0 +1,67 @@
+"""
+Benchmark of the evaluation of a particle swarm.
+
+Compares, for an increasing number of particles, the time to compute the
+loss of every particle on a minibatch with the batched feed forward of
+`ParticleSwarm.evaluate` and with a loop of `Model.predict` calls, one per
+particle, and reports the cost of a swarm iteration relative to a single
+feed forward.
+
+The number of operations grows with the number of particles either way:
+the batched evaluation saves the per-particle overhead (Python loop,
+copies of the weights and biases, allocations), which dominates for small
+networks.
+
+>>> python -m benchmarks.bench_pso
+"""
+
+import numpy as np
+from pybann import Model, Dataset, ParticleSwarm
+from benchmarks.suite import bench
+
+
+def loop(model: Model, swarm: ParticleSwarm, data: Dataset) -> np.array:
+    """
+    Return the loss of every particle using one feed forward per particle.
+    """
+    parameters = model.parameters.copy()
+    losses = np.empty(swarm.nparticles)
+    for i, position in enumerate(swarm.positions):
+        model.parameters[...] = position
+        results = model.predict(data.inputs)
+        losses[i] = np.mean(np.sum((data.targets - results)**2, axis=1))
+    model.parameters[...] = parameters
+    return losses
+
+
+if __name__ == "__main__":
+
+    np.random.seed(0)
+    layers = [16, 32, 32, 4]
+    batchsize = 256
+    data = Dataset(np.random.randn(batchsize, layers[0]),
+                   np.random.rand(batchsize, layers[-1]))
+
+    model = Model()
+    model.addInput(neurons=layers[0])
+    for neurons in layers[1:]:
+        model.addLayer(neurons=neurons, activation="tanhyp")
+    model.build()
+
+    tforward = bench(lambda: model.predict(data.inputs), number=10, unit='ms')
+    print("Swarm evaluation, layers {}, batch size {} (best time per call, ms)"
+          .format(layers, batchsize))
+    print("single feed forward: {:.3f}".format(tforward))
+    print("{:<12}{:>12}{:>12}{:>10}{:>14}".format(
+        "particles", "loop", "batched", "speedup", "x forward"))
+    for nparticles in [8, 32, 128, 512]:
+        swarm = ParticleSwarm(data, model, nparticles=nparticles, seed=0)
+        np.testing.assert_allclose(
+            swarm.evaluate(data.inputs, data.targets),
+            loop(model, swarm, data), rtol=1.e-8)
+        tloop = bench(lambda: loop(model, swarm, data), number=2, unit='ms')
+        tbatched = bench(
+            lambda: swarm.evaluate(data.inputs, data.targets), number=2,
+            unit='ms')
+        print("{:<12}{:>12.3f}{:>12.3f}{:>9.2f}x{:>14.1f}".format(
+            nparticles, tloop, tbatched, tloop / tbatched, tbatched / tforward))
@@ -0,0 +1,98 @@
+"""
+Comparison of two runs of the benchmark suite (see `benchmarks/suite.py`).
+
+The best times per call of the stages run in both files are compared. A
+change is reported as faster or slower only when the ratio of the best
+times is beyond `--threshold`, and beyond the noise of the two runs
+(relative interquartile range of their repeats); it is reported as
+unchanged otherwise.
+
+>>> python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+import json
+import sys
+from benchmarks.suite import key
+
+
+def compare(baseline: dict, results: dict, threshold: float = 0.05) -> list:
+    """
+    Return the comparison of the results of the stages run in both reports
+
+    Parameters
+    ----------
+    baseline: dict
+        report of the reference run
+    results: dict
+        report of the compared run
+    threshold: float, optional
+        minimum relative change of the best time reported as a change
+        (default: 0.05)
+
+    Returns
+    -------
+    comparison: list
+        (baseline result, result, ratio of the best times, verdict) tuples,
+        the verdict being 'faster', 'slower' or 'unchanged'
+    """
+    reference = {key(result): result for result in baseline['results']}
+    comparison = []
+    for result in results['results']:
+        base = reference.get(key(result))
+        if base is None:
+            continue
+        ratio = result['min'] / base['min']
+        noise = max(threshold, base['iqr'] / base['median'],
+                    result['iqr'] / result['median'])
+        verdict = 'unchanged'
+        if ratio < 1. - noise:
+            verdict = 'faster'
+        elif ratio > 1. + noise:
+            verdict = 'slower'
+        comparison.append((base, result, ratio, verdict))
+    return comparison
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare two runs of the pybann benchmark suite.")
+    parser.add_argument("baseline", help="JSON file of the reference run")
+    parser.add_argument("results", help="JSON file of the compared run")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="minimum relative change reported (default: 0.05)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 when a stage is slower")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.results) as f:
+        results = json.load(f)
+
+    for name in ('numpy', 'python', 'platform'):
+        if baseline['metadata'].get(name) != results['metadata'].get(name):
+            print("Warning: different {} ({} and {})".format(
+                name, baseline['metadata'].get(name),
+                results['metadata'].get(name)))
+
+    comparison = compare(baseline, results, args.threshold)
+    print("{:<16}{:<18}{:>7}{:>9}{:>12}{:>12}{:>9}  {}".format(
+        "stage", "layers", "batch", "dtype", "base (us)", "new (us)",
+        "speedup", "verdict"))
+    for base, result, ratio, verdict in comparison:
+        print("{:<16}{:<18}{:>7}{:>9}{:>12.2f}{:>12.2f}{:>8.2f}x  {}".format(
+            result['stage'], str(result['layers']), result['batchsize'],
+            result['dtype'], base['min'], result['min'], 1. / ratio, verdict))
+
+    verdicts = [verdict for _, _, _, verdict in comparison]
+    print("{} faster, {} slower, {} unchanged".format(
+        verdicts.count('faster'), verdicts.count('slower'),
+        verdicts.count('unchanged')))
+    if args.fail_on_regression and 'slower' in verdicts:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Load test of the inference server (see `pybann.serving`).
+
+Opens concurrent connections to a localhost server, each sending its
+prediction requests one after the other (closed loop), and reports the
+throughput and the p50/p99 latencies measured by the clients, as well as
+the statistics of the server.
+
+Unless the port of a running server is given, a server is started for a
+random network model with each of the given maximum micro-batch sizes, so
+that dynamic micro-batching can be compared with serving the requests one
+at a time (maximum batch size of 1).
+
+>>> python -m benchmarks.loadtest_serving --connections 32 --requests 200
+>>> python -m pybann.serving network.bann --port 8765 &
+>>> python -m benchmarks.loadtest_serving --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.suite import create_model
+
+
+async def client(host: str, port: int, ninputs: int, nrequests: int,
+                 latencies: list) -> None:
+    """
+    Send `nrequests` requests, one after the other, recording their latency.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = np.random.default_rng()
+    for i in range(nrequests):
+        line = json.dumps({'id': i, 'inputs': rng.standard_normal(ninputs)
+                           .tolist()}).encode('utf-8') + b'\n'
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+    writer.close()
+
+
+async def stats(host: str, port: int) -> dict:
+    """
+    Return the statistics of the server.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"stats": true}\n')
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+async def loadtest(host: str, port: int, ninputs: int, connections: int,
+                   nrequests: int) -> tuple:
+    """
+    Return the throughput (requests/s), the p50 and p99 latencies (ms) and
+    the statistics of the server.
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, ninputs, nrequests, latencies)
+                           for _ in range(connections)])
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1.e3
+    return len(latencies) / elapsed, p50, p99, await stats(host, port)
+
+
+def start_server(filename: str, port: int, max_batch_size: int):
+    """
+    Start a server in a subprocess, and wait until it accepts connections.
+    """
+    server = subprocess.Popen(
+        [sys.executable, "-m", "pybann.serving", filename, "--port", str(port),
+         "--max-batch-size", str(max_batch_size)], stderr=subprocess.DEVNULL)
+
+    async def wait():
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError("The server did not start.")
+
+    asyncio.run(wait())
+    return server
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="port of a running server")
+    parser.add_argument("--inputs", type=int, default=64,
+                        help="number of input values")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="number of requests per connection")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64],
+                        help="maximum micro-batch sizes of the started servers")
+    args = parser.parse_args()
+
+    print("{} connections x {} requests".format(args.connections, args.requests))
+    print("{:<16}{:>14}{:>10}{:>10}{:>12}".format(
+        "max batch size", "requests/s", "p50 (ms)", "p99 (ms)", "mean batch"))
+
+    def report(label, results):
+        throughput, p50, p99, summary = results
+        print("{:<16}{:>14.0f}{:>10.2f}{:>10.2f}{:>12.1f}".format(
+            label, throughput, p50, p99, summary['batch_size']))
+
+    if args.port is not None:
+        report("-", asyncio.run(loadtest(
+            args.host, args.port, args.inputs, args.connections, args.requests)))
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "network.bann")
+        create_model(args.inputs, 256, 2, 10).save(filename)
+
+        for max_batch_size in args.batch_sizes:
+            server = start_server(filename, 8765, max_batch_size)
+            try:
+                report(max_batch_size, asyncio.run(loadtest(
+                    "127.0.0.1", 8765, args.inputs, args.connections,
+                    args.requests)))
+            finally:
+                server.terminate()
+                server.wait()
@@ -0,0 +1,214 @@
+"""
+Benchmark suite of the feed forward, backpropagation, update and training.
+
+For each network model, built from the layer widths, the number of hidden
+layers (depth), the batch size and the dtype given on the command line,
+the following stages are timed:
+
+- `model.forward`: `Model.forward` of a single input vector
+- `model.predict`: `Model.predict` of a batch of input vectors
+- `forward`: `GradientDescent.forward` of a minibatch
+- `backward`: `GradientDescent.backward` of a minibatch
+- `update`: `GradientDescent.update` (momentum optimizer)
+- `epoch`: `Model.SGD` over the whole dataset (`--nsamples` samples), by
+  minibatches of the batch size
+
+Each stage is called in a loop lasting at least `--min-time` seconds, and
+the loop is repeated `--repeat` times. The best time per call is the
+figure to compare between two runs, the median and the interquartile range
+(IQR) of the repeats measuring the noise. For stable figures, pin the
+number of BLAS threads (e.g. `OMP_NUM_THREADS=1`) and run on an idle
+machine.
+
+The results are printed as a table and saved to JSON with `--output`, to be
+compared with `benchmarks/compare.py`.
+
+>>> python -m benchmarks.suite --widths 32 256 --depths 1 3 \\
+...     --batch-sizes 1 64 --dtypes float64 float32 --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import timeit
+import numpy as np
+import pybann
+from pybann import Model
+from pybann import Dataset
+from pybann import GradientDescent
+
+
+STAGES = ['model.forward', 'model.predict', 'forward', 'backward', 'update',
+          'epoch']
+
+
+UNITS = {'s': 1., 'ms': 1.e3, 'us': 1.e6}
+
+
+def bench(function, number: int = 1000, repeat: int = 5,
+          unit: str = 'us') -> float:
+    """
+    Return the best time per call of `function` over `repeat` loops of
+    `number` calls, in `unit` ('s', 'ms' or 'us').
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) \
+        / number * UNITS[unit]
+
+
+def measure(function, repeat: int = 7, min_time: float = 0.05) -> dict:
+    """
+    Time `function`, called in loops lasting at least `min_time` seconds,
+    and return the number of calls per loop and the times per call (us) of
+    the `repeat` loops, with their minimum, median and interquartile range.
+    """
+    timer = timeit.Timer(function)
+    timer.timeit(number=1)  # Warm up
+
+    # Calibrate the number of calls per loop
+    number = 1
+    while True:
+        total = timer.timeit(number=number)
+        if total >= min_time:
+            break
+        number = max(2 * number, int(np.ceil(1.2 * number * min_time
+                                             / max(total, 1.e-9))))
+    times = np.array(timer.repeat(repeat=repeat, number=number)) / number * 1.e6
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {'number': number, 'times': times.tolist(), 'min': times.min(),
+            'median': median, 'iqr': q3 - q1}
+
+
+def create_model(ninputs: int, width: int, depth: int, noutputs: int,
+                 dtype=np.float64, activation: str = "relu",
+                 output: str = "sigmoid") -> Model:
+    """
+    Return a built network model with `depth` hidden layers of `width`
+    neurons, of the `activation` function (default: ReLU), and an output
+    layer of the `output` function (default: sigmoid).
+
+    The weights and biases are drawn from the `np.random` global state: seed
+    it for the same network model between the calls.
+    """
+    model = Model()
+    model.addInput(neurons=ninputs)
+    for _ in range(depth):
+        model.addLayer(neurons=width, activation=activation)
+    model.addLayer(neurons=noutputs, activation=output)
+    model.build(dtype=dtype)
+    return model
+
+
+def bench_case(width: int, depth: int, batchsize: int, dtype, nsamples: int,
+               repeat: int, min_time: float, stages: list = STAGES) -> list:
+    """
+    Return the results of the stages for a network model.
+    """
+    np.random.seed(0)
+    ninputs, noutputs = width, 10
+    model = create_model(ninputs, width, depth, noutputs, dtype)
+    layers = [layer.neurons for layer in model.layers]
+    dataset = Dataset(np.random.randn(nsamples, ninputs),
+                      np.random.rand(nsamples, noutputs), dtype=dtype)
+    invalues, outvalues = dataset.batch(batchsize)
+
+    descent = GradientDescent(
+        dataset, batchsize, 1.e-3, 1, 0.5, model.layers,
+        buffers=(model.parameters, model.gradients, model.momentums))
+    activation, transfer = descent.forward(invalues)
+    nepoch = -(-nsamples // batchsize)
+
+    # The backpropagation overwrites the transfer values with the
+    # derivatives, and the updates modify the weights: repeating them
+    # does the same amount of work on different values
+    functions = {
+        'model.forward': (lambda: model.forward(invalues[0]), 1),
+        'model.predict': (lambda: model.predict(invalues), batchsize),
+        'forward': (lambda: descent.forward(invalues), batchsize),
+        'backward': (lambda: descent.backward(activation, transfer, outvalues),
+                     batchsize),
+        'update': (descent.update, batchsize),
+        'epoch': (lambda: model.SGD(dataset, batchsize=batchsize, alpha=1.e-3,
+                                    nepoch=nepoch, seed=0, verbose=False),
+                  nsamples),
+    }
+
+    results = []
+    for stage in stages:
+        function, nsamples_call = functions[stage]
+        result = {'stage': stage, 'layers': layers, 'width': width,
+                  'depth': depth, 'batchsize': batchsize,
+                  'dtype': np.dtype(dtype).name}
+        result.update(measure(function, repeat, min_time))
+        result['throughput'] = nsamples_call / result['min'] * 1.e6
+        results.append(result)
+    return results
+
+
+def key(result: dict) -> tuple:
+    """
+    Return the key identifying the case and stage of a result.
+    """
+    return (result['stage'], result['width'], result['depth'],
+            result['batchsize'], result['dtype'])
+
+
+def metadata(args) -> dict:
+    """
+    Return the description of the environment of a run.
+    """
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'pybann': pybann.__version__, 'platform': platform.platform(),
+            'machine': platform.machine(), 'processor': platform.processor(),
+            'args': vars(args)}
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stages of the training of pybann.")
+    parser.add_argument("--widths", type=int, nargs="+", default=[32, 256],
+                        help="numbers of neurons of the hidden layers")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 3],
+                        help="numbers of hidden layers")
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=[1, 64])
+    parser.add_argument("--dtypes", nargs="+", default=["float64", "float32"])
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--nsamples", type=int, default=1024,
+                        help="number of samples of an epoch")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="minimum duration of a timing loop (s)")
+    parser.add_argument("--output", help="JSON file of the results")
+    args = parser.parse_args(argv)
+
+    print("{:<16}{:<18}{:>7}{:>9}{:>12}{:>12}{:>8}{:>14}".format(
+        "stage", "layers", "batch", "dtype", "min (us)", "median", "IQR%",
+        "samples/s"))
+    results = []
+    for dtype in args.dtypes:
+        for width in args.widths:
+            for depth in args.depths:
+                for batchsize in args.batch_sizes:
+                    for result in bench_case(width, depth, batchsize, dtype,
+                                             args.nsamples, args.repeat,
+                                             args.min_time, args.stages):
+                        results.append(result)
+                        print("{:<16}{:<18}{:>7}{:>9}{:>12.2f}{:>12.2f}"
+                              "{:>7.1f}%{:>14.0f}".format(
+                                  result['stage'], str(result['layers']),
+                                  batchsize, result['dtype'], result['min'],
+                                  result['median'],
+                                  100. * result['iqr'] / result['median'],
+                                  result['throughput']))
+
+    report = {'metadata': metadata(args), 'results': results}
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import numpy as np
-from pybann import Model
+from pybann import Model, Dataset, CSVLoader
 
 #import network
 # Initialize network
@@ -8,46 +8,37 @@ network = Model(name='IRIS example')
 
 network.addInput(neurons=4)
 network.addLayer(neurons=9, activation="sigmoid")
-network.addLayer(neurons=3, activation="sigmoid")
+network.addLayer(neurons=3, activation="softmax")
 
 network.build()
 
 # Read data
-with open('data/iris/iris.data', 'r') as f:
-    lines = f.readlines()
-    inData = []
-    inDataTest = []
-    train = True
-    for line in lines:
-        line = line.strip().split(",")
-        if len(line) > 1:
-            inValues = (float(line[0]), float(line[1]), float(line[2]), float(line[3]))
-            if line[-1] == "Iris-setosa":
-                attempted = (1, 0, 0)
-            if line[-1] == "Iris-versicolor":
-                attempted = (0, 1, 0)
-            if line[-1] == "Iris-virginica":
-                attempted = (0, 0, 1)
-            if train == True:
-                inData.append(list((inValues, attempted)))
-                train = False
-            else:
-                inDataTest.append(list((inValues, attempted)))
-                train = True
-
-network.SGD(dataset=inData, batchsize=50, alpha=1.e-3, momentum=0.9, nepoch=1000)
-
-loss = 0.
-for i in range(len(inDataTest)):
-    result = network.forward(inValues=inDataTest[i][0])
-    loss += np.sum((inDataTest[i][1]-result)**2)
-
-loss /= float(len(inDataTest))
-
-print('LOSS:: ', loss, (1-loss)*100)
+loader = CSVLoader('data/iris/iris.data',
+                   labels=["Iris-setosa", "Iris-versicolor", "Iris-virginica"])
+data = loader.load()
+
+# One sample out of three for training, validation and testing
+inData = Dataset(data.inputs[0::3], data.targets[0::3])
+inDataValidation = Dataset(data.inputs[1::3], data.targets[1::3])
+inDataTest = Dataset(data.inputs[2::3], data.targets[2::3])
+
+# Minimize the cross-entropy of the softmax outputs, and stop when the
+# validation loss does not improve for 10 evaluations
+network.SGD(dataset=inData, batchsize=25, alpha=1.e-3, momentum=0.9, nepoch=1000,
+            validation=inDataValidation, patience=10, interval=10,
+            loss="crossentropy")
+
+results = network.evaluate(inDataTest.inputs, inDataTest.targets,
+                           loss="crossentropy")
+loss = results['loss']
+
+print('LOSS:: ', loss)
+print('ACCURACY:: ', results['accuracy'])
+print('CONFUSION::')
+print(results['confusion'])
 
 # Example
-print("EXAMPLE::", inData[42])
-results = network.forward(inValues=inData[42][0])
+print("EXAMPLE::", inData.inputs[42], inData.targets[42])
+results = network.forward(inValues=inData.inputs[42])
 print("RESULT::")
-print("* ", results, inData[42][1])
\ No newline at end of file
+print("* ", results, inData.targets[42])
@@ -3,8 +3,23 @@ PyBANN is a Python Basic Artificial Neural Network.
 """
 
 from .activation import Activation
+from .initializers import Initializer
 from .layers import Layer
+from .dataset import Dataset
+from .loader import CSVLoader
+from .workspace import Workspace
+from .optimizers import Optimizer, Momentum, Nesterov, RMSProp, Adam
+from .losses import Loss, MSE, CrossEntropy
+from .callbacks import Callback, CallbackList, History, JSONLogger
+from .callbacks import Timer, Throughput
+from .stopping import EarlyStopping
 from .gradientdescent import GradientDescent
+from .pso import ParticleSwarm
+from .parallel import ParallelGradientDescent, HogwildGradientDescent
+from .parallel import IslandSwarm
+from .frozen import FrozenModel
 from .model import Model
+from .serving import BatchingPredictor
+from .cache import PredictionCache
 
 __version__ = '0.1.0-dev'
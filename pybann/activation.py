@@ -7,6 +7,26 @@ from typing import Union
 import numpy as np
 
 
+def _prepare(wsum: Union[float, np.array], out: np.array = None) -> tuple:
+    """
+    Return the input values as an array and the output buffer, allocated
+    with the floating point type of the input values when not given.
+    """
+    wsum = np.asarray(wsum)
+    if out is None:
+        out = np.empty(wsum.shape, dtype=np.result_type(wsum, 1.))
+    return wsum, out
+
+
+def _result(out: np.array) -> Union[float, np.array]:
+    """
+    Return the output buffer, or a scalar for scalar input values.
+    """
+    if out.ndim == 0:
+        return out[()]
+    return out
+
+
 class Activation:
     """
     Collection of activation functions commonly used in the design of
@@ -16,12 +36,22 @@ class Activation:
     of the input is transformed into an output.
 
     All methods are statics which means they can be called without creating an instance.
+
+    All methods accept an optional `out` buffer in which the result is written, so that
+    they can run without allocating new arrays. The buffer can be the input array itself.
+
+    All methods also accept the already `activated` values, i.e. the values of the
+    function for the same input values (which must not be the `out` buffer). When
+    computing the derivative, the sigmoid, the hyperbolic tangent and the Gaussian use
+    them instead of evaluating the exponentials again.
     """
     def __init__(self):
         pass
 
     @staticmethod
-    def sigmoid(wsum: Union[float, np.array], deriv: bool = False) -> Union[float, np.array]:
+    def sigmoid(wsum: Union[float, np.array], deriv: bool = False,
+                out: np.array = None,
+                activated: np.array = None) -> Union[float, np.array]:
         """sigmoid
 
         Apply the sigmoid activation functions or its derivative to the input values.
@@ -32,12 +62,20 @@ class Activation:
         The sigmoid derivative is a zero-centered Gaussian-like function returning values
         between 0 and 0.25.
 
+        The sigmoid is evaluated as 0.5 * (1 + tanh(wsum / 2)), which does not overflow
+        for large negative input values.
+
         Parameters
         ----------
         wsum: float or numpy array
             input value(s)
         deriv: bool, default: False
             when `True`, returns the derivative
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            values of the function for the same input values (e.g. cached
+            from the feed forward), used to compute the derivative
 
         Returns
         -------
@@ -55,14 +93,28 @@ class Activation:
         >>> sigmoid(a)
         array([0.26894142, 0.5, 0.73105858])
         """
-        result = 1.0 / (1.0 + np.exp(-wsum))
+        wsum, out = _prepare(wsum, out)
+        if deriv and activated is not None:
+            # sigmoid * (1 - sigmoid)
+            np.multiply(activated, activated, out=out)
+            np.subtract(activated, out, out=out)
+            return _result(out)
+
+        np.multiply(wsum, 0.5, out=out)
+        np.tanh(out, out=out)
         if not deriv:
-            return result
+            out *= 0.5
+            out += 0.5
+            return _result(out)
 
-        return result * (1.0 - result)
+        # sigmoid * (1 - sigmoid) = (1 - tanh**2) / 4
+        np.square(out, out=out)
+        np.subtract(1., out, out=out)
+        out *= 0.25
+        return _result(out)
 
     @staticmethod
-    def tanhyp(wsum, deriv=False):
+    def tanhyp(wsum, deriv=False, out=None, activated=None):
         """
         Returns the value of the Hyperbolic tangent function
         (or its derivative).
@@ -73,6 +125,11 @@ class Activation:
             input value(s)
         deriv: bool, default: False
             when `True`, returns the derivative
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            values of the function for the same input values (e.g. cached
+            from the feed forward), used to compute the derivative
 
         Returns
         -------
@@ -90,14 +147,22 @@ class Activation:
         >>> tanhyp(x)
         array([-0.76159415, 0.0, 0.76159415])
         """
-        result = (np.exp(wsum) - np.exp(-wsum)) / (np.exp(wsum) + np.exp(-wsum))
+        wsum, out = _prepare(wsum, out)
+        if deriv and activated is not None:
+            np.square(activated, out=out)
+            np.subtract(1., out, out=out)
+            return _result(out)
+
+        np.tanh(wsum, out=out)
         if not deriv:
-            return result
+            return _result(out)
 
-        return 1. - result**2
+        np.square(out, out=out)
+        np.subtract(1., out, out=out)
+        return _result(out)
 
     @staticmethod
-    def relu(wsum, leak=0., deriv=False):
+    def relu(wsum, leak=0., deriv=False, out=None, activated=None):
         """
         Returns the value of the Rectified Linear Unit function
         (or its derivative).
@@ -106,8 +171,14 @@ class Activation:
         ----------
         wsum: float or numpy array
             input value(s)
+        leak: float, default: 0.
+            slope for negative input values (leaky ReLU)
         deriv: bool, default: False
             when `True`, returns the derivative
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            ignored, the derivative is computed from the input values
 
         Returns
         -------
@@ -125,24 +196,43 @@ class Activation:
         >>> relu(x)
         array([0., 0., 2.])
         """
+        wsum, out = _prepare(wsum, out)
         if not deriv:
-            result = np.where(wsum > 0, wsum, wsum * leak)
-            return result
-
-        result = np.where(wsum >= 0, 1., leak)
-        return result
+            if leak == 0.:
+                np.maximum(wsum, 0., out=out)
+            else:
+                np.copyto(out, wsum)
+                np.multiply(out, leak, out=out, where=out < 0.)
+            return _result(out)
+
+        # 1 for positive input values, leak otherwise (with float ufuncs:
+        # the boolean result of a comparison would be cast through a
+        # buffer)
+        np.copysign(1., wsum, out=out)
+        np.maximum(out, 0., out=out)
+        if leak != 0.:
+            out *= 1. - leak
+            out += leak
+        return _result(out)
 
     @staticmethod
-    def softplus(wsum, deriv=False):
+    def softplus(wsum, deriv=False, out=None, activated=None):
         """
         Returns the value of the Softplus function (or its derivative).
 
+        The Softplus is evaluated as log(exp(0) + exp(wsum)) using
+        `np.logaddexp`, which does not overflow for large input values.
+
         Parameters
         ----------
         wsum: float or numpy array
             input value(s)
         deriv: bool, default: False
             when `True`, returns the derivative
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            ignored, the derivative is computed from the input values
 
         Returns
         -------
@@ -160,13 +250,15 @@ class Activation:
         >>> softplus(x)
         array([0.31326168, 0.69314718, 1.31326168])
         """
-        if not deriv:
-            return np.log(1. + np.exp(wsum))
+        if deriv:
+            return Activation.sigmoid(wsum, out=out)
 
-        return Activation.sigmoid(wsum)
+        wsum, out = _prepare(wsum, out)
+        np.logaddexp(0., wsum, out=out)
+        return _result(out)
 
     @staticmethod
-    def gaussian(wsum, deriv=False):
+    def gaussian(wsum, deriv=False, out=None, activated=None):
         """
         Returns the value of the Gaussian function (or its derivative).
 
@@ -176,6 +268,11 @@ class Activation:
             input value(s)
         deriv: bool, default: False
             when `True`, returns the derivative
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            values of the function for the same input values (e.g. cached
+            from the feed forward), used to compute the derivative
 
         Returns
         -------
@@ -193,8 +290,90 @@ class Activation:
         >>> gaussian(x)
         array([0.36787944, 1.00000000, 0.36787944])
         """
-        result = np.exp(-(wsum**2))
+        wsum, out = _prepare(wsum, out)
+        if deriv and activated is not None:
+            # -2 * wsum * gaussian
+            np.multiply(wsum, activated, out=out)
+            out *= -2.
+            return _result(out)
+
+        if deriv and np.shares_memory(wsum, out):
+            # The input values are needed after the exponential
+            wsum = wsum.copy()
+
+        np.square(wsum, out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        if not deriv:
+            return _result(out)
+
+        out *= wsum
+        out *= -2.
+        return _result(out)
+
+    @staticmethod
+    def softmax(wsum, deriv=False, out=None, activated=None, axis=None):
+        """
+        Returns the value of the softmax function (or the diagonal of its
+        Jacobian).
+
+        Unlike the other activation functions, the softmax is not applied
+        element-wise: the values of all the neurons of a layer are
+        normalized to sum to 1. The input values are shifted by their
+        maximum before the exponential, so that large input values do not
+        overflow.
+
+        Its derivative is a matrix: only its diagonal, softmax * (1 - softmax),
+        is returned. The full Jacobian of an output layer is used by the
+        losses (see `pybann.losses`), and skipped altogether by the
+        cross-entropy, fused with the softmax.
+
+        Parameters
+        ----------
+        wsum: float or numpy array
+            input value(s)
+        deriv: bool, default: False
+            when `True`, returns the diagonal of the Jacobian
+        out: numpy array, optional
+            buffer in which the result is written
+        activated: numpy array, optional
+            values of the function for the same input values (e.g. cached
+            from the feed forward), used to compute the derivative
+        axis: int, optional
+            axis of the neurons (default: -2, the neurons of the
+            (..., n, batch) arrays of input vectors stored as columns, or 0
+            for a single vector)
+
+        Returns
+        -------
+        result: float or np.array
+            the value of the function (or its derivative).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> x = np.array([0., 1000., 1000.])
+        >>> softmax(x)
+        array([0. , 0.5, 0.5])
+        """
+        wsum, out = _prepare(wsum, out)
+        if axis is None:
+            axis = -2 if wsum.ndim > 1 else 0
+        if deriv and activated is not None:
+            # softmax * (1 - softmax)
+            np.multiply(activated, activated, out=out)
+            np.subtract(activated, out, out=out)
+            return _result(out)
+
+        if wsum.ndim == 0:
+            out[()] = 0. if deriv else 1.
+            return _result(out)
+
+        np.subtract(wsum, np.max(wsum, axis=axis, keepdims=True), out=out)
+        np.exp(out, out=out)
+        out /= np.sum(out, axis=axis, keepdims=True)
         if not deriv:
-            return result
+            return _result(out)
 
-        return -2 * wsum * result
+        out -= np.square(out)
+        return _result(out)
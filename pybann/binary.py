@@ -0,0 +1,87 @@
+"""binary.py
+
+Binary file format of the network models.
+
+A file starts with the magic string, the major and minor version numbers
+of the format (1 byte each) and the length of the header (4 bytes, little
+endian), followed by the header, a UTF-8 JSON object describing the
+architecture of the network model (layers, activation functions and type
+of the parameters). The header is padded with spaces so that the raw
+parameter buffer (see `Model.build`) starts at an offset aligned on
+`ALIGNMENT` bytes and can be memory-mapped.
+"""
+
+import json
+import struct
+import numpy as np
+
+
+MAGIC = b'\x93PYBANN'
+VERSION = (1, 0)
+ALIGNMENT = 64
+
+# Magic string, version numbers and header length
+_PREAMBLE = struct.Struct('<{}sBBI'.format(len(MAGIC)))
+
+
+def is_binary(filename: str) -> bool:
+    """
+    Return `True` when the file starts with the magic string of the binary
+    format.
+    """
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write(filename: str, header: dict, parameters: np.array) -> None:
+    """
+    Write a header and a parameter buffer in a binary file.
+
+    Parameters
+    ----------
+    filename: str
+        name of the file
+    header: dict
+        description of the network model, serializable to JSON
+    parameters: np.array
+        flat buffer of weights and biases
+    """
+    header = dict(header, dtype=parameters.dtype.str,
+                  nparameters=len(parameters))
+    data = json.dumps(header).encode('utf-8')
+    length = -(-(_PREAMBLE.size + len(data) + 1) // ALIGNMENT) * ALIGNMENT
+    data = data.ljust(length - _PREAMBLE.size - 1) + b'\n'
+
+    with open(filename, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, *VERSION, len(data)))
+        f.write(data)
+        f.write(np.ascontiguousarray(parameters).tobytes())
+
+
+def read_header(filename: str) -> tuple:
+    """
+    Read the header of a binary file.
+
+    Parameters
+    ----------
+    filename: str
+        name of the file
+
+    Returns
+    -------
+    header: dict
+        description of the network model
+    offset: int
+        offset of the parameter buffer in the file
+    """
+    with open(filename, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size or not preamble.startswith(MAGIC):
+            raise ValueError("{} is not a binary model file.".format(filename))
+        magic, major, minor, length = _PREAMBLE.unpack(preamble)
+        if major != VERSION[0]:
+            raise ValueError(
+                "Unsupported binary model format version {}.{}.".format(
+                    major, minor))
+        header = json.loads(f.read(length).decode('utf-8'))
+    return header, _PREAMBLE.size + length
@@ -0,0 +1,162 @@
+"""cache.py
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Least recently used (LRU) cache of the output vectors of a network
+    model, keyed on the bytes of the input vectors.
+
+    The cache is bounded by the memory size of its keys and output vectors:
+    the least recently used entries are evicted when the bound is exceeded.
+    It is cleared when the weights of the network model change, i.e. when
+    the `version` counter of the network model (incremented by `build`,
+    `load`, `SGD` and `PSO`) differs from the one of the cached entries.
+    Weights modified in place by other means are not detected.
+    """
+
+    def __init__(self, model, maxbytes: int = 64 * 2**20) -> None:
+        """
+        Initialize the cache
+
+        Parameters
+        ----------
+        model: Model or FrozenModel
+            network model, fed forward using its `predict_one` method
+            (`forward` for a Model) on cache misses
+        maxbytes: int, optional
+            maximum memory size (bytes) of the cached keys and output
+            vectors (default: 64 MiB)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Model, PredictionCache
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> cache = PredictionCache(network)
+        >>> outValues = cache.predict_one(np.ones(4))
+        >>> outValues = cache.predict_one(np.ones(4))
+        >>> cache.stats()
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'nbytes': 56}
+
+        """
+        self.model = model
+        self.maxbytes = maxbytes
+        self.dtype = model.dtype
+        self._forward = getattr(model, 'predict_one', None) or model.forward
+        self._entries = OrderedDict()
+        self.version = getattr(model, 'version', 0)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries (the statistics are kept).
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        self.version = getattr(self.model, 'version', 0)
+
+    def stats(self) -> dict:
+        """
+        Return the number of hits, misses and evictions, and the number and
+        memory size (bytes) of the entries.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self._entries),
+                'nbytes': self.nbytes}
+
+    def _insert(self, key: bytes, outValues: np.array) -> None:
+        """
+        Add an entry, evicting the least recently used ones when the cache
+        is full.
+        """
+        nbytes = len(key) + outValues.nbytes
+        if nbytes > self.maxbytes or key in self._entries:
+            return
+        outValues.flags.writeable = False
+        self._entries[key] = outValues
+        self.nbytes += nbytes
+        while self.nbytes > self.maxbytes:
+            key, values = self._entries.popitem(last=False)
+            self.nbytes -= len(key) + values.nbytes
+            self.evictions += 1
+
+    def predict_one(self, inValues) -> np.array:
+        """
+        Feed forward a single input vector, or return its cached output
+        vector
+
+        Parameters
+        ----------
+        inValues: np.array
+            (n_inputs,) vector of input values
+
+        Returns
+        -------
+        outValues: np.array
+            (n_outputs,) read-only vector of output values
+        """
+        if self.version != getattr(self.model, 'version', 0):
+            self.clear()
+
+        key = np.asarray(inValues, dtype=self.dtype).tobytes()
+        outValues = self._entries.get(key)
+        if outValues is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return outValues
+
+        self.misses += 1
+        outValues = self._forward(inValues)
+        self._insert(key, outValues)
+        return outValues
+
+    def predict(self, inValues) -> np.array:
+        """
+        Feed forward several input vectors, the ones missing from the cache
+        being fed forward at once
+
+        Parameters
+        ----------
+        inValues: np.array
+            (N, n_inputs) array of input vectors, one per row
+
+        Returns
+        -------
+        outValues: np.array
+            (N, n_outputs) array of output vectors, one per row
+        """
+        if self.version != getattr(self.model, 'version', 0):
+            self.clear()
+
+        inValues = np.atleast_2d(np.asarray(inValues, dtype=self.dtype))
+        keys = [values.tobytes() for values in inValues]
+        outValues = [self._entries.get(key) for key in keys]
+
+        missing = [i for i, values in enumerate(outValues) if values is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        for key, values in zip(keys, outValues):
+            if values is not None:
+                self._entries.move_to_end(key)
+
+        if missing:
+            results = self.model.predict(inValues[missing])
+            for i, values in zip(missing, results):
+                outValues[i] = values.copy()
+                self._insert(keys[i], outValues[i])
+
+        return np.array(outValues)
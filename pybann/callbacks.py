@@ -0,0 +1,215 @@
+"""callbacks.py
+"""
+
+import json
+import time
+import numpy as np
+
+
+class Callback:
+    """
+    Base class of the callbacks of the training loop.
+
+    The hooks receive the `logs` dict of the epoch, to which they can add
+    their own metrics for the callbacks called after them. At the end of
+    each epoch (one minibatch update), the logs hold:
+
+    - 'epoch': index of the epoch
+    - 'samples': number of samples of the minibatch
+    - 'loss': loss of the minibatch, before the update
+    - 'time_data', 'time_forward', 'time_backward' and 'time_update':
+      times (s) spent gathering the minibatch, in the feed forward, in the
+      backpropagation and in the update (the multi-process training logs
+      'time_gradient' instead of the feed forward and backpropagation)
+    - 'time': total time (s) of the epoch
+
+    Returning `True` from `on_epoch_end` stops the training.
+    """
+
+    def on_train_begin(self, logs: dict) -> None:
+        pass
+
+    def on_epoch_begin(self, epoch: int, logs: dict) -> None:
+        pass
+
+    def on_batch_end(self, epoch: int, logs: dict) -> None:
+        pass
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        return False
+
+    def on_train_end(self, logs: dict) -> None:
+        pass
+
+
+class CallbackList:
+    """
+    Ordered list of callbacks, called one after the other.
+
+    The list is false when empty, so that the training loop skips the
+    hooks (and the timers) when no callback is registered.
+    """
+
+    def __init__(self, callbacks=None) -> None:
+        self.callbacks = list(callbacks or [])
+
+    def __bool__(self) -> bool:
+        return bool(self.callbacks)
+
+    def __iter__(self):
+        return iter(self.callbacks)
+
+    def on_train_begin(self, logs: dict) -> None:
+        for callback in self.callbacks:
+            callback.on_train_begin(logs)
+
+    def on_epoch_begin(self, epoch: int, logs: dict) -> None:
+        for callback in self.callbacks:
+            callback.on_epoch_begin(epoch, logs)
+
+    def on_batch_end(self, epoch: int, logs: dict) -> None:
+        for callback in self.callbacks:
+            callback.on_batch_end(epoch, logs)
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        stop = False
+        for callback in self.callbacks:
+            stop = bool(callback.on_epoch_end(epoch, logs)) or stop
+        return stop
+
+    def on_train_end(self, logs: dict) -> None:
+        for callback in self.callbacks:
+            callback.on_train_end(logs)
+
+
+class History(Callback):
+    """
+    In-memory history of the logs of the epochs.
+
+    Examples
+    --------
+
+    >>> from pybann import Model, History
+    >>> network = Model()
+    >>> network.addInput(neurons=2)
+    >>> network.addLayer(neurons=1)
+    >>> network.build()
+    >>> history = History()
+    >>> network.SGD([((0., 1.), (1.,)), ((1., 0.), (0.,))], nepoch=100,
+    ...             callbacks=[history], verbose=False)
+    >>> history['loss'].shape
+    (100,)
+
+    """
+
+    def __init__(self) -> None:
+        self.records = []
+
+    def on_train_begin(self, logs: dict) -> None:
+        self.records = []
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        self.records.append(dict(logs))
+        return False
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, key: str) -> np.array:
+        """
+        Return the values of a metric, for the epochs where it is logged.
+        """
+        return np.array([record[key] for record in self.records
+                         if key in record])
+
+
+class JSONLogger(Callback):
+    """
+    Logger writing the logs of each epoch as a JSON line.
+    """
+
+    def __init__(self, file) -> None:
+        """
+        Initialize the logger
+
+        Parameters
+        ----------
+        file: str or file object
+            name of the file, overwritten when the training begins, or
+            opened text file
+        """
+        self.file = file
+        self._f = None
+
+    def on_train_begin(self, logs: dict) -> None:
+        if isinstance(self.file, str):
+            self._f = open(self.file, 'w')
+        else:
+            self._f = self.file
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        self._f.write(json.dumps(logs, default=float) + '\n')
+        return False
+
+    def on_train_end(self, logs: dict) -> None:
+        if isinstance(self.file, str):
+            self._f.close()
+        else:
+            self._f.flush()
+        self._f = None
+
+
+class Timer(Callback):
+    """
+    Timer accumulating the time spent in each step of the training loop
+    (the 'time_*' logs) and the wall-clock time of the training.
+    """
+
+    def __init__(self) -> None:
+        self.totals = {}
+        self.elapsed = 0.
+        self._start = None
+
+    def on_train_begin(self, logs: dict) -> None:
+        self.totals = {}
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        for key, value in logs.items():
+            if key.startswith('time_'):
+                self.totals[key[5:]] = self.totals.get(key[5:], 0.) + value
+        return False
+
+    def on_train_end(self, logs: dict) -> None:
+        self.elapsed = time.perf_counter() - self._start
+
+    def summary(self) -> dict:
+        """
+        Return the total time (s) of each step and its fraction of the
+        wall-clock time of the training.
+        """
+        return {key: {'time': total, 'fraction': total / self.elapsed
+                      if self.elapsed > 0. else 0.}
+                for key, total in self.totals.items()}
+
+
+class Throughput(Callback):
+    """
+    Throughput counter, logging the number of samples processed per second
+    of each epoch ('throughput') and since the training began
+    ('mean_throughput').
+    """
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.elapsed = 0.
+
+    def on_train_begin(self, logs: dict) -> None:
+        self.samples = 0
+        self.elapsed = 0.
+
+    def on_batch_end(self, epoch: int, logs: dict) -> None:
+        self.samples += logs['samples']
+        self.elapsed += logs['time']
+        logs['throughput'] = logs['samples'] / logs['time']
+        logs['mean_throughput'] = self.samples / self.elapsed
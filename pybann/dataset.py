@@ -0,0 +1,238 @@
+"""dataset.py
+"""
+
+import numpy as np
+
+
+class Dataset:
+    """
+    Dataset stored as two contiguous 2-D arrays of input and output
+    values, one sample per row.
+
+    The dataset is shuffled by permuting an array of indices, and
+    minibatches are gathered from the permuted indices, so that the
+    samples themselves are never moved around.
+
+    The arrays can be memory-mapped .npy files (see `Dataset.load`), in
+    which case the samples are only read from disk when gathered in a
+    minibatch.
+    """
+
+    def __init__(self, inputs, targets, dtype=None) -> None:
+        """
+        Initialize the dataset
+
+        Parameters
+        ----------
+        inputs: np.array
+            (N, n_inputs) array of input values
+        targets: np.array
+            (N, n_outputs) array of output values
+        dtype: data-type, optional
+            type of the stored values (default: inferred from the values)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Dataset
+        >>> data = Dataset(np.random.randn(100, 4), np.random.randn(100, 3))
+        >>> len(data)
+        100
+
+        """
+        self.inputs = np.ascontiguousarray(np.atleast_2d(inputs), dtype=dtype)
+        self.targets = np.ascontiguousarray(np.atleast_2d(targets), dtype=dtype)
+
+        if len(self.inputs) != len(self.targets):
+            raise ValueError(
+                "inputs and targets must have the same number of samples.")
+
+        self.indices = np.arange(len(self.inputs))
+
+        # Gather minibatches in increasing index order
+        self.sorted = False
+
+    @classmethod
+    def from_pairs(cls, dataset, dtype=np.float64):
+        """
+        Create a dataset from a list of (inValues, outValues) tuples.
+
+        Parameters
+        ----------
+        dataset: list or np.array
+            a list of tuples in the form (inValues, outValues)
+        dtype: data-type, optional
+            type of the stored values (default: np.float64)
+
+        Examples
+        --------
+
+        >>> from pybann import Dataset
+        >>> data = Dataset.from_pairs([((0., 1.), (1.,)), ((1., 0.), (0.,))])
+        >>> data.inputs.shape
+        (2, 2)
+
+        """
+        return cls([data[0] for data in dataset],
+                   [data[1] for data in dataset], dtype=dtype)
+
+    @classmethod
+    def load(cls, inputs: str, targets: str, mmap: bool = True):
+        """
+        Load a dataset from .npy files of input and output values.
+
+        By default, the files are memory-mapped and never loaded as a
+        whole: each minibatch reads its samples from disk (or from the page
+        cache), in increasing index order so that reads stay mostly
+        sequential. The values keep the type stored in the files and are
+        converted when gathered in a minibatch.
+
+        Parameters
+        ----------
+        inputs: str
+            name of the .npy file of (N, n_inputs) input values
+        targets: str
+            name of the .npy file of (N, n_outputs) output values
+        mmap: bool, optional
+            when `True`, memory-map the files instead of reading them
+            (default: True)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Dataset
+        >>> np.save("inputs.npy", np.random.randn(100, 4))
+        >>> np.save("targets.npy", np.random.randn(100, 3))
+        >>> data = Dataset.load("inputs.npy", "targets.npy")
+        >>> len(data)
+        100
+
+        """
+        mode = 'r' if mmap else None
+        data = cls(np.load(inputs, mmap_mode=mode),
+                   np.load(targets, mmap_mode=mode))
+        data.sorted = mmap
+        return data
+
+    def save(self, inputs: str, targets: str) -> None:
+        """
+        Save the input and output values in .npy files, which can be loaded
+        (and memory-mapped) using `Dataset.load`.
+
+        Parameters
+        ----------
+        inputs: str
+            name of the .npy file of input values
+        targets: str
+            name of the .npy file of output values
+        """
+        np.save(inputs, self.inputs)
+        np.save(targets, self.targets)
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def __repr__(self) -> str:
+        return "Dataset({}, {}, {})".format(
+            len(self), self.inputs.shape[1], self.targets.shape[1])
+
+    def shuffle(self, rng=None) -> None:
+        """
+        Shuffle the dataset by drawing a new permutation of the indices.
+
+        The permutation only depends on the state of the random generator,
+        not on the previous ones.
+
+        Parameters
+        ----------
+        rng: np.random.Generator, optional
+            random generator (default: `np.random` global state)
+        """
+        if rng is None:
+            rng = np.random
+        self.indices = rng.permutation(len(self))
+
+    def batch(self, batchsize: int, start: int = 0, out=None) -> tuple:
+        """
+        Return a minibatch of input and output values.
+
+        The minibatch contains the samples of the permuted indices
+        `start` to `start + batchsize`, in increasing index order when
+        `sorted` is `True`.
+
+        Parameters
+        ----------
+        batchsize: int
+            number of samples in the minibatch
+        start: int, optional
+            position of the first sample in the permuted indices
+            (default: 0)
+        out: tuple of np.array, optional
+            (input, output) buffers in which the minibatch is written
+
+        Returns
+        -------
+        invalues: np.array
+            (batchsize, n_inputs) array of input values
+        outvalues: np.array
+            (batchsize, n_outputs) array of output values
+        """
+        return self.gather(self.indices[start:start+batchsize], out=out)
+
+    def gather(self, indices: np.array, out=None) -> tuple:
+        """
+        Return the input and output values of the given samples.
+
+        Parameters
+        ----------
+        indices: np.array
+            indices of the samples, gathered in increasing order when
+            `sorted` is `True`
+        out: tuple of np.array, optional
+            (input, output) buffers in which the samples are written
+
+        Returns
+        -------
+        invalues: np.array
+            (n, n_inputs) array of input values
+        outvalues: np.array
+            (n, n_outputs) array of output values
+        """
+        if self.sorted:
+            indices = np.sort(indices)
+
+        if out is None:
+            return self.inputs[indices], self.targets[indices]
+
+        for values, buffer in zip((self.inputs, self.targets), out):
+            if values.dtype == buffer.dtype:
+                np.take(values, indices, axis=0, out=buffer, mode='clip')
+            else:
+                buffer[...] = values[indices]
+        return out
+
+    def batches(self, batchsize: int):
+        """
+        Iterate over the minibatches of the dataset, following the order of
+        the permuted indices.
+
+        Parameters
+        ----------
+        batchsize: int
+            number of samples in a minibatch (the last minibatch can be
+            smaller)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Dataset
+        >>> data = Dataset(np.random.randn(100, 4), np.random.randn(100, 3))
+        >>> [len(invalues) for invalues, outvalues in data.batches(40)]
+        [40, 40, 20]
+
+        """
+        for start in range(0, len(self), batchsize):
+            yield self.batch(batchsize, start)
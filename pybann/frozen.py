@@ -0,0 +1,149 @@
+"""frozen.py
+"""
+
+import functools
+import numpy as np
+from pybann import Activation
+
+
+class FrozenModel:
+    """
+    Inference-only representation of a network model (see `Model.freeze`).
+
+    A frozen model only holds the weights and biases, in one contiguous
+    buffer, without the gradient and momentum buffers used for training.
+    The weight matrices are stored transposed, (n_inputs, n) for each
+    layer, so that the input vectors are fed forward as rows, without
+    transposing them, and the activation functions are resolved once.
+
+    The frozen model does not share memory with the network model: later
+    training of the network model does not modify it. It holds no buffer
+    written by the feed forward, so that it can be used from several
+    threads at once.
+    """
+
+    def __init__(self, model) -> None:
+        """
+        Initialize the frozen model from a built network model
+
+        Parameters
+        ----------
+        model: Model
+            built (or loaded) network model
+
+        Examples
+        --------
+
+        >>> from pybann import Model, FrozenModel
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=8, activation="relu")
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> frozen = FrozenModel(network)
+        >>> frozen.weights[0].shape
+        (4, 8)
+
+        """
+        self.name = model.name
+        self.dtype = model.dtype
+        self.neurons = [layer.neurons for layer in model.layers]
+
+        # Transposed weights and biases of each layer, laid out one layer
+        # after the other in a contiguous buffer
+        self.parameters = np.empty(len(model.parameters), dtype=self.dtype)
+        self.weights = []
+        self.biases = []
+        self.activations = []
+        start = 0
+        for layer, n, m in zip(model.layers[1:], self.neurons[1:],
+                               self.neurons[:-1]):
+            weights = self.parameters[start:start+n*m].reshape(m, n)
+            weights[...] = layer.weights.T
+            biases = self.parameters[start+n*m:start+n*m+n]
+            biases[...] = layer.biases[:, 0]
+            start += n * (m + 1)
+
+            self.weights.append(weights)
+            self.biases.append(biases)
+            if layer.activation is Activation.softmax:
+                # Neurons along the rows of the input vectors
+                self.activations.append(
+                    functools.partial(Activation.softmax, axis=-1))
+            else:
+                self.activations.append(layer.activation)
+
+        self.layers = list(zip(self.weights, self.biases, self.activations))
+
+    def __repr__(self) -> str:
+        return "FrozenModel(name={})".format(self.name)
+
+    def predict_one(self, inValues) -> np.array:
+        """
+        Feed forward a single input vector
+
+        Parameters
+        ----------
+        inValues: np.array
+            (n_inputs,) vector of input values
+
+        Returns
+        -------
+        outValues: np.array
+            (n_outputs,) vector of output values
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> frozen.predict_one(np.array([0., 1., 2., 3.])).shape
+        (3,)
+
+        """
+        values = np.asarray(inValues, dtype=self.dtype)
+        for weights, biases, activation in self.layers:
+            transfer = np.dot(values, weights)
+            transfer += biases
+            values = activation(transfer, out=transfer)
+        return values
+
+    def predict(self, inValues, chunk_size: int = 1024) -> np.array:
+        """
+        Feed forward several input vectors at once, by chunks of
+        `chunk_size` rows
+
+        Parameters
+        ----------
+        inValues: np.array
+            (N, n_inputs) array of input vectors, one per row
+        chunk_size: int, optional
+            number of input vectors fed forward at once (default: 1024)
+
+        Returns
+        -------
+        outValues: np.array
+            (N, n_outputs) array of output vectors, one per row
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> frozen.predict(np.random.randn(100, 4)).shape
+        (100, 3)
+
+        """
+        inValues = np.asarray(inValues, dtype=self.dtype)
+        if inValues.ndim == 1:
+            inValues = inValues.reshape(1, -1)
+        outValues = np.empty((len(inValues), self.neurons[-1]),
+                             dtype=self.dtype)
+
+        for start in range(0, len(inValues), chunk_size):
+            values = inValues[start:start+chunk_size]
+            for weights, biases, activation in self.layers:
+                transfer = np.dot(values, weights)
+                transfer += biases
+                values = activation(transfer, out=transfer)
+            outValues[start:start+chunk_size] = values
+
+        return outValues
@@ -2,8 +2,14 @@
 """
 
 from typing import Union
+import time
 import numpy as np
 from tqdm import tqdm
+from pybann import Dataset
+from pybann import Workspace
+from pybann import Momentum
+from pybann import MSE
+from pybann import CallbackList
 
 
 class GradientDescent:
@@ -13,22 +19,47 @@ class GradientDescent:
     """
 
     def __init__(self, dataset, batchsize: int, alpha: float,
-                 nepoch: int, momentum: float, layers) -> None:
+                 nepoch: int, momentum: float, layers,
+                 buffers=None, optimizer=None, seed: int = None,
+                 callbacks=None, verbose: bool = True, loss=None) -> None:
         """
         Initialize the gradient descent class
         
         Parameters
         ----------
-        dataset: list or np.array
-            a list of tuples in the form (inValues, outValues)
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues),
+            converted once to a Dataset
         batchsize: int, optional
-            size of minibatches for training
+            size of minibatches for training (0 for the whole dataset)
         nepoch: int, optional
             maximum number of iterations (default: 1000)
         alpha: float, optional
             step for gradient descent (default: 0.05)
         momentum: float, optional
             step for the momentum (default: 0.5)
+        layers: list
+            list of the Layer objects of the network model
+        buffers: tuple of np.array, optional
+            contiguous (parameters, gradients, momentums) buffers the
+            layer arrays are views into (see `Model.build`); when given,
+            updates are applied to the whole buffers at once
+        optimizer: Optimizer, optional
+            optimizer used to update the weights and biases (default:
+            gradient descent with momentum using `alpha` and `momentum`)
+        seed: int, optional
+            seed of the random generator used to shuffle the dataset
+            (default: `np.random` global state)
+        callbacks: list of Callback, optional
+            callbacks called during the training (see `Callback`), the
+            training stopping when one of them returns `True` at the end
+            of an epoch; the losses and timers are only computed when
+            callbacks are given
+        verbose: bool, optional
+            show a progress bar (default: True)
+        loss: Loss, optional
+            loss function minimized, which computes the delta values of the
+            output layer (default: sum of the squared errors)
 
         """
         self.dataset = dataset
@@ -37,14 +68,68 @@ class GradientDescent:
         self.momentum = momentum
         self.layers = layers
         self.batchsize = batchsize
+        self.buffers = buffers
+        self.dtype = layers[-1].weights.dtype
+        if isinstance(dataset, Dataset):
+            self.data = dataset
+        else:
+            self.data = Dataset.from_pairs(dataset, dtype=self.dtype)
+        self.workspace = None
+        if optimizer is None:
+            optimizer = Momentum(alpha=alpha, momentum=momentum)
+        self.optimizer = optimizer
+        self.rng = None
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.callbacks = CallbackList(callbacks)
+        self.verbose = verbose
+        if loss is None:
+            loss = MSE()
+        if loss.activation is not None and \
+                layers[-1].activation.__name__ != loss.activation:
+            raise ValueError("The {} loss requires a {} output layer.".format(
+                type(loss).__name__, loss.activation))
+        self.lossfunction = loss
+        # Only the output layer backpropagates through the full Jacobian of
+        # the softmax (see `Loss.delta`)
+        for layer in layers[1:-1]:
+            if layer.activation.__name__ == 'softmax':
+                raise ValueError("The softmax activation is only supported "
+                                 "by the output layer.")
+
+    def groups(self) -> list:
+        """
+        Return the (parameters, update, update save) array triplets to
+        update, that is the contiguous buffers when available, or the
+        weights and biases arrays of each layer otherwise.
+        """
+        if self.buffers is not None:
+            return [self.buffers]
+
+        groups = []
+        for ilayer in range(1, len(self.layers)):
+            layer = self.layers[ilayer]
+            groups.append(
+                (layer.weights, layer.weightsUpdate, layer.weightsUpdateSave))
+            groups.append(
+                (layer.biases, layer.biasesUpdate, layer.biasesUpdateSave))
+        return groups
+
+    def allocate(self, nsamples: int) -> Workspace:
+        """
+        Return the workspace, (re)allocated when too small to hold a
+        minibatch of `nsamples` samples.
+        """
+        if self.workspace is None or self.workspace.batchsize < nsamples:
+            self.workspace = Workspace(self.layers, nsamples)
+        return self.workspace
 
     def init_update(self):
         """
         Initialize weights and biases update array to zero.
         """
-        for ilayer in range(1, len(self.layers)):
-            self.layers[ilayer].weightsUpdate[:, :] = 0.
-            self.layers[ilayer].biasesUpdate[:] = 0.
+        for _, update, _ in self.groups():
+            update[...] = 0.
 
     def datasplit(self, dataset):
         """
@@ -55,109 +140,197 @@ class GradientDescent:
         outvalues = np.atleast_2d(dataset[1])
         return invalues, outvalues
 
+    def batchsplit(self, batch):
+        """
+        Stack a minibatch in input and output arrays of the same type as
+        the weights of the layers.
+
+        Parameters
+        ----------
+        batch: list or np.array
+            a list of tuples in the form (inValues, outValues)
+
+        Returns
+        -------
+        invalues: np.array
+            (batch, n_inputs) array of input values
+        outvalues: np.array
+            (batch, n_outputs) array of output values
+        """
+        invalues = np.array([data[0] for data in batch], dtype=self.dtype)
+        outvalues = np.array([data[1] for data in batch], dtype=self.dtype)
+        return invalues, outvalues
+
     def forward(self, invalues) -> Union[list, list]:
         """
         Return the output of the neural network for a given
         input dataset and stores the intermediate results
         (transfer and activation results).
 
+        The intermediate results are written in the workspace buffers,
+        which are overwritten by the next call.
+
         Parameters
         ----------
         invalues: np.array
-            vector containing the input values for the neural network model
+            (batch, n_inputs) array containing the input values for the
+            neural network model, one sample per row
 
         Returns
         -------
         activation: np.array
-            activation value for each node
+            activation value for each node, one sample per column
         transfer: np.array
-            transfer value for each node
+            transfer value for each node, one sample per column
 
         """
         # Activation
-        activation = [invalues.transpose()]
-        transfer = []
+        activation, transfer, delta = self.allocate(
+            np.shape(invalues)[0]).views(np.shape(invalues)[0])
+        activation[0] = invalues.transpose()
 
         # Feed Forward
         for ilayer in range(1, len(self.layers)):
-            transfer.append(np.dot(
-                self.layers[ilayer].weights, activation[ilayer-1])
-                + self.layers[ilayer].biases)
-            activation.append(self.layers[ilayer].activation(transfer[-1]))
+            self.forward_layer(ilayer, activation, transfer, delta)
 
         return activation, transfer
 
+    def forward_layer(self, ilayer: int, activation, transfer,
+                      delta) -> None:
+        """
+        Feed forward the layer `ilayer`, from the activation values of the
+        previous layer.
+
+        The delta buffer of the layer, unused until the backpropagation,
+        holds the biases broadcast over the samples, so that they are added
+        without allocating the buffer of a broadcasting addition.
+        """
+        layer = self.layers[ilayer]
+        np.dot(layer.weights, activation[ilayer-1], out=transfer[ilayer-1])
+        np.copyto(delta[ilayer-1], layer.biases)
+        transfer[ilayer-1] += delta[ilayer-1]
+        layer.activation(transfer[ilayer-1], out=activation[ilayer])
+
     def backward(self, activation, transfer, outvalues) -> None:
         """
         Calculates the gradient for each weight matrix and biase vector
         of the neural network.
+
+        The gradients of all the samples of the minibatch (columns of
+        `activation` and `transfer`) are accumulated at once through
+        matrix-matrix products. The derivatives of the activation functions
+        reuse the activation values of the feed forward when possible, and
+        overwrite the transfer values.
         """
+        _, _, delta = self.allocate(np.shape(outvalues)[0]).views(
+            np.shape(outvalues)[0])
+
         # Backward
-        delta = (activation[-1] -
-            outvalues.transpose()) * self.layers[-1].activation(transfer[-1], deriv=True)
-        self.layers[-1].weightsUpdate += np.dot(
-            delta, activation[-2].transpose())
-        self.layers[-1].biasesUpdate += delta
-        for ilayer in range(2, len(self.layers)):
-            wsvector = transfer[-ilayer]
-            delta = self.layers[-ilayer].activation(
-                wsvector, deriv=True) * np.dot(
-                    self.layers[-ilayer+1].weights.transpose(), delta)
-            self.layers[-ilayer].weightsUpdate += np.dot(
-                delta, activation[-ilayer-1].transpose())
-            self.layers[-ilayer].biasesUpdate += delta
+        for ilayer in range(len(self.layers) - 1, 0, -1):
+            self.backward_layer(ilayer, activation, transfer, delta,
+                                outvalues)
+
+    def backward_layer(self, ilayer: int, activation, transfer, delta,
+                       outvalues) -> None:
+        """
+        Compute the delta values of the layer `ilayer`, from the expected
+        output values for the output layer (see `Loss.delta`) or from the
+        delta values of the next layer otherwise, and accumulate its
+        gradients.
+        """
+        layer = self.layers[ilayer]
+        workspace = self.workspace
+        if ilayer == len(self.layers) - 1:
+            self.lossfunction.delta(
+                activation[ilayer], outvalues.transpose(), transfer[ilayer-1],
+                layer.activation, out=delta[ilayer-1])
+        else:
+            np.dot(self.layers[ilayer+1].weights.transpose(), delta[ilayer],
+                   out=delta[ilayer-1])
+            delta[ilayer-1] *= layer.activation(
+                transfer[ilayer-1], deriv=True, out=transfer[ilayer-1],
+                activated=activation[ilayer])
+        np.dot(delta[ilayer-1], activation[ilayer-1].transpose(),
+               out=workspace.weightsUpdate[ilayer-1])
+        np.sum(delta[ilayer-1], axis=1, keepdims=True,
+               out=workspace.biasesUpdate[ilayer-1])
+        layer.weightsUpdate += workspace.weightsUpdate[ilayer-1]
+        layer.biasesUpdate += workspace.biasesUpdate[ilayer-1]
 
     def update(self) -> None:
         """
         Update the weight matrix and biase vector of the neural network.
         """
         # Update weights and biases
-        for ilayer in range(1, len(self.layers)):
+        self.optimizer.step(self.groups())
 
-            # Increment
-            self.layers[ilayer].weights += (
-                -self.alpha * self.layers[ilayer].weightsUpdate
-                + self.momentum * self.layers[ilayer].weightsUpdateSave)
-            self.layers[ilayer].biases += (
-                -self.alpha * self.layers[ilayer].biasesUpdate
-                + self.momentum * self.layers[ilayer].biasesUpdateSave)
-
-            # Store update
-            self.layers[ilayer].weightsUpdateSave = (
-                -self.alpha * self.layers[ilayer].weightsUpdate
-                + self.momentum * self.layers[ilayer].weightsUpdateSave)
-            self.layers[ilayer].biasesUpdateSave = (
-                -self.alpha * self.layers[ilayer].biasesUpdate
-                + self.momentum * self.layers[ilayer].biasesUpdateSave)
+    def loss(self, outputs: np.array, outvalues: np.array) -> float:
+        """
+        Return the loss (sum of the losses over the number of samples) of
+        the (n_outputs, batch) output values of the feed forward, given the
+        (batch, n_outputs) expected output values.
+        """
+        return self.lossfunction(outputs, outvalues.T) / len(outvalues)
 
     def run(self) -> None:
         """
         Train
         """
 
-        for epoch in tqdm(range(self.nepoch),
+        batchsize = self.batchsize
+        if batchsize == 0:
+            batchsize = len(self.data)
+        workspace = self.allocate(batchsize)
+        callbacks = self.callbacks
+        callbacks.on_train_begin({'nepoch': self.nepoch,
+                                  'batchsize': batchsize})
+
+        logs = {}
+        for epoch in tqdm(range(self.nepoch), disable=not self.verbose,
                          bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
                          desc="Training..."):
+            if callbacks:
+                logs = {'epoch': epoch, 'samples': batchsize}
+                callbacks.on_epoch_begin(epoch, logs)
+                start = time.perf_counter()
+
             # Re-initialize update arrays
             self.init_update()
 
             if self.batchsize != 0:
                 # Shuffle dataset
-                np.random.shuffle(self.dataset)
-            else:
-                self.batchsize = len(self.dataset)
-
-            # Loop over datasets
-            for idata in range(self.batchsize):
+                self.data.shuffle(self.rng)
 
-                # Split dataset
-                invalues, outvalues = self.datasplit(self.dataset[idata])
+            # Gather minibatch
+            invalues, outvalues = self.data.batch(
+                batchsize, out=workspace.inputs(batchsize))
+            if callbacks:
+                times = [start, time.perf_counter()]
 
-                # Feed forward
-                activation, transfer = self.forward(invalues)
+            # Feed forward
+            activation, transfer = self.forward(invalues)
+            if callbacks:
+                times.append(time.perf_counter())
 
-                # Feed backward
-                self.backward(activation, transfer, outvalues)
+            # Feed backward
+            self.backward(activation, transfer, outvalues)
+            if callbacks:
+                times.append(time.perf_counter())
 
             # Update
             self.update()
+
+            if callbacks:
+                times.append(time.perf_counter())
+                for key, t0, t1 in zip(('data', 'forward', 'backward',
+                                        'update'), times, times[1:]):
+                    logs['time_' + key] = t1 - t0
+                logs['time'] = times[-1] - times[0]
+                # The output values of the feed forward are left untouched
+                # by the backpropagation and the update
+                logs['loss'] = self.loss(activation[-1], outvalues)
+                callbacks.on_batch_end(epoch, logs)
+                if callbacks.on_epoch_end(epoch, logs):
+                    break
+
+        callbacks.on_train_end(logs)
@@ -0,0 +1,74 @@
+"""
+initializers.py
+"""
+
+# Import modules
+import numpy as np
+
+
+class Initializer:
+    """
+    Collection of initializers of the weights and biases of the layers.
+
+    The variance-scaling initializers (Xavier/Glorot, He and LeCun) draw
+    normal values whose variance is scaled by the number of inputs
+    (`fan_in`) and/or outputs (`fan_out`) of the layer, so that the
+    variance of the transfer values does not grow with the width of the
+    layers and the sigmoid and tanh units do not start saturated.
+
+    All methods are statics which means they can be called without creating an instance.
+
+    All methods take the shape of the array, its fan-in and fan-out, and the
+    random generator drawing the values: a `np.random.Generator`, or the
+    `np.random` module (global state).
+    """
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def normal(shape: tuple, fan_in: int, fan_out: int,
+               rng=np.random) -> np.array:
+        """
+        Returns standard normal values (unscaled).
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> normal((4, 8), 8, 4, rng=np.random.default_rng(0)).shape
+        (4, 8)
+        """
+        return rng.standard_normal(shape)
+
+    @staticmethod
+    def xavier(shape: tuple, fan_in: int, fan_out: int,
+               rng=np.random) -> np.array:
+        """
+        Returns normal values of variance 2 / (fan_in + fan_out)
+        (Xavier/Glorot initialization, for sigmoid and tanh layers).
+        """
+        return rng.standard_normal(shape) * np.sqrt(2. / (fan_in + fan_out))
+
+    @staticmethod
+    def he(shape: tuple, fan_in: int, fan_out: int,
+           rng=np.random) -> np.array:
+        """
+        Returns normal values of variance 2 / fan_in (He initialization,
+        for ReLU layers).
+        """
+        return rng.standard_normal(shape) * np.sqrt(2. / fan_in)
+
+    @staticmethod
+    def lecun(shape: tuple, fan_in: int, fan_out: int,
+              rng=np.random) -> np.array:
+        """
+        Returns normal values of variance 1 / fan_in (LeCun initialization).
+        """
+        return rng.standard_normal(shape) * np.sqrt(1. / fan_in)
+
+    @staticmethod
+    def zeros(shape: tuple, fan_in: int, fan_out: int,
+              rng=np.random) -> np.array:
+        """
+        Returns zeros (e.g. for the biases), without drawing any value.
+        """
+        return np.zeros(shape)
@@ -2,6 +2,7 @@
 """
 import numpy as np
 from pybann import Activation
+from pybann import Initializer
 
 
 class Layer:
@@ -44,15 +45,88 @@ class Layer:
         """
         self.__setattr__('activation', getattr(Activation, activation))
 
-    def add_weights(self, inputNeurons: int) -> None:
+    def add_initializer(self, weights: str = "normal",
+                        biases: str = "normal") -> None:
+        """
+        Add the initializers of the weights and biases to the Layer object
+
+        Parameters
+        ----------
+        weights: str, optional
+            name of the initializer of the weights (default: 'normal')
+        biases: str, optional
+            name of the initializer of the biases (default: 'normal')
+
+        Examples
+        --------
+
+        >>> from pybann import Layer
+        >>> layer1 = Layer(neurons=4)
+        >>> layer1.add_initializer(weights="he", biases="zeros")
+        >>> layer1.weightsInit.__name__
+        he
+
+        """
+        self.__setattr__('weightsInit', getattr(Initializer, weights))
+        self.__setattr__('biasesInit', getattr(Initializer, biases))
+
+    def bind_buffers(self, name: str, shape: tuple, buffers=None,
+                     dtype=np.float64) -> None:
+        """
+        Bind the `name`, `nameUpdate` and `nameUpdateSave` arrays of the
+        Layer object to the given buffers.
+
+        Parameters
+        ----------
+        name: str
+            name of the parameter array ('weights' or 'biases')
+        shape: tuple
+            shape of the parameter array
+        buffers: tuple of np.array, optional
+            flat (parameter, update, update save) buffers the arrays are
+            views into, the update arrays being set to `None` for `None`
+            buffers; when `None`, new zero-filled buffers are allocated
+        dtype: data-type, optional
+            type of the new buffers (default: np.float64)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Layer
+        >>> arena = np.zeros(12)
+        >>> layer1 = Layer(neurons=4)
+        >>> layer1.bind_buffers('weights', (4, 3), (arena, arena, arena))
+        >>> np.shares_memory(layer1.weights, arena)
+        True
+
+        """
+        if buffers is None:
+            buffers = tuple(np.zeros(np.prod(shape), dtype=dtype)
+                            for _ in range(3))
+
+        for suffix, buffer in zip(('', 'Update', 'UpdateSave'), buffers):
+            self.__setattr__(
+                name+suffix, None if buffer is None else buffer.reshape(shape))
+
+    def add_weights(self, inputNeurons: int, buffers=None,
+                    rng=np.random) -> None:
         """
         Add weight matrix for the feed forward, and updated weight matrices
         for the gradient descent.
 
+        The weights are drawn by the initializer of the layer (see
+        `add_initializer`, default: standard normal values).
+
         Parameters
         ----------
         inputNeurons: int
             number of neurons in the layer
+        buffers: tuple of np.array, optional
+            flat (weights, update, update save) buffers the matrices are
+            views into (see `bind_buffers`)
+        rng: np.random.Generator, optional
+            random generator (default: `np.random` global state)
 
         Examples
         --------
@@ -69,18 +143,27 @@ class Layer:
         (4, 8)
 
         """
-        self.__setattr__('weights', np.random.randn(
-            self.neurons, inputNeurons))
-        self.__setattr__('weightsUpdate', np.zeros((
-            self.neurons, inputNeurons)))
-        self.__setattr__('weightsUpdateSave', np.zeros((
-            self.neurons, inputNeurons)))
-
-    def add_biases(self) -> None:
+        self.bind_buffers('weights', (self.neurons, inputNeurons), buffers)
+        initializer = getattr(self, 'weightsInit', Initializer.normal)
+        self.weights[:, :] = initializer(
+            (self.neurons, inputNeurons), inputNeurons, self.neurons, rng)
+
+    def add_biases(self, buffers=None, rng=np.random) -> None:
         """
         Add biase vector for the feed forward, and updated biase vectors
         for the gradient descent.
 
+        The biases are drawn by the initializer of the layer (see
+        `add_initializer`, default: standard normal values).
+
+        Parameters
+        ----------
+        buffers: tuple of np.array, optional
+            flat (biases, update, update save) buffers the vectors are
+            views into (see `bind_buffers`)
+        rng: np.random.Generator, optional
+            random generator (default: `np.random` global state)
+
         >>> import numpy as np
         >>> from pybann import Layer
         >>> layer1 = Layer(neurons=4)
@@ -89,9 +172,9 @@ class Layer:
         (4,1)
 
         """
-        self.__setattr__('biases', np.random.randn(self.neurons, 1))
-        self.__setattr__('biasesUpdate', np.zeros((self.neurons, 1)))
-        self.__setattr__('biasesUpdateSave', np.zeros((self.neurons, 1)))
+        self.bind_buffers('biases', (self.neurons, 1), buffers)
+        initializer = getattr(self, 'biasesInit', Initializer.normal)
+        self.biases[:, :] = initializer((self.neurons, 1), 1, self.neurons, rng)
 
     def __repr__(self) -> str:
         return "Layer({}, {}, {})".format(
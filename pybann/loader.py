@@ -0,0 +1,217 @@
+"""loader.py
+"""
+
+from itertools import islice
+import numpy as np
+from pybann import Dataset
+
+
+class CSVLoader:
+    """
+    Streaming loader of delimited text files (CSV...).
+
+    The file is read in chunks of a fixed number of lines, each chunk being
+    parsed once by `np.loadtxt` and its input and output columns copied
+    into preallocated arrays, so that the memory used does not depend on
+    the size of the file. Class labels can be mapped to one-hot output
+    vectors.
+    """
+
+    def __init__(self, filename: str, targets=-1, labels: list = None,
+                 delimiter: str = ",", chunksize: int = 65536,
+                 dtype=np.float64, skiprows: int = 0) -> None:
+        """
+        Initialize the loader
+
+        Parameters
+        ----------
+        filename: str
+            name of the delimited text file, one sample per line
+        targets: int or list of int, optional
+            column(s) of the output values, all other columns being input
+            values (default: -1, last column)
+        labels: list of str, optional
+            class labels of the (single) target column, mapped to one-hot
+            output vectors in the same order; when `None`, the target
+            columns are numeric
+        delimiter: str, optional
+            column delimiter (default: ',')
+        chunksize: int, optional
+            number of lines parsed at once (default: 65536)
+        dtype: data-type, optional
+            type of the input and output values (default: np.float64)
+        skiprows: int, optional
+            number of header lines to skip (default: 0)
+
+        Examples
+        --------
+
+        >>> from pybann import CSVLoader
+        >>> loader = CSVLoader("data/iris/iris.data", labels=[
+        ...     "Iris-setosa", "Iris-versicolor", "Iris-virginica"])
+        >>> for invalues, outvalues in loader:
+        ...     print(invalues.shape, outvalues.shape)
+        (150, 4) (150, 3)
+
+        """
+        self.filename = filename
+        self.labels = labels
+        self.delimiter = delimiter
+        self.chunksize = chunksize
+        self.dtype = np.dtype(dtype)
+        self.skiprows = skiprows
+
+        # Input and target columns, from the first non-empty line
+        with open(filename, 'r') as f:
+            line = next(self._lines(f, 1))[0]
+        ncolumns = len(line.split(delimiter))
+        self.targets = [column % ncolumns for column in np.atleast_1d(targets)]
+        self.inputs = [column for column in range(ncolumns)
+                       if column not in self.targets]
+
+        self._converters = None
+        if labels is not None:
+            if len(self.targets) != 1:
+                raise ValueError("labels require a single target column.")
+            self.classes = {label: i for i, label in enumerate(labels)}
+            # Labels parsed as class indices (-1 for an unknown label)
+            self._converters = {self.targets[0]: self._classify}
+            noutputs = len(labels)
+        else:
+            noutputs = len(self.targets)
+
+        # Chunk buffers
+        self._invalues = np.empty((chunksize, len(self.inputs)), dtype=dtype)
+        self._outvalues = np.empty((chunksize, noutputs), dtype=dtype)
+
+    def _classify(self, label) -> int:
+        """
+        Return the index of a class label, or -1 for an unknown label.
+
+        Before NumPy 1.23, `np.loadtxt` passes the labels to the converters
+        as bytes.
+        """
+        if isinstance(label, bytes):
+            label = label.decode('latin1')
+        return self.classes.get(label.strip(), -1)
+
+    def _lines(self, f, chunksize: int):
+        """
+        Iterate over the chunks of non-empty lines of an opened file.
+        """
+        lines = (line for line in islice(f, self.skiprows, None)
+                 if line.strip())
+        while True:
+            chunk = list(islice(lines, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def __iter__(self):
+        return self.chunks()
+
+    def chunks(self):
+        """
+        Iterate over the chunks of the file.
+
+        The chunks are written in the same buffers: the yielded arrays are
+        overwritten by the next chunk and must be copied to be kept.
+
+        Yields
+        ------
+        invalues: np.array
+            (n, n_inputs) array of input values
+        outvalues: np.array
+            (n, n_outputs) array of output values
+        """
+        with open(self.filename, 'r') as f:
+            for lines in self._lines(f, self.chunksize):
+                invalues = self._invalues[:len(lines)]
+                outvalues = self._outvalues[:len(lines)]
+
+                # (rows, columns) array of the chunk
+                table = np.loadtxt(
+                    lines, delimiter=self.delimiter, dtype=self.dtype,
+                    converters=self._converters, ndmin=2)
+                np.take(table, self.inputs, axis=1, out=invalues)
+
+                if self.labels is None:
+                    np.take(table, self.targets, axis=1, out=outvalues)
+                else:
+                    # Map the class indices to one-hot vectors
+                    classes = table[:, self.targets[0]].astype(np.intp)
+                    unknown = np.flatnonzero(classes < 0)
+                    if len(unknown):
+                        raise ValueError("Unknown label '{}'.".format(
+                            lines[unknown[0]].split(self.delimiter)[
+                                self.targets[0]].strip()))
+                    outvalues[...] = 0.
+                    outvalues[np.arange(len(lines)), classes] = 1.
+
+                yield invalues, outvalues
+
+    def count(self) -> int:
+        """
+        Return the number of samples (non-empty lines) of the file.
+        """
+        with open(self.filename, 'r') as f:
+            return sum(len(lines) for lines in self._lines(f, self.chunksize))
+
+    def _fill(self, inputs: np.array, targets: np.array) -> None:
+        """
+        Write all the chunks in the given input and output arrays.
+        """
+        start = 0
+        for invalues, outvalues in self.chunks():
+            inputs[start:start+len(invalues)] = invalues
+            targets[start:start+len(outvalues)] = outvalues
+            start += len(invalues)
+
+    def load(self) -> Dataset:
+        """
+        Load the whole file in a Dataset, reading the file once: the
+        chunks are copied, then concatenated.
+
+        Examples
+        --------
+
+        >>> from pybann import CSVLoader
+        >>> loader = CSVLoader("data/iris/iris.data", labels=[
+        ...     "Iris-setosa", "Iris-versicolor", "Iris-virginica"])
+        >>> loader.load()
+        Dataset(150, 4, 3)
+
+        """
+        inputs, targets = [self._invalues[:0]], [self._outvalues[:0]]
+        for invalues, outvalues in self.chunks():
+            inputs.append(invalues.copy())
+            targets.append(outvalues.copy())
+        return Dataset(np.concatenate(inputs), np.concatenate(targets))
+
+    def to_npy(self, inputs: str, targets: str) -> None:
+        """
+        Convert the file to .npy files of input and output values, written
+        chunk by chunk, which can be memory-mapped using `Dataset.load`.
+
+        The samples are counted first (without parsing the lines), so that
+        the files are allocated once and the whole file is never held in
+        memory.
+
+        Parameters
+        ----------
+        inputs: str
+            name of the .npy file of input values
+        targets: str
+            name of the .npy file of output values
+        """
+        nsamples = self.count()
+        invalues = np.lib.format.open_memmap(
+            inputs, mode='w+', dtype=self.dtype,
+            shape=(nsamples, self._invalues.shape[1]))
+        outvalues = np.lib.format.open_memmap(
+            targets, mode='w+', dtype=self.dtype,
+            shape=(nsamples, self._outvalues.shape[1]))
+        self._fill(invalues, outvalues)
+        invalues.flush()
+        outvalues.flush()
+        del invalues, outvalues
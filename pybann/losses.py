@@ -0,0 +1,172 @@
+"""losses.py
+"""
+
+import numpy as np
+from pybann import Activation
+
+
+class Loss:
+    """
+    Base class of the loss functions minimized by the training.
+
+    A loss function computes the sum of the losses of a set of samples
+    (`__call__`), used by `Model.evaluate`, the early stopping and the
+    training logs, and the delta values of the output layer (`delta`), from
+    which the gradient is backpropagated. Both use the same formula, so
+    that the reported loss is the one minimized by the training.
+    """
+
+    # Output activation function the loss is fused with, if any
+    activation = None
+
+    @staticmethod
+    def create(name: str):
+        """
+        Create a loss function from its name.
+
+        Parameters
+        ----------
+        name: str
+            name of the loss function ('mse' or 'crossentropy')
+
+        Examples
+        --------
+
+        >>> from pybann.losses import Loss
+        >>> Loss.create('crossentropy')
+        CrossEntropy()
+
+        """
+        return LOSSES[name]()
+
+    def __call__(self, outputs: np.array, targets: np.array) -> float:
+        """
+        Return the sum of the losses of the samples
+
+        Parameters
+        ----------
+        outputs: np.array
+            output values of the network model
+        targets: np.array
+            expected output values, of the same shape as `outputs`
+        """
+        raise NotImplementedError
+
+    def stacked(self, outputs: np.array, targets: np.array) -> np.array:
+        """
+        Return the sums of the losses of the samples for a stack of output
+        values (e.g. of the particles of a swarm)
+
+        Parameters
+        ----------
+        outputs: np.array
+            (n_stack, n_outputs, batch) output values, which can be
+            overwritten
+        targets: np.array
+            (n_outputs, batch) expected output values, shared by the stack
+
+        Returns
+        -------
+        losses: np.array
+            (n_stack,) array of the sums of the losses
+        """
+        raise NotImplementedError
+
+    def delta(self, outputs: np.array, targets: np.array, transfer: np.array,
+              activation, out: np.array) -> np.array:
+        """
+        Compute the delta values of the output layer, i.e. the gradient of
+        the loss with respect to its transfer values
+
+        Parameters
+        ----------
+        outputs: np.array
+            (n_outputs, batch) output values of the feed forward
+        targets: np.array
+            (n_outputs, batch) expected output values
+        transfer: np.array
+            (n_outputs, batch) transfer values of the output layer, which
+            can be overwritten
+        activation: function
+            activation function of the output layer
+        out: np.array
+            (n_outputs, batch) buffer in which the delta values are written
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return "{}()".format(type(self).__name__)
+
+
+class MSE(Loss):
+    """
+    Sum of the squared errors of the output values.
+
+    L = sum((outputs - targets)**2)
+
+    The delta values of the output layer are the errors times the
+    derivative of the activation function (the factor 2 being left to the
+    learning rate). For a softmax output layer, the errors are multiplied
+    by the full Jacobian of the softmax.
+    """
+
+    def __call__(self, outputs, targets) -> float:
+        return float(np.sum(np.square(outputs - targets)))
+
+    def stacked(self, outputs, targets) -> np.array:
+        outputs -= targets
+        np.square(outputs, out=outputs)
+        return np.sum(outputs, axis=(1, 2))
+
+    def delta(self, outputs, targets, transfer, activation, out) -> np.array:
+        # The targets are copied first: subtracting them, when transposed,
+        # would allocate the buffer of the ufunc
+        np.copyto(out, targets)
+        np.subtract(outputs, out, out=out)
+        if activation is Activation.softmax:
+            # Jacobian-vector product: softmax * (errors - sum(softmax * errors))
+            np.multiply(outputs, out, out=transfer)
+            out -= np.sum(transfer, axis=0, keepdims=True)
+            out *= outputs
+            return out
+        out *= activation(transfer, deriv=True, out=transfer,
+                          activated=outputs)
+        return out
+
+
+class CrossEntropy(Loss):
+    """
+    Cross-entropy of a softmax output layer, fused with the softmax.
+
+    L = -sum(targets * log(outputs))
+
+    The gradient of the cross-entropy with respect to the transfer values of
+    a softmax layer collapses to `outputs - targets`: the derivative of the
+    softmax is never evaluated. The softmax being computed with shifted
+    input values, the delta values stay exact for large transfer values,
+    and the output values are clipped to the smallest positive value of
+    their type before the logarithm, so that the loss stays finite.
+    """
+
+    activation = 'softmax'
+
+    def __call__(self, outputs, targets) -> float:
+        tiny = np.finfo(np.result_type(outputs, 1.)).tiny
+        return float(-np.sum(targets * np.log(np.maximum(outputs, tiny))))
+
+    def stacked(self, outputs, targets) -> np.array:
+        tiny = np.finfo(outputs.dtype).tiny
+        np.maximum(outputs, tiny, out=outputs)
+        np.log(outputs, out=outputs)
+        outputs *= targets
+        return -np.sum(outputs, axis=(1, 2))
+
+    def delta(self, outputs, targets, transfer, activation, out) -> np.array:
+        np.copyto(out, targets)
+        return np.subtract(outputs, out, out=out)
+
+
+LOSSES = {
+    'mse': MSE,
+    'crossentropy': CrossEntropy,
+}
@@ -1,22 +1,77 @@
 # Import modules
+import copy
+import time
+import tracemalloc
 import numpy as np
 import pickle
 from tqdm import tqdm
+from pybann import binary
 from pybann import Layer
+from pybann import FrozenModel
 from pybann import GradientDescent
+from pybann import ParallelGradientDescent
+from pybann import HogwildGradientDescent
+from pybann import ParticleSwarm
+from pybann import IslandSwarm
+from pybann import Optimizer
+from pybann import Loss
+from pybann import Dataset
+from pybann import EarlyStopping
 
 
 class Model:
 
-    def __init__(self, name: str = "New model") -> None:
+    def __init__(self, name: str = "New model", seed: int = None) -> None:
         self.name = name
+
+        # Random generator of the initial weights and biases (default:
+        # `np.random` global state)
+        self.rng = None
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
         self.layers = []
+        self.parameters = None
+        self.gradients = None
+        self.momentums = None
+        self.dtype = np.dtype(np.float64)
+
+        # Incremented when the weights and biases change (see
+        # `PredictionCache`)
+        self.version = 0
+
+    def __setstate__(self, state) -> None:
+        # Layer arrays are pickled as independent copies: bind them back
+        # to the parameter, gradient and momentum buffers
+        self.__dict__.update(state)
+        self.__dict__.setdefault('version', 0)
+        self.__dict__.setdefault('rng', None)
+        if self.parameters is not None:
+            self.bind(self.parameters, self.gradients, self.momentums)
 
     def __repr__(self) -> None:
         return "Model(name={})".format(self.name)
 
-    def __str__(self) -> None:
-        pass
+    def __str__(self) -> str:
+        lines = ["Model(name={})".format(self.name),
+                 "{:>5}  {:<20}{:>8}  {:<12}{:>12}{:>12}".format(
+                     "layer", "label", "neurons", "activation", "parameters",
+                     "bytes")]
+        total = 0
+        for ilayer, layer in enumerate(self.layers):
+            parameters, nbytes = 0, 0
+            if ilayer > 0:
+                parameters = layer.neurons * (self.layers[ilayer-1].neurons + 1)
+                nbytes = sum(self._nbytes(ilayer).values())
+            total += nbytes
+            activation = getattr(layer, 'activation', None)
+            lines.append("{:>5}  {:<20}{:>8}  {:<12}{:>12}{:>12}".format(
+                ilayer, layer.label[:19], layer.neurons,
+                "-" if ilayer == 0 or activation is None
+                else activation.__name__, parameters, nbytes))
+        lines.append("Total: {} parameters, {} bytes".format(
+            sum(layer.neurons * (previous.neurons + 1) for previous, layer
+                in zip(self.layers, self.layers[1:])), total))
+        return "\n".join(lines)
 
     def addInput(self, neurons: int, label: str = "") -> None:
         """
@@ -47,7 +102,8 @@ class Model:
             print("The layer must have at least 1 neuron.")
 
     def addLayer(self, neurons: int, activation: str = "sigmoid",
-                 label: str = "") -> None:
+                 label: str = "", init: str = "normal",
+                 bias_init: str = "normal") -> None:
         """
         Add a layer to the network model.
 
@@ -59,6 +115,12 @@ class Model:
             activation function for the layer (default: 'sigmoid')
         label: str, optional
             label (name) of the layer
+        init: str, optional
+            initializer of the weights, one of 'normal' (unscaled),
+            'xavier', 'he', 'lecun' and 'zeros' (see `Initializer`)
+            (default: 'normal')
+        bias_init: str, optional
+            initializer of the biases (default: 'normal')
 
         Examples
         --------
@@ -66,7 +128,8 @@ class Model:
         >>> from pybann import Model
         >>> network = Model()
         >>> network.addInput(neurons=4, label="Input layer")
-        >>> network.addLayer(neurons=8, activation="relu", label="1st hidden layer")
+        >>> network.addLayer(neurons=8, activation="relu", label="1st hidden layer",
+        ...                  init="he", bias_init="zeros")
 
         """
         try:
@@ -74,14 +137,98 @@ class Model:
             assert neurons >= 1
             self.layers.append(Layer(neurons, label))
             self.layers[-1].add_activation(activation)
+            self.layers[-1].add_initializer(init, bias_init)
 
         except AssertionError():
             print("The layer must have at least 1 neuron.")
 
-    def build(self) -> None:
+    def _slices(self, ilayer: int) -> tuple:
+        """
+        Return the slices of the biases and of the weights of a layer in
+        the parameter buffers.
+
+        The buffers store, layer after layer, the biase vector followed by
+        the weight matrix.
+        """
+        start = 0
+        for i in range(1, ilayer):
+            start += self.layers[i].neurons * (self.layers[i-1].neurons + 1)
+        nbiases = self.layers[ilayer].neurons
+        nweights = nbiases * self.layers[ilayer-1].neurons
+        return (slice(start, start+nbiases),
+                slice(start+nbiases, start+nbiases+nweights))
+
+    def _buffers(self, ilayer: int) -> tuple:
+        """
+        Return the slices of the parameter, gradient and momentum buffers
+        holding the biases and the weights of a layer.
+        """
+        buffers = (self.parameters, self.gradients, self.momentums)
+        return tuple(tuple(None if buffer is None else buffer[item]
+                           for buffer in buffers)
+                     for item in self._slices(ilayer))
+
+    def bind(self, parameters: np.array, gradients: np.array,
+             momentums: np.array) -> None:
+        """
+        Bind the weights and biases of the layers (and their gradient and
+        momentum arrays) to the given buffers, without modifying them.
+
+        Parameters
+        ----------
+        parameters: np.array
+            flat buffer of weights and biases, laid out as in `build`
+        gradients: np.array or None
+            flat buffer of gradients (`None` for inference only)
+        momentums: np.array or None
+            flat buffer of momentums (`None` for inference only)
+        """
+        self.parameters = parameters
+        self.gradients = gradients
+        self.momentums = momentums
+        for i in range(1, len(self.layers)):
+            biases, weights = self._buffers(i)
+            self.layers[i].bind_buffers(
+                'biases', (self.layers[i].neurons, 1), biases)
+            self.layers[i].bind_buffers(
+                'weights', (self.layers[i].neurons,
+                            self.layers[i-1].neurons), weights)
+
+    def _trainable(self) -> None:
+        """
+        Make the weights and biases writable, and allocate the gradient and
+        momentum buffers, when the network model was loaded for inference
+        (see `load`).
+        """
+        if self.gradients is not None and self.parameters.flags.writeable:
+            return
+        parameters = self.parameters
+        if not parameters.flags.writeable:
+            parameters = np.array(parameters)
+        nparameters = len(parameters)
+        if self.gradients is None:
+            self.bind(parameters, np.zeros(nparameters, dtype=self.dtype),
+                      np.zeros(nparameters, dtype=self.dtype))
+        else:
+            self.bind(parameters, self.gradients, self.momentums)
+
+    def build(self, dtype=np.float64) -> None:
         """
         Build the network model
 
+        The weights and biases of all layers, as well as their gradient
+        and momentum arrays, are views into three contiguous buffers
+        (`parameters`, `gradients` and `momentums`). The weights and biases
+        are drawn by the initializers of the layers (see `addLayer`), using
+        the random generator of the network model when seeded.
+
+        Parameters
+        ----------
+        dtype: data-type, optional
+            floating point type of the network model, used for the weights
+            and biases, the training and the feed forward (default:
+            np.float64)
+
         Example
         -------
 
@@ -94,14 +241,27 @@ class Model:
 
         """
         # build the model
-        # Add weights, biaises
+        # Allocate parameter, gradient and momentum buffers
+        nparameters = 0
+        for i in range(1, len(self.layers)):
+            nparameters += self.layers[i].neurons * (
+                self.layers[i-1].neurons + 1)
+        self.dtype = np.dtype(dtype)
+        self.parameters = np.zeros(nparameters, dtype=self.dtype)
+        self.gradients = np.zeros(nparameters, dtype=self.dtype)
+        self.momentums = np.zeros(nparameters, dtype=self.dtype)
+
+        # Add weights, biaises, drawn by the initializers of the layers
+        rng = np.random if self.rng is None else self.rng
         for i in tqdm(range(1, len(self.layers)),
                       bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
                       desc="Building..."):
+            biases, weights = self._buffers(i)
             # Add biases
-            self.layers[i].add_biases()
+            self.layers[i].add_biases(biases, rng)
             # Add weights
-            self.layers[i].add_weights(self.layers[i-1].neurons)
+            self.layers[i].add_weights(self.layers[i-1].neurons, weights, rng)
+        self.version += 1
 
     def forward(self, inValues) -> np.array:
         """
@@ -129,50 +289,361 @@ class Model:
         # Simple feeed forward
 
         # Convert to 2D (n, 1) and transpose for dot product
-        inValues = np.atleast_2d(inValues).transpose()
+        inValues = np.atleast_2d(
+            np.asarray(inValues, dtype=self.dtype)).transpose()
         for i in range(1, len(self.layers)):
             transfer = np.dot(self.layers[i].weights, inValues)
-            inValues = self.layers[i].activation(transfer+self.layers[i].biases)
+            transfer += self.layers[i].biases
+            inValues = self.layers[i].activation(transfer, out=transfer)
 
         # Flatten output (convert to 1D vector)
         return inValues.flatten()
 
+    def predict(self, inValues, chunk_size: int = 1024) -> np.array:
+        """
+        Feed forward the network model for several input vectors at once
+
+        The input vectors are processed by chunks of `chunk_size` rows, so
+        that each layer costs one matrix-matrix product per chunk while the
+        memory used for intermediate results stays bounded.
+
+        Parameters
+        ----------
+        inValues: np.array
+            (N, n_inputs) array containing one input vector per row
+        chunk_size: int, optional
+            maximum number of rows fed forward at once (default: 1024)
+
+        Returns
+        -------
+        outValues: np.array
+            (N, n_outputs) array containing one output vector per row
+
+        Example
+        -------
+
+        >>> import numpy as np
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=4, label="Input layer")
+        >>> network.addLayer(neurons=8, activation="relu", label="Hidden layer")
+        >>> network.addLayer(neurons=3, activation="sigmoid", label="Output layer")
+        >>> network.build()
+        >>> inData = np.random.randn(100, 4)
+        >>> np.shape(network.predict(inData))
+        (100, 3)
+
+        """
+        inValues = np.atleast_2d(np.asarray(inValues, dtype=self.dtype))
+        outValues = np.empty((np.shape(inValues)[0], self.layers[-1].neurons),
+                             dtype=self.dtype)
+
+        for start in range(0, np.shape(inValues)[0], chunk_size):
+            # Transpose chunk for dot product (one input vector per column)
+            values = inValues[start:start+chunk_size].transpose()
+            for i in range(1, len(self.layers)):
+                transfer = np.dot(self.layers[i].weights, values)
+                transfer += self.layers[i].biases
+                values = self.layers[i].activation(transfer, out=transfer)
+            outValues[start:start+chunk_size] = values.transpose()
+
+        return outValues
+
+    def evaluate(self, inValues, outValues, chunk_size: int = 1024,
+                 loss='mse') -> dict:
+        """
+        Evaluate the network model on a dataset
+
+        The loss is the mean over the samples of the loss function used for
+        the training (see `pybann.losses`), by default the squared error
+        summed over the outputs. The classes are given by the index of the
+        largest output value, or by thresholding at 0.5 for a single output.
+
+        Parameters
+        ----------
+        inValues: np.array
+            (N, n_inputs) array of input vectors, one per row
+        outValues: np.array
+            (N, n_outputs) array of expected output vectors, one per row
+        chunk_size: int, optional
+            number of input vectors fed forward at once (default: 1024)
+        loss: str or Loss, optional
+            loss function, either a Loss instance or one of 'mse' and
+            'crossentropy' (default: 'mse')
+
+        Returns
+        -------
+        results: dict
+            'loss', 'accuracy' and 'confusion', the (n_classes, n_classes)
+            confusion matrix (expected classes in rows, predicted classes
+            in columns)
+
+        Example
+        -------
+
+        >>> import numpy as np
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> results = network.evaluate(np.random.randn(10, 4), np.eye(3)[[0] * 10])
+        >>> results['confusion'].shape
+        (3, 3)
+
+        """
+        results = self.predict(inValues, chunk_size=chunk_size)
+        outValues = np.atleast_2d(np.asarray(outValues, dtype=self.dtype))
+
+        if results.shape[1] == 1:
+            expected = (outValues[:, 0] > 0.5).astype(np.intp)
+            predicted = (results[:, 0] > 0.5).astype(np.intp)
+            nclasses = 2
+        else:
+            expected = np.argmax(outValues, axis=1)
+            predicted = np.argmax(results, axis=1)
+            nclasses = results.shape[1]
+
+        if isinstance(loss, str):
+            loss = Loss.create(loss)
+        confusion = np.bincount(expected * nclasses + predicted,
+                                minlength=nclasses**2)
+
+        return {'loss': loss(results, outValues) / len(results),
+                'accuracy': float(np.mean(expected == predicted)),
+                'confusion': confusion.reshape(nclasses, nclasses)}
+
+    def freeze(self) -> FrozenModel:
+        """
+        Return an inference-only copy of the network model, holding only the
+        transposed weights and the biases in a contiguous buffer (see
+        `FrozenModel`)
+
+        Example
+        -------
+
+        >>> import numpy as np
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=8, activation="relu")
+        >>> network.addLayer(neurons=3, activation="sigmoid")
+        >>> network.build()
+        >>> frozen = network.freeze()
+        >>> frozen.predict_one(np.array([0., 1., 2., 3.])).shape
+        (3,)
+
+        """
+        return FrozenModel(self)
+
     def SGD(self, dataset, batchsize=0, alpha: float = 0.05,
-            nepoch: int = 1000, momentum: float = 0.5) -> None:
+            nepoch: int = 1000, momentum: float = 0.5,
+            optimizer="momentum", seed: int = None,
+            nworkers: int = 1, nthreads: int = 1, validation=None,
+            patience: int = 10, interval: int = 1, callbacks=None,
+            verbose: bool = True, loss="mse") -> None:
         """
         Train the neural network model
 
         Parameters
         ----------
-        dataset: list or np.array
-            a list of tuples in the form (inValues, outValues)
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues)
         batchsize: int, optional
-            size of minibatches for training
+            size of minibatches for training (default: 0, whole dataset)
         nepoch: int, optional
             maximum number of iterations (default: 1000)
         alpha: float, optional
             step for gradient descent (default: 0.05)
         momentum: float, optional
             step for the momentum (default: 0.5)
+        optimizer: str or Optimizer, optional
+            optimizer used to update the weights and biases, either an
+            Optimizer instance or one of 'momentum', 'nesterov', 'rmsprop'
+            and 'adam' (default: 'momentum')
+        seed: int, optional
+            seed of the random generator used to shuffle the dataset
+        nworkers: int, optional
+            number of worker processes; when greater than 1, each minibatch
+            is sharded across the workers (see `ParallelGradientDescent`)
+            (default: 1)
+        nthreads: int, optional
+            number of threads; when greater than 1, each thread trains on
+            its own shard of the dataset and updates the weights and biases
+            without synchronization (see `HogwildGradientDescent`)
+            (default: 1)
+        validation: Dataset, list or np.array, optional
+            validation set, a Dataset or a list of tuples in the form
+            (inValues, outValues); when given, the training stops early
+            when the validation loss does not improve, and the best weights
+            and biases are restored (see `EarlyStopping`)
+        patience: int, optional
+            number of evaluations on the validation set without improvement
+            before stopping (default: 10)
+        interval: int, optional
+            number of epochs between two evaluations on the validation set
+            (default: 1)
+        callbacks: list of Callback, optional
+            callbacks called during the training, e.g. `History`,
+            `JSONLogger`, `Timer` or `Throughput` (see `Callback`); the
+            early stopping on the validation set is called before them, so
+            that they see the validation loss ('val_loss')
+        verbose: bool, optional
+            show a progress bar (default: True)
+        loss: str or Loss, optional
+            loss function minimized, either a Loss instance or one of 'mse'
+            (sum of the squared errors) and 'crossentropy' (cross-entropy
+            fused with a softmax output layer) (default: 'mse')
+
+        Example
+        -------
+
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=2)
+        >>> network.addLayer(neurons=1)
+        >>> network.build()
+        >>> dataset = [((0., 1.), (1.,)), ((1., 0.), (0.,))]
+        >>> network.SGD(dataset, alpha=1.e-2, nepoch=100, optimizer="adam")
 
         """
-        SGDescent = GradientDescent(dataset, batchsize,
-                                    alpha, nepoch, momentum, self.layers)
-        SGDescent.run()
+        self._trainable()
+        if isinstance(optimizer, str):
+            optimizer = Optimizer.create(
+                optimizer, alpha=alpha, momentum=momentum)
+        if isinstance(loss, str):
+            loss = Loss.create(loss)
+
+        if nworkers > 1 and nthreads > 1:
+            raise ValueError("nworkers and nthreads cannot be both > 1.")
+
+        callbacks = list(callbacks or [])
+        if validation is not None:
+            if not isinstance(validation, Dataset):
+                validation = Dataset.from_pairs(validation, dtype=self.dtype)
+            callbacks.insert(0, EarlyStopping(
+                self, validation.inputs, validation.targets,
+                patience=patience, interval=interval, loss=loss))
+
+        if nthreads > 1:
+            SGDescent = HogwildGradientDescent(
+                dataset, batchsize, alpha, nepoch, momentum, self,
+                optimizer=optimizer, seed=seed, nthreads=nthreads,
+                callbacks=callbacks, verbose=verbose, loss=loss)
+        elif nworkers > 1:
+            SGDescent = ParallelGradientDescent(
+                dataset, batchsize, alpha, nepoch, momentum, self,
+                optimizer=optimizer, seed=seed, nworkers=nworkers,
+                callbacks=callbacks, verbose=verbose, loss=loss)
+        else:
+            SGDescent = GradientDescent(
+                dataset, batchsize, alpha, nepoch, momentum, self.layers,
+                buffers=(self.parameters, self.gradients, self.momentums),
+                optimizer=optimizer, seed=seed, callbacks=callbacks,
+                verbose=verbose, loss=loss)
+        # The weights and biases may have changed even if the training
+        # is interrupted
+        try:
+            SGDescent.run()
+        finally:
+            self.version += 1
+
+    def PSO(self, dataset, nparticles: int = 32, nepoch: int = 100,
+            batchsize: int = 0, inertia: float = 0.7, cognitive: float = 1.5,
+            social: float = 1.5, spread: float = 1., seed: int = None,
+            islands: int = 1, migration: int = 10,
+            topology: str = 'ring', loss="mse") -> None:
+        """
+        Train the neural network model using particle swarm optimization
+        (see `ParticleSwarm`), or an island model of particle swarms across
+        worker processes when `islands` is greater than 1 (see
+        `IslandSwarm`)
+
+        Parameters
+        ----------
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues)
+        nparticles: int, optional
+            number of particles, of each island (default: 32)
+        nepoch: int, optional
+            number of iterations (default: 100)
+        batchsize: int, optional
+            size of minibatches on which the particles are evaluated
+            (default: 0, whole dataset)
+        inertia: float, optional
+            weight of the previous velocity (default: 0.7)
+        cognitive: float, optional
+            attraction towards the best position of each particle
+            (default: 1.5)
+        social: float, optional
+            attraction towards the best position of the swarm
+            (default: 1.5)
+        spread: float, optional
+            standard deviation of the initial positions around the current
+            weights and biases (default: 1.)
+        seed: int, optional
+            seed of the random generator
+        islands: int, optional
+            number of islands, one worker process each (default: 1)
+        migration: int, optional
+            number of iterations between two migrations of the best
+            particles between islands (default: 10)
+        topology: str, optional
+            migration topology, 'ring' (from the previous island) or 'full'
+            (from all the other islands) (default: 'ring')
+        loss: str or Loss, optional
+            loss function minimized, either a Loss instance or one of 'mse'
+            and 'crossentropy' (default: 'mse')
+
+        Example
+        -------
 
-    def PSO(self):
-        # particle swarm optimization
-        # Need PSO class with options
-        pass
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=2)
+        >>> network.addLayer(neurons=1)
+        >>> network.build()
+        >>> dataset = [((0., 1.), (1.,)), ((1., 0.), (0.,))]
+        >>> network.PSO(dataset, nparticles=16, nepoch=50)
 
-    def save(self, filename: str = "network.bann") -> None:
         """
-        Save the network model using Pickle
+        self._trainable()
+        if isinstance(loss, str):
+            loss = Loss.create(loss)
+        options = dict(
+            nparticles=nparticles, nepoch=nepoch, batchsize=batchsize,
+            inertia=inertia, cognitive=cognitive, social=social,
+            spread=spread, seed=seed, loss=loss)
+        if islands > 1:
+            swarm = IslandSwarm(dataset, self, islands=islands,
+                                migration=migration, topology=topology,
+                                **options)
+        else:
+            swarm = ParticleSwarm(dataset, self, **options)
+        # The weights and biases may have changed even if the training
+        # is interrupted
+        try:
+            swarm.run()
+        finally:
+            self.version += 1
+
+    def save(self, filename: str = "network.bann", pickled: bool = False) -> None:
+        """
+        Save the network model
+
+        By default, the network model is saved in a versioned binary format
+        made of a header describing the architecture (layers, activation
+        functions and type of the parameters) followed by the raw buffer
+        of weights and biases, which `load` memory-maps. The gradient and
+        momentum buffers are not saved. Otherwise, the whole object is
+        pickled.
 
         Parameters
         ----------
         filename: str 
             filename where to save the network model (default: 'network.bann')
+        pickled: bool, optional
+            when `True`, save the network model using Pickle (default: False)
         
         Example
         -------
@@ -187,21 +658,261 @@ class Model:
         >>> network.save("network_example_save.bann")
         
         """
-        with open(filename, 'wb') as f:
-            pickle.dump(self, f)
-
-    def load(self, filename: str):
+        if self.parameters is None:
+            raise ValueError("The network model must be built before saving.")
+
+        if pickled:
+            with open(filename, 'wb') as f:
+                pickle.dump(self, f)
+            return
+
+        layers = [{'neurons': layer.neurons, 'label': layer.label}
+                  for layer in self.layers]
+        for layer, description in zip(self.layers[1:], layers[1:]):
+            description['activation'] = layer.activation.__name__
+        binary.write(filename, {'name': self.name, 'layers': layers},
+                     self.parameters)
+
+    def load(self, filename: str, mmap_mode: str = 'c') -> None:
         """
-        Load a network model using Pickle
+        Load a network model saved in the binary format or using Pickle
+
+        The format is detected from the first bytes of the file. The
+        weights and biases of a binary file are memory-mapped, so that
+        loading does not depend on the size of the network model and that
+        the processes loading the same file share its pages in memory. The
+        gradient and momentum buffers are only allocated when training.
 
         Parameters
         ----------
         filename: str 
             name of the saved network model (default: 'network.bann')
+        mmap_mode: str, optional
+            mode of the memory map of the weights and biases: 'c' (copy on
+            write, the file is never modified) or 'r' (read only, copied
+            when training), or `None` to read them in memory (default: 'c')
+
+        Example
+        -------
+
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.load("network_example_save.bann")
+        >>> network.layers[1].activation.__name__
+        'relu'
+
         """
-        with open(filename, 'rb') as f:
-            self = pickle.load(f)
+        if not binary.is_binary(filename):
+            with open(filename, 'rb') as f:
+                version = self.version
+                self.__dict__.update(pickle.load(f).__dict__)
+                self.version = version + 1
+            return
+
+        header, offset = binary.read_header(filename)
+        self.name = header['name']
+        self.layers = []
+        for description in header['layers']:
+            self.layers.append(
+                Layer(description['neurons'], description['label']))
+            if 'activation' in description:
+                self.layers[-1].add_activation(description['activation'])
+
+        self.dtype = np.dtype(header['dtype'])
+        if mmap_mode is None:
+            parameters = np.fromfile(filename, dtype=self.dtype,
+                                     count=header['nparameters'], offset=offset)
+        else:
+            parameters = np.memmap(filename, dtype=self.dtype, mode=mmap_mode,
+                                   offset=offset,
+                                   shape=(header['nparameters'],))
+        self.bind(parameters, None, None)
+        self.version += 1
+
+    def _nbytes(self, ilayer: int) -> dict:
+        """
+        Return the number of bytes held by each weight and biase array of a
+        layer, 0 for the arrays not allocated (see `load`).
+        """
+        layer = self.layers[ilayer]
+        return {name + suffix: getattr(layer, name + suffix, None).nbytes
+                if getattr(layer, name + suffix, None) is not None else 0
+                for name in ('weights', 'biases')
+                for suffix in ('', 'Update', 'UpdateSave')}
+
+    def profile(self, inValues, outValues=None, repeat: int = 10) -> list:
+        """
+        Profile the feed forward and the backpropagation of a batch, layer
+        by layer
+
+        The feed forward and backpropagation of the training (see
+        `GradientDescent.forward_layer` and `GradientDescent.backward_layer`)
+        are run on a copy of the network model, so that its gradients are
+        left untouched. The theoretical floating point operations count the
+        matrix products, the additions and the multiplications, and one
+        operation per value for the activation functions and their
+        derivatives. On Python 3.8, measuring the peak allocations of a
+        layer restarts the tracing of tracemalloc, clearing the traces
+        already recorded.
+
+        Parameters
+        ----------
+        inValues: np.array
+            (N, n_inputs) array of input values, one sample per row
+        outValues: np.array, optional
+            (N, n_outputs) array of expected output values (default: zeros,
+            the cost of the backpropagation not depending on them)
+        repeat: int, optional
+            number of timed passes, the best time being kept (default: 10)
+
+        Returns
+        -------
+        profile: list of dict
+            one dict per layer (input layer excluded) holding the 'layer'
+            index, 'label', 'neurons', 'activation' name, the number of
+            'parameters', the bytes held by each weight and biase array
+            ('nbytes'), the bytes of the workspace buffers of the batch
+            ('workspace'), and the theoretical floating point operations
+            ('flops'), best time (s) and peak transient allocations (bytes,
+            measured by tracemalloc) of the feed forward ('*_forward') and
+            of the backpropagation ('*_backward')
+
+        Example
+        -------
+
+        >>> import numpy as np
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=8, activation="relu")
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> profile = network.profile(np.random.randn(32, 4))
+        >>> profile[0]['parameters'], profile[0]['flops_forward']
+        (40, 2560)
+
+        """
+        inValues = np.atleast_2d(np.asarray(inValues, dtype=self.dtype))
+        nsamples = np.shape(inValues)[0]
+        if outValues is None:
+            outValues = np.zeros((nsamples, self.layers[-1].neurons),
+                                 dtype=self.dtype)
+        outValues = np.atleast_2d(np.asarray(outValues, dtype=self.dtype))
+
+        model = copy.deepcopy(self)
+        model._trainable()
+        descent = GradientDescent(
+            Dataset(inValues, outValues, dtype=self.dtype), 0, 0., 0, 0.,
+            model.layers,
+            buffers=(model.parameters, model.gradients, model.momentums))
+        activation, transfer = descent.forward(inValues)
+        _, _, delta = descent.workspace.views(nsamples)
+        nlayers = len(self.layers)
+        passes = {
+            'forward': (range(1, nlayers), lambda ilayer:
+                        descent.forward_layer(ilayer, activation, transfer,
+                                              delta)),
+            'backward': (range(nlayers - 1, 0, -1), lambda ilayer:
+                         descent.backward_layer(ilayer, activation, transfer,
+                                                delta, outValues))}
+
+        # Best time of each layer
+        times = {name: np.full(nlayers, np.inf) for name in passes}
+        for _ in range(repeat):
+            descent.init_update()
+            for name, (layers, step) in passes.items():
+                for ilayer in layers:
+                    start = time.perf_counter()
+                    step(ilayer)
+                    times[name][ilayer] = min(times[name][ilayer],
+                                              time.perf_counter() - start)
+
+        # Peak transient allocations of each layer
+        peaks = {name: np.zeros(nlayers, dtype=int) for name in passes}
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            for name, (layers, step) in passes.items():
+                for ilayer in layers:
+                    if hasattr(tracemalloc, 'reset_peak'):
+                        tracemalloc.reset_peak()
+                    else:
+                        # Python 3.8: the peak is reset by restarting the
+                        # tracing, which clears the traces
+                        tracemalloc.stop()
+                        tracemalloc.start()
+                    current, _ = tracemalloc.get_traced_memory()
+                    step(ilayer)
+                    peaks[name][ilayer] = \
+                        tracemalloc.get_traced_memory()[1] - current
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        profile = []
+        for ilayer in range(1, nlayers):
+            layer = self.layers[ilayer]
+            n, m = layer.neurons, self.layers[ilayer-1].neurons
+            # Delta values of the output layer from the output errors,
+            # of the other layers from the delta values of the next layer
+            if ilayer == nlayers - 1:
+                flops_delta = n * nsamples
+            else:
+                flops_delta = 2 * self.layers[ilayer+1].neurons * n * nsamples
+            itemsize = self.dtype.itemsize
+            profile.append({
+                'layer': ilayer, 'label': layer.label, 'neurons': n,
+                'activation': layer.activation.__name__,
+                'parameters': n * (m + 1),
+                'nbytes': self._nbytes(ilayer),
+                'workspace': (3 * n * nsamples + n * (m + 1)) * itemsize,
+                'flops_forward': (2 * m + 2) * n * nsamples,
+                'flops_backward': flops_delta + (2 * m + 3) * n * nsamples
+                + n * (m + 1),
+                'time_forward': float(times['forward'][ilayer]),
+                'time_backward': float(times['backward'][ilayer]),
+                'peak_forward': int(peaks['forward'][ilayer]),
+                'peak_backward': int(peaks['backward'][ilayer])})
+        return profile
+
+    def show(self, inValues=None, outValues=None) -> None:
+        """
+        Print the structure of the network model, and its profile (see
+        `profile`) when input values are given
 
-    def show(self):
-        # print network structure
-        pass
+        Parameters
+        ----------
+        inValues: np.array, optional
+            (N, n_inputs) array of input values of the profiled batch
+        outValues: np.array, optional
+            (N, n_outputs) array of expected output values of the profiled
+            batch
+
+        Example
+        -------
+
+        >>> import numpy as np
+        >>> from pybann import Model
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=8, activation="relu")
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> network.show(np.random.randn(32, 4))
+
+        """
+        print(self)
+        if inValues is None:
+            return
+
+        print("{:>5}{:>12}{:>12}{:>12}{:>12}{:>12}{:>12}".format(
+            "layer", "MFLOP fwd", "MFLOP bwd", "us fwd", "us bwd",
+            "peak fwd", "peak bwd"))
+        for layer in self.profile(inValues, outValues):
+            print("{:>5}{:>12.3f}{:>12.3f}{:>12.1f}{:>12.1f}{:>12}{:>12}"
+                  .format(layer['layer'], layer['flops_forward'] * 1.e-6,
+                          layer['flops_backward'] * 1.e-6,
+                          layer['time_forward'] * 1.e6,
+                          layer['time_backward'] * 1.e6,
+                          layer['peak_forward'], layer['peak_backward']))
@@ -0,0 +1,202 @@
+"""optimizers.py
+"""
+
+import numpy as np
+
+
+class Optimizer:
+    """
+    Base class of the optimizers used to update the weights and biases of
+    the neural network from their gradients.
+
+    An optimizer updates (parameters, update, update save) array triplets
+    in place: `update` holds the gradient and `update save` is the state
+    kept from one iteration to the next (velocity, moving average...).
+    Each update is computed in a single pass through a scratch buffer, so
+    that no temporary array is allocated.
+    """
+
+    def __init__(self, alpha: float = 0.05) -> None:
+        """
+        Initialize the optimizer
+
+        Parameters
+        ----------
+        alpha: float, optional
+            learning rate (default: 0.05)
+        """
+        self.alpha = alpha
+        self.iteration = 0
+        self.buffers = {}
+
+    @staticmethod
+    def create(name: str, alpha: float = 0.05, momentum: float = 0.5):
+        """
+        Create an optimizer from its name.
+
+        Parameters
+        ----------
+        name: str
+            name of the optimizer ('momentum', 'nesterov', 'rmsprop' or
+            'adam')
+        alpha: float, optional
+            learning rate (default: 0.05)
+        momentum: float, optional
+            momentum of the 'momentum' and 'nesterov' optimizers
+            (default: 0.5)
+
+        Examples
+        --------
+
+        >>> from pybann.optimizers import Optimizer
+        >>> Optimizer.create('adam', alpha=1.e-3)
+        Adam(alpha=0.001)
+
+        """
+        if name in ('momentum', 'nesterov'):
+            return OPTIMIZERS[name](alpha=alpha, momentum=momentum)
+        return OPTIMIZERS[name](alpha=alpha)
+
+    def buffer(self, name: str, igroup: int, like: np.array) -> np.array:
+        """
+        Return a buffer of the same shape and type as `like`, allocated
+        (and filled with zeros) at first call for each name and group.
+        """
+        if (name, igroup) not in self.buffers:
+            self.buffers[(name, igroup)] = np.zeros_like(like)
+        return self.buffers[(name, igroup)]
+
+    def step(self, groups: list) -> None:
+        """
+        Update all the (parameters, update, update save) triplets.
+        """
+        self.iteration += 1
+        for igroup, (parameters, update, save) in enumerate(groups):
+            self.update(igroup, parameters, update, save)
+
+    def update(self, igroup: int, parameters: np.array, update: np.array,
+               save: np.array) -> None:
+        """
+        Update a (parameters, update, update save) triplet in place.
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return "{}(alpha={})".format(type(self).__name__, self.alpha)
+
+
+class Momentum(Optimizer):
+    """
+    Gradient descent with momentum.
+
+    v = momentum * v - alpha * g
+    p = p + v
+    """
+
+    def __init__(self, alpha: float = 0.05, momentum: float = 0.5) -> None:
+        super().__init__(alpha)
+        self.momentum = momentum
+
+    def update(self, igroup, parameters, update, save) -> None:
+        scratch = self.buffer('scratch', igroup, parameters)
+
+        np.multiply(update, self.alpha, out=scratch)
+        save *= self.momentum
+        save -= scratch
+        parameters += save
+
+
+class Nesterov(Optimizer):
+    """
+    Gradient descent with Nesterov momentum.
+
+    v = momentum * v - alpha * g
+    p = p + momentum * v - alpha * g
+    """
+
+    def __init__(self, alpha: float = 0.05, momentum: float = 0.5) -> None:
+        super().__init__(alpha)
+        self.momentum = momentum
+
+    def update(self, igroup, parameters, update, save) -> None:
+        scratch = self.buffer('scratch', igroup, parameters)
+
+        np.multiply(update, self.alpha, out=scratch)
+        save *= self.momentum
+        save -= scratch
+        parameters -= scratch
+        np.multiply(save, self.momentum, out=scratch)
+        parameters += scratch
+
+
+class RMSProp(Optimizer):
+    """
+    RMSProp, gradient descent scaled by a moving average of the squared
+    gradient.
+
+    s = rho * s + (1 - rho) * g**2
+    p = p - alpha * g / (sqrt(s) + epsilon)
+    """
+
+    def __init__(self, alpha: float = 1.e-3, rho: float = 0.9,
+                 epsilon: float = 1.e-8) -> None:
+        super().__init__(alpha)
+        self.rho = rho
+        self.epsilon = epsilon
+
+    def update(self, igroup, parameters, update, save) -> None:
+        scratch = self.buffer('scratch', igroup, parameters)
+
+        np.square(update, out=scratch)
+        scratch *= 1. - self.rho
+        save *= self.rho
+        save += scratch
+        np.sqrt(save, out=scratch)
+        scratch += self.epsilon
+        np.divide(update, scratch, out=scratch)
+        scratch *= self.alpha
+        parameters -= scratch
+
+
+class Adam(Optimizer):
+    """
+    Adam, gradient descent using bias-corrected moving averages of the
+    gradient and of the squared gradient.
+
+    m = beta1 * m + (1 - beta1) * g
+    v = beta2 * v + (1 - beta2) * g**2
+    p = p - alpha * m / (1 - beta1**t) / (sqrt(v / (1 - beta2**t)) + epsilon)
+    """
+
+    def __init__(self, alpha: float = 1.e-3, beta1: float = 0.9,
+                 beta2: float = 0.999, epsilon: float = 1.e-8) -> None:
+        super().__init__(alpha)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+    def update(self, igroup, parameters, update, save) -> None:
+        scratch = self.buffer('scratch', igroup, parameters)
+        variance = self.buffer('variance', igroup, parameters)
+
+        np.multiply(update, 1. - self.beta1, out=scratch)
+        save *= self.beta1
+        save += scratch
+        np.square(update, out=scratch)
+        scratch *= 1. - self.beta2
+        variance *= self.beta2
+        variance += scratch
+        np.sqrt(variance, out=scratch)
+        scratch *= (1. - self.beta2**self.iteration)**-0.5
+        scratch += self.epsilon
+        np.divide(save, scratch, out=scratch)
+        scratch *= self.alpha / (1. - self.beta1**self.iteration)
+        parameters -= scratch
+
+
+OPTIMIZERS = {
+    'momentum': Momentum,
+    'nesterov': Nesterov,
+    'rmsprop': RMSProp,
+    'adam': Adam,
+}
@@ -0,0 +1,536 @@
+"""parallel.py
+"""
+
+import copy
+import time
+import threading
+import multiprocessing
+from multiprocessing import Pool
+from multiprocessing import shared_memory
+import numpy as np
+from tqdm import tqdm
+from pybann import Dataset
+from pybann import GradientDescent
+from pybann import ParticleSwarm
+
+
+# State of a worker process, set by `_initialize`
+_worker = {}
+
+
+def _initialize(model, dataset, names: tuple, nworkers: int, loss) -> None:
+    """
+    Initialize a worker process: bind the layers of the network model to
+    the shared weights and biases, and attach the shared gradients.
+    """
+    parameters = shared_memory.SharedMemory(name=names[0])
+    gradients = shared_memory.SharedMemory(name=names[1])
+    nparameters = len(model.parameters)
+
+    model.bind(
+        np.ndarray((nparameters,), dtype=model.dtype, buffer=parameters.buf),
+        np.zeros(nparameters, dtype=model.dtype),
+        np.zeros(nparameters, dtype=model.dtype))
+
+    _worker['memory'] = (parameters, gradients)
+    _worker['model'] = model
+    _worker['gradients'] = np.ndarray(
+        (nworkers, nparameters), dtype=model.dtype, buffer=gradients.buf)
+    _worker['descent'] = GradientDescent(
+        dataset, 0, 0., 0, 0., model.layers,
+        buffers=(model.parameters, model.gradients, model.momentums),
+        loss=loss)
+
+
+def _gradient(task: tuple) -> float:
+    """
+    Compute the gradient of a shard of the minibatch and write it in the
+    shared gradients row of the shard. Return the loss of the shard times
+    its number of samples when requested, `None` otherwise.
+    """
+    ishard, indices, withloss = task
+    descent = _worker['descent']
+
+    loss = None
+    descent.init_update()
+    if len(indices) > 0:
+        workspace = descent.allocate(len(indices))
+        invalues, outvalues = descent.data.gather(
+            indices, out=workspace.inputs(len(indices)))
+        activation, transfer = descent.forward(invalues)
+        descent.backward(activation, transfer, outvalues)
+        if withloss:
+            loss = descent.loss(activation[-1], outvalues) * len(indices)
+
+    _worker['gradients'][ishard] = _worker['model'].gradients
+    return loss
+
+
+class ParallelGradientDescent(GradientDescent):
+    """
+    Class to train the neural network using the gradient descent method,
+    sharding each minibatch across a pool of worker processes
+    (data-parallel training).
+
+    The weights and biases, and one gradient buffer per worker, are shared
+    with the workers through `multiprocessing.shared_memory`. For each
+    minibatch, every worker computes the gradient of its shard, the
+    gradients are summed (always in the same order) in the gradient buffer
+    of the network model, and the optimizer updates the weights and biases.
+    Training is reproducible given a seed.
+    """
+
+    def __init__(self, dataset, batchsize: int, alpha: float,
+                 nepoch: int, momentum: float, model,
+                 optimizer=None, seed: int = None, nworkers: int = 2,
+                 callbacks=None, verbose: bool = True, loss=None) -> None:
+        """
+        Initialize the parallel gradient descent class
+
+        Parameters
+        ----------
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues)
+        batchsize: int
+            size of minibatches for training (0 for the whole dataset)
+        alpha: float
+            step for gradient descent
+        nepoch: int
+            maximum number of iterations
+        momentum: float
+            step for the momentum
+        model: Model
+            built network model to train
+        optimizer: Optimizer, optional
+            optimizer used to update the weights and biases (default:
+            gradient descent with momentum using `alpha` and `momentum`)
+        seed: int, optional
+            seed of the random generator used to shuffle the dataset
+        nworkers: int, optional
+            number of worker processes (default: 2)
+        callbacks: list of Callback, optional
+            callbacks called during the training, the feed forward and
+            backpropagation of the workers being timed as 'time_gradient'
+        verbose: bool, optional
+            show a progress bar (default: True)
+        loss: Loss, optional
+            loss function minimized (default: sum of the squared errors)
+        """
+        super().__init__(
+            dataset, batchsize, alpha, nepoch, momentum, model.layers,
+            buffers=(model.parameters, model.gradients, model.momentums),
+            optimizer=optimizer, seed=seed, callbacks=callbacks,
+            verbose=verbose, loss=loss)
+        self.model = model
+        self.nworkers = nworkers
+
+    def run(self) -> None:
+        """
+        Train
+        """
+        batchsize = self.batchsize
+        if batchsize == 0:
+            batchsize = len(self.data)
+        parameters, gradients, _ = self.buffers
+
+        # Shared weights and biases, and gradients of each worker
+        memory = [shared_memory.SharedMemory(
+            create=True, size=size * parameters.itemsize)
+            for size in (parameters.size, self.nworkers * parameters.size)]
+        sharedParameters = np.ndarray(
+            parameters.shape, dtype=parameters.dtype, buffer=memory[0].buf)
+        sharedGradients = np.ndarray(
+            (self.nworkers, parameters.size), dtype=parameters.dtype,
+            buffer=memory[1].buf)
+        sharedParameters[:] = parameters
+        callbacks = self.callbacks
+        callbacks.on_train_begin({'nepoch': self.nepoch,
+                                  'batchsize': batchsize})
+
+        logs = {}
+        try:
+            with Pool(self.nworkers, initializer=_initialize,
+                      initargs=(self.model, self.data,
+                                (memory[0].name, memory[1].name),
+                                self.nworkers, self.lossfunction)) as pool:
+
+                for epoch in tqdm(range(self.nepoch),
+                                  disable=not self.verbose,
+                                  bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
+                                  desc="Training..."):
+                    if callbacks:
+                        logs = {'epoch': epoch, 'samples': batchsize}
+                        callbacks.on_epoch_begin(epoch, logs)
+                        start = time.perf_counter()
+
+                    if self.batchsize != 0:
+                        # Shuffle dataset
+                        self.data.shuffle(self.rng)
+
+                    # Compute the gradients of the shards of the minibatch
+                    shards = np.array_split(
+                        self.data.indices[:batchsize], self.nworkers)
+                    if callbacks:
+                        times = [start, time.perf_counter()]
+                    losses = pool.map(_gradient, [
+                        (ishard, shard, bool(callbacks))
+                        for ishard, shard in enumerate(shards)])
+
+                    # Reduce
+                    np.sum(sharedGradients, axis=0, out=gradients)
+                    if callbacks:
+                        times.append(time.perf_counter())
+
+                    # Update
+                    self.update()
+                    sharedParameters[:] = parameters
+
+                    if callbacks:
+                        times.append(time.perf_counter())
+                        for key, t0, t1 in zip(('data', 'gradient', 'update'),
+                                               times, times[1:]):
+                            logs['time_' + key] = t1 - t0
+                        logs['time'] = times[-1] - times[0]
+                        logs['loss'] = sum(loss for loss in losses
+                                           if loss is not None) / batchsize
+                        callbacks.on_batch_end(epoch, logs)
+                        if callbacks.on_epoch_end(epoch, logs):
+                            break
+
+            callbacks.on_train_end(logs)
+        finally:
+            del sharedParameters, sharedGradients
+            for block in memory:
+                block.close()
+                block.unlink()
+
+
+class HogwildGradientDescent(GradientDescent):
+    """
+    Class to train the neural network using asynchronous (Hogwild-style)
+    multithreaded gradient descent.
+
+    The dataset is split in one shard per thread. Each thread runs its own
+    feed forward, backpropagation and update cycle on minibatches of its
+    shard, with private gradient and momentum buffers, and writes its
+    updates directly in the shared weights and biases of the network model
+    without any lock. The threads run concurrently since NumPy releases
+    the GIL in `np.dot` and in the element-wise operations on large arrays.
+
+    Updates from different threads can interleave, so that training is not
+    reproducible, even given a seed.
+    """
+
+    def __init__(self, dataset, batchsize: int, alpha: float,
+                 nepoch: int, momentum: float, model,
+                 optimizer=None, seed: int = None, nthreads: int = 2,
+                 callbacks=None, verbose: bool = True, loss=None) -> None:
+        """
+        Initialize the asynchronous gradient descent class
+
+        Parameters
+        ----------
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues)
+        batchsize: int
+            size of minibatches for training (0 for the whole shard)
+        alpha: float
+            step for gradient descent
+        nepoch: int
+            number of iterations of each thread
+        momentum: float
+            step for the momentum
+        model: Model
+            built network model to train
+        optimizer: Optimizer, optional
+            optimizer used to update the weights and biases, copied for
+            each thread (default: gradient descent with momentum using
+            `alpha` and `momentum`)
+        seed: int, optional
+            seed of the random generators used to draw the minibatches
+        nthreads: int, optional
+            number of threads (default: 2)
+        callbacks: list of Callback, optional
+            callbacks called by the first thread during its epochs, all
+            the threads stopping when one of them returns `True`
+        verbose: bool, optional
+            show the progress bar of the first thread (default: True)
+        loss: Loss, optional
+            loss function minimized (default: sum of the squared errors)
+        """
+        super().__init__(
+            dataset, batchsize, alpha, nepoch, momentum, model.layers,
+            buffers=(model.parameters, model.gradients, model.momentums),
+            optimizer=optimizer, seed=seed, callbacks=callbacks,
+            verbose=verbose, loss=loss)
+        self.model = model
+        self.nthreads = nthreads
+        self.seed = seed
+        self.stopped = False
+        self.errors = []
+
+    def thread(self, shard: np.array, seed, first: bool) -> None:
+        """
+        Train on a shard of the dataset, updating the shared weights and
+        biases of the network model.
+
+        The first thread shows the progress bar and calls the callbacks.
+        """
+        # Copy of the model bound to the shared weights and biases, with
+        # private gradient and momentum buffers
+        model = copy.deepcopy(self.model)
+        model.bind(self.model.parameters,
+                   np.zeros_like(self.model.gradients),
+                   np.zeros_like(self.model.momentums))
+        descent = GradientDescent(
+            self.data, 0, self.alpha, 0, self.momentum, model.layers,
+            buffers=(model.parameters, model.gradients, model.momentums),
+            optimizer=copy.deepcopy(self.optimizer), loss=self.lossfunction)
+
+        rng = np.random.default_rng(seed)
+        batchsize = self.batchsize
+        if batchsize == 0 or batchsize > len(shard):
+            batchsize = len(shard)
+        workspace = descent.allocate(batchsize)
+        callbacks = self.callbacks if first else descent.callbacks
+
+        for epoch in tqdm(range(self.nepoch),
+                          disable=not (first and self.verbose),
+                          bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
+                          desc="Training..."):
+            if callbacks:
+                logs = {'epoch': epoch, 'samples': batchsize}
+                callbacks.on_epoch_begin(epoch, logs)
+                start = time.perf_counter()
+
+            # Draw minibatch
+            indices = shard
+            if batchsize < len(shard):
+                indices = rng.choice(shard, batchsize, replace=False)
+            invalues, outvalues = self.data.gather(
+                indices, out=workspace.inputs(batchsize))
+            if callbacks:
+                times = [start, time.perf_counter()]
+
+            # Feed forward, feed backward and update
+            descent.init_update()
+            activation, transfer = descent.forward(invalues)
+            if callbacks:
+                times.append(time.perf_counter())
+            descent.backward(activation, transfer, outvalues)
+            if callbacks:
+                times.append(time.perf_counter())
+            descent.update()
+
+            if callbacks:
+                times.append(time.perf_counter())
+                for key, t0, t1 in zip(('data', 'forward', 'backward',
+                                        'update'), times, times[1:]):
+                    logs['time_' + key] = t1 - t0
+                logs['time'] = times[-1] - times[0]
+                logs['loss'] = descent.loss(activation[-1], outvalues)
+                callbacks.on_batch_end(epoch, logs)
+                if callbacks.on_epoch_end(epoch, logs):
+                    self.stopped = True
+            if self.stopped:
+                break
+
+    def guarded_thread(self, shard: np.array, seed, first: bool) -> None:
+        """
+        Train on a shard of the dataset (see `thread`), keeping the
+        exception raised, if any, and stopping the other threads.
+        """
+        try:
+            self.thread(shard, seed, first)
+        except Exception as error:
+            self.errors.append(error)
+            self.stopped = True
+
+    def run(self) -> None:
+        """
+        Train, raising the first exception raised by a thread, once all the
+        threads have stopped.
+        """
+        shards = np.array_split(
+            np.random.default_rng(self.seed).permutation(len(self.data)),
+            self.nthreads)
+        seeds = np.random.SeedSequence(self.seed).spawn(self.nthreads)
+        self.stopped = False
+        self.errors = []
+        self.callbacks.on_train_begin({'nepoch': self.nepoch,
+                                       'batchsize': self.batchsize})
+
+        threads = [threading.Thread(target=self.guarded_thread,
+                                    args=(shard, seed, ithread == 0))
+                   for ithread, (shard, seed) in enumerate(zip(shards, seeds))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
+        self.callbacks.on_train_end({})
+
+
+def _island(swarm: ParticleSwarm, iisland: int, names: tuple,
+            migration: int, topology: str, barrier) -> None:
+    """
+    Evolve the sub-swarm of an island, exchanging the best particles with
+    the neighbouring islands every `migration` iterations, then write the
+    best particle of the island in the shared memory.
+    """
+    positions = shared_memory.SharedMemory(name=names[0])
+    losses = shared_memory.SharedMemory(name=names[1])
+    nislands = barrier.parties
+    bests = np.ndarray((nislands, swarm.positions.shape[1]),
+                       dtype=swarm.dtype, buffer=positions.buf)
+    bestLosses = np.ndarray((nislands,), dtype=np.float64, buffer=losses.buf)
+
+    if topology == 'ring':
+        neighbours = [(iisland - 1) % nislands]
+    else:
+        neighbours = [i for i in range(nislands) if i != iisland]
+
+    try:
+        for epoch in tqdm(range(swarm.nepoch), disable=iisland != 0,
+                          bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
+                          desc="Training..."):
+            swarm.iteration(epoch)
+
+            if (epoch + 1) % migration == 0 and epoch + 1 < swarm.nepoch:
+                # Publish the best particle, wait for all the islands, then
+                # receive the best particles of the neighbours
+                bests[iisland] = swarm.bests[swarm.best]
+                bestLosses[iisland] = swarm.losses[swarm.best]
+                barrier.wait()
+                for ineighbour in neighbours:
+                    swarm.migrate(bests[ineighbour], bestLosses[ineighbour])
+                barrier.wait()
+
+        bests[iisland] = swarm.bests[swarm.best]
+        bestLosses[iisland] = swarm.losses[swarm.best]
+    except BaseException:
+        # Release the other islands waiting at the barrier
+        barrier.abort()
+        raise
+    finally:
+        del bests, bestLosses
+        positions.close()
+        losses.close()
+
+
+class IslandSwarm:
+    """
+    Class to train the neural network using an island model of particle
+    swarm optimization, across worker processes.
+
+    Each worker process evolves its own sub-swarm (see `ParticleSwarm`).
+    Every `migration` iterations, the islands publish their best particle
+    in shared memory (`multiprocessing.shared_memory`), wait for each other
+    at a barrier, and each island replaces its worst particle by the best
+    particle of a neighbouring island when it is better. The neighbours are
+    given by the topology: the previous island for a 'ring', all the other
+    islands for 'full'. Training is reproducible given a seed.
+    """
+
+    def __init__(self, dataset, model, nparticles: int = 32,
+                 nepoch: int = 100, batchsize: int = 0,
+                 inertia: float = 0.7, cognitive: float = 1.5,
+                 social: float = 1.5, spread: float = 1.,
+                 seed: int = None, islands: int = 2, migration: int = 10,
+                 topology: str = 'ring', loss=None) -> None:
+        """
+        Initialize the island model class
+
+        Parameters
+        ----------
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues)
+        model: Model
+            built network model to train
+        nparticles: int, optional
+            number of particles of each island (default: 32)
+        nepoch: int, optional
+            number of iterations (default: 100)
+        batchsize: int, optional
+            size of minibatches on which the particles are evaluated
+            (default: 0, whole dataset)
+        inertia: float, optional
+            weight of the previous velocity (default: 0.7)
+        cognitive: float, optional
+            attraction towards the best position of each particle
+            (default: 1.5)
+        social: float, optional
+            attraction towards the best position of the island
+            (default: 1.5)
+        spread: float, optional
+            standard deviation of the initial positions around the current
+            weights and biases (default: 1.)
+        seed: int, optional
+            seed of the random generators of the islands
+        islands: int, optional
+            number of islands, one worker process each (default: 2)
+        migration: int, optional
+            number of iterations between two migrations (default: 10)
+        topology: str, optional
+            migration topology, 'ring' or 'full' (default: 'ring')
+        loss: Loss, optional
+            loss function minimized (default: sum of the squared errors)
+        """
+        if topology not in ('ring', 'full'):
+            raise ValueError("Unknown topology '{}'.".format(topology))
+
+        self.model = model
+        self.islands = islands
+        self.migration = migration
+        self.topology = topology
+
+        if not isinstance(dataset, Dataset):
+            dataset = Dataset.from_pairs(dataset, dtype=model.dtype)
+
+        # Sub-swarms of the islands, with independent random generators
+        seeds = np.random.SeedSequence(seed).spawn(islands)
+        self.swarms = [ParticleSwarm(
+            dataset, model, nparticles=nparticles, nepoch=nepoch,
+            batchsize=batchsize, inertia=inertia, cognitive=cognitive,
+            social=social, spread=spread, seed=seeds[i], loss=loss)
+            for i in range(islands)]
+        self.losses = None
+
+    def run(self) -> None:
+        """
+        Train, then set the weights and biases of the network model to the
+        best particle of all the islands.
+        """
+        parameters = self.model.parameters
+
+        # Best particle and loss of each island
+        memory = [shared_memory.SharedMemory(create=True, size=size)
+                  for size in (self.islands * parameters.nbytes,
+                               self.islands * np.dtype(np.float64).itemsize)]
+        bests = np.ndarray((self.islands, parameters.size),
+                           dtype=parameters.dtype, buffer=memory[0].buf)
+        losses = np.ndarray((self.islands,), dtype=np.float64,
+                            buffer=memory[1].buf)
+
+        try:
+            barrier = multiprocessing.Barrier(self.islands)
+            processes = [multiprocessing.Process(
+                target=_island, args=(
+                    swarm, iisland, (memory[0].name, memory[1].name),
+                    self.migration, self.topology, barrier))
+                for iisland, swarm in enumerate(self.swarms)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            if any(process.exitcode != 0 for process in processes):
+                raise RuntimeError("An island worker process failed.")
+
+            self.losses = losses.copy()
+            parameters[...] = bests[np.argmin(losses)]
+        finally:
+            del bests, losses
+            for block in memory:
+                block.close()
+                block.unlink()
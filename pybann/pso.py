@@ -0,0 +1,278 @@
+"""pso.py
+"""
+
+import numpy as np
+from tqdm import tqdm
+from pybann import Dataset
+from pybann import MSE
+
+
+class ParticleSwarm:
+    """
+    Class to train the neural network using particle swarm optimization.
+
+    Each particle is a full set of weights and biases, laid out as the
+    parameter buffer of the network model (see `Model.build`), and the
+    positions and velocities of the whole swarm are stored in two
+    (n_particles, n_parameters) arrays. The weights and biases of a layer
+    are (n_particles, n, m) and (n_particles, n, 1) views into the
+    positions, so that the loss of every particle on a minibatch is
+    computed at once, with one batched matrix product per layer.
+
+    With minibatches, the loss of the best position of a particle is the
+    loss on the minibatch it was evaluated on: the best positions are not
+    evaluated again on the following minibatches, so that they are
+    compared with losses on different samples.
+    """
+
+    def __init__(self, dataset, model, nparticles: int = 32,
+                 nepoch: int = 100, batchsize: int = 0,
+                 inertia: float = 0.7, cognitive: float = 1.5,
+                 social: float = 1.5, spread: float = 1.,
+                 seed: int = None, loss=None) -> None:
+        """
+        Initialize the particle swarm class
+
+        The first particle is the current weights and biases of the network
+        model, the others are drawn around it from a normal distribution.
+
+        Parameters
+        ----------
+        dataset: Dataset, list or np.array
+            a Dataset or a list of tuples in the form (inValues, outValues),
+            converted once to a Dataset
+        model: Model
+            built network model to train
+        nparticles: int, optional
+            number of particles (default: 32)
+        nepoch: int, optional
+            number of iterations (default: 100)
+        batchsize: int, optional
+            size of minibatches on which the particles are evaluated
+            (default: 0, whole dataset); the best positions are compared
+            across minibatches
+        inertia: float, optional
+            weight of the previous velocity (default: 0.7)
+        cognitive: float, optional
+            attraction towards the best position of each particle
+            (default: 1.5)
+        social: float, optional
+            attraction towards the best position of the swarm
+            (default: 1.5)
+        spread: float, optional
+            standard deviation of the initial positions around the current
+            weights and biases (default: 1.)
+        seed: int, optional
+            seed of the random generator
+        loss: Loss, optional
+            loss function minimized (default: sum of the squared errors)
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Model, ParticleSwarm
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> inputs = np.random.randn(100, 4)
+        >>> dataset = list(zip(inputs, inputs[:, :3] > 0))
+        >>> swarm = ParticleSwarm(dataset, network, nparticles=16, nepoch=50)
+        >>> swarm.run()
+
+        """
+        self.model = model
+        self.layers = model.layers
+        self.nparticles = nparticles
+        self.nepoch = nepoch
+        self.batchsize = batchsize
+        self.inertia = inertia
+        self.cognitive = cognitive
+        self.social = social
+        self.dtype = model.dtype
+        if isinstance(dataset, Dataset):
+            self.data = dataset
+        else:
+            self.data = Dataset.from_pairs(dataset, dtype=self.dtype)
+        self.rng = np.random.default_rng(seed)
+        if loss is None:
+            loss = MSE()
+        if loss.activation is not None and \
+                self.layers[-1].activation.__name__ != loss.activation:
+            raise ValueError("The {} loss requires a {} output layer.".format(
+                type(loss).__name__, loss.activation))
+        self.lossfunction = loss
+
+        # Positions and velocities of the particles
+        shape = (nparticles, len(model.parameters))
+        self.positions = np.empty(shape, dtype=self.dtype)
+        self.positions[...] = self.rng.standard_normal(shape)
+        self.positions *= spread
+        self.positions += model.parameters
+        self.positions[0] = model.parameters
+        self.velocities = np.zeros(shape, dtype=self.dtype)
+
+        # Best position and loss of each particle, and of the swarm
+        self.bests = self.positions.copy()
+        self.losses = np.full(nparticles, np.inf, dtype=self.dtype)
+        self.best = 0
+
+        # Random coefficients and scratch buffer of the velocity update
+        self.random = np.empty((2,) + shape, dtype=self.dtype)
+        self.scratch = np.empty(shape, dtype=self.dtype)
+
+        self.bind()
+        self.transfer = None
+        self.inputs = None
+
+    def __getstate__(self) -> dict:
+        # Views are pickled as independent copies: bind them back to the
+        # positions when unpickled
+        state = self.__dict__.copy()
+        del state['views']
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self.bind()
+
+    def bind(self) -> None:
+        """
+        Bind the (n_particles, n, 1) biases and (n_particles, n, m) weights
+        of each layer, for all the particles, to the positions.
+        """
+        self.views = [None]
+        for i in range(1, len(self.layers)):
+            biases, weights = self.model._slices(i)
+            n, m = self.layers[i].neurons, self.layers[i-1].neurons
+            self.views.append((
+                self.positions[:, biases].reshape(self.nparticles, n, 1),
+                self.positions[:, weights].reshape(self.nparticles, n, m)))
+
+    def allocate(self, nsamples: int) -> None:
+        """
+        (Re)allocate the transfer buffers of the layers, and the input and
+        output buffers, when too small to evaluate `nsamples` samples.
+        """
+        if self.inputs is not None and len(self.inputs[0]) >= nsamples:
+            return
+        self.transfer = [
+            np.empty(self.nparticles * layer.neurons * nsamples,
+                     dtype=self.dtype) for layer in self.layers[1:]]
+        self.inputs = tuple(
+            np.empty((nsamples, self.layers[i].neurons), dtype=self.dtype)
+            for i in (0, -1))
+
+    def evaluate(self, invalues: np.array, outvalues: np.array) -> np.array:
+        """
+        Return the loss of every particle on a minibatch, that is the mean
+        over the samples of the loss function (see `Loss.stacked`).
+
+        Parameters
+        ----------
+        invalues: np.array
+            (batch, n_inputs) array of input values
+        outvalues: np.array
+            (batch, n_outputs) array of output values
+
+        Returns
+        -------
+        losses: np.array
+            (n_particles,) array of losses
+        """
+        nsamples = len(invalues)
+        self.allocate(nsamples)
+
+        # One input vector per column, shared by all the particles
+        values = invalues.T
+        for i in range(1, len(self.layers)):
+            biases, weights = self.views[i]
+            transfer = self.transfer[i-1][
+                :self.nparticles*self.layers[i].neurons*nsamples].reshape(
+                    self.nparticles, self.layers[i].neurons, nsamples)
+            np.matmul(weights, values, out=transfer)
+            transfer += biases
+            values = self.layers[i].activation(transfer, out=transfer)
+
+        return self.lossfunction.stacked(values, outvalues.T) / nsamples
+
+    def step(self) -> None:
+        """
+        Move the particles towards their best position and the best
+        position of the swarm.
+        """
+        self.rng.random(out=self.random[0], dtype=self.dtype)
+        self.rng.random(out=self.random[1], dtype=self.dtype)
+
+        self.velocities *= self.inertia
+
+        np.subtract(self.bests, self.positions, out=self.scratch)
+        self.scratch *= self.random[0]
+        self.scratch *= self.cognitive
+        self.velocities += self.scratch
+
+        np.subtract(self.bests[self.best], self.positions, out=self.scratch)
+        self.scratch *= self.random[1]
+        self.scratch *= self.social
+        self.velocities += self.scratch
+
+        self.positions += self.velocities
+
+    def migrate(self, position: np.array, loss: float) -> None:
+        """
+        Replace the particle with the worst best position by a migrant
+        particle, when the migrant is better.
+
+        Parameters
+        ----------
+        position: np.array
+            position of the migrant particle
+        loss: float
+            loss of the migrant particle
+        """
+        worst = np.argmax(self.losses)
+        if loss < self.losses[worst]:
+            self.positions[worst] = position
+            self.bests[worst] = position
+            self.velocities[worst] = 0.
+            self.losses[worst] = loss
+            self.best = np.argmin(self.losses)
+
+    def iteration(self, epoch: int) -> None:
+        """
+        Move the particles (except for the first iteration), evaluate them
+        on a minibatch and update the best positions.
+        """
+        batchsize = self.batchsize
+        if batchsize == 0:
+            batchsize = len(self.data)
+        self.allocate(batchsize)
+
+        if epoch > 0:
+            self.step()
+
+        if self.batchsize != 0:
+            # Shuffle dataset
+            self.data.shuffle(self.rng)
+        invalues, outvalues = self.data.batch(
+            batchsize, out=tuple(values[:batchsize] for values in self.inputs))
+
+        # Update the best positions
+        losses = self.evaluate(invalues, outvalues)
+        improved = losses < self.losses
+        self.losses[improved] = losses[improved]
+        self.bests[improved] = self.positions[improved]
+        self.best = np.argmin(self.losses)
+
+    def run(self) -> None:
+        """
+        Train, then set the weights and biases of the network model to the
+        best position of the swarm.
+        """
+        for epoch in tqdm(range(self.nepoch),
+                          bar_format='{l_bar}{bar:50}{r_bar}{bar:-50b}',
+                          desc="Training..."):
+            self.iteration(epoch)
+
+        self.model.parameters[...] = self.bests[self.best]
@@ -0,0 +1,366 @@
+"""serving.py
+
+Asynchronous inference server with dynamic micro-batching.
+
+Concurrent prediction requests are queued and coalesced into
+micro-batches of at most `max_batch_size` input vectors, waiting at most
+`max_wait` seconds for a micro-batch to fill up. Each micro-batch is fed
+forward at once, in an executor so that the event loop keeps accepting
+requests, and the output vectors are scattered back to the requests.
+
+The network model is served over TCP using JSON lines: each request is a
+line holding a JSON object with the `inputs` vector (and an optional `id`,
+sent back), answered by a line holding the `outputs` vector, or an `error`.
+A `{"stats": true}` request returns the statistics of the server.
+
+>>> python -m pybann.serving network.bann --port 8765
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import time
+import numpy as np
+
+
+class Statistics:
+    """
+    Throughput and latency counters of a predictor.
+
+    The latencies and completion times of the last `window` requests are
+    kept to compute the percentiles of the latencies and the throughput.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        """
+        Initialize the counters
+
+        Parameters
+        ----------
+        window: int, optional
+            number of latencies kept (default: 10000)
+        """
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=window)
+        self.ends = collections.deque(maxlen=window)
+
+    def record_batch(self, size: int) -> None:
+        """
+        Count a micro-batch of `size` requests.
+        """
+        self.batches += 1
+        self.requests += size
+
+    def record_latency(self, latency: float) -> None:
+        """
+        Record the latency (s) of a request.
+        """
+        self.ends.append(time.perf_counter())
+        self.latencies.append(latency)
+
+    def summary(self) -> dict:
+        """
+        Return the number of requests and micro-batches, the mean size of
+        the micro-batches, the throughput (requests/s) and the p50 and p99
+        latencies (ms), over the last `window` requests for the throughput
+        and latencies.
+        """
+        summary = {'requests': self.requests, 'batches': self.batches,
+                   'errors': self.errors,
+                   'batch_size': self.requests / max(self.batches, 1),
+                   'throughput': 0., 'p50': 0., 'p99': 0.}
+        if self.latencies:
+            # From the arrival of the oldest request of the window
+            elapsed = self.ends[-1] - (self.ends[0] - self.latencies[0])
+            if elapsed > 0.:
+                summary['throughput'] = len(self.latencies) / elapsed
+            summary['p50'], summary['p99'] = np.percentile(
+                self.latencies, [50, 99]) * 1.e3
+        return summary
+
+
+class BatchingPredictor:
+    """
+    Asynchronous predictor coalescing concurrent requests into
+    micro-batches.
+
+    The predictor must be started (and stopped) in the event loop, for
+    instance using `async with`.
+    """
+
+    def __init__(self, model, max_batch_size: int = 64,
+                 max_wait: float = 0.002, executor=None) -> None:
+        """
+        Initialize the predictor
+
+        Parameters
+        ----------
+        model: Model or FrozenModel
+            network model, fed forward using its `predict` method
+        max_batch_size: int, optional
+            maximum number of input vectors in a micro-batch (default: 64)
+        max_wait: float, optional
+            maximum time (s) waited for a micro-batch to fill up after its
+            first request (default: 0.002)
+        executor: concurrent.futures.Executor, optional
+            executor running the feed forward (default: the default
+            executor of the event loop)
+
+        Examples
+        --------
+
+        >>> import asyncio
+        >>> import numpy as np
+        >>> from pybann import Model, BatchingPredictor
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> async def main():
+        ...     async with BatchingPredictor(network.freeze()) as predictor:
+        ...         return await asyncio.gather(*[
+        ...             predictor.predict(np.random.randn(4)) for _ in range(10)])
+        >>> len(asyncio.run(main()))
+        10
+
+        """
+        self.model = model
+        if hasattr(model, 'neurons'):
+            self.ninputs = model.neurons[0]
+        else:
+            self.ninputs = model.layers[0].neurons
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.stats = Statistics()
+        self._queue = None
+        self._task = None
+        self._getter = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        """
+        Start batching the requests in the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._batcher())
+
+    async def stop(self) -> None:
+        """
+        Stop batching the requests, once the queued requests are served.
+        """
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for task in (self._task, self._getter):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._queue = None
+        self._task = None
+        self._getter = None
+
+    async def predict(self, inValues) -> np.array:
+        """
+        Feed forward an input vector, within a micro-batch
+
+        Parameters
+        ----------
+        inValues: np.array
+            (n_inputs,) vector of input values
+
+        Returns
+        -------
+        outValues: np.array
+            (n_outputs,) vector of output values
+        """
+        if self._queue is None:
+            raise RuntimeError("The predictor is not started (see `start`).")
+
+        # Checked here so that an invalid request does not fail the others
+        # of its micro-batch
+        try:
+            inValues = np.asarray(inValues, dtype=self.model.dtype)
+        except (TypeError, ValueError):
+            raise ValueError("Expected numeric input values.") from None
+        if inValues.shape != (self.ninputs,):
+            raise ValueError("Expected a vector of {} input values.".format(
+                self.ninputs))
+
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        self._queue.put_nowait((inValues, future))
+        outValues = await future
+        self.stats.record_latency(time.perf_counter() - start)
+        return outValues
+
+    async def _get(self, timeout: float = None):
+        """
+        Return the next request, or `None` when no request is received
+        within `timeout` seconds, in which case the pending get is kept
+        for the next call (so that no request is lost).
+        """
+        if self._getter is None:
+            if not self._queue.empty():
+                return self._queue.get_nowait()
+            self._getter = asyncio.get_running_loop().create_task(
+                self._queue.get())
+        done, _ = await asyncio.wait({self._getter}, timeout=timeout)
+        if not done:
+            return None
+        request = self._getter.result()
+        self._getter = None
+        return request
+
+    async def _batch(self) -> list:
+        """
+        Wait for the first request, then return the requests received
+        until the micro-batch is full or the maximum wait time is over.
+        """
+        requests = [await self._get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(requests) < self.max_batch_size:
+            request = await self._get(max(deadline - loop.time(), 0.))
+            if request is None:
+                break
+            requests.append(request)
+        return requests
+
+    async def _batcher(self) -> None:
+        """
+        Feed forward the micro-batches and scatter the output vectors.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = await self._batch()
+            try:
+                inValues = np.stack([values for values, _ in requests])
+                outValues = await loop.run_in_executor(
+                    self.executor, self.model.predict, inValues)
+            except Exception as error:
+                # Drop the frame of the batcher from the traceback: clearing
+                # the frames of the traceback (e.g. `traceback.clear_frames`)
+                # would close the batcher
+                error = error.with_traceback(error.__traceback__.tb_next)
+                self.stats.errors += len(requests)
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(error)
+            else:
+                self.stats.record_batch(len(requests))
+                for (_, future), values in zip(requests, outValues):
+                    if not future.done():
+                        future.set_result(values)
+            finally:
+                for _ in requests:
+                    self._queue.task_done()
+
+
+async def handle(predictor: BatchingPredictor, reader, writer) -> None:
+    """
+    Serve the JSON lines requests of a connection, answered as soon as
+    their micro-batch is fed forward.
+    """
+    async def respond(line: bytes) -> None:
+        request = {}
+        try:
+            request = json.loads(line)
+            if request.get('stats'):
+                response = predictor.stats.summary()
+            else:
+                outValues = await predictor.predict(
+                    np.asarray(request['inputs'], dtype=np.float64))
+                response = {'outputs': outValues.tolist()}
+        except Exception as error:
+            response = {'error': str(error)}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    tasks = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.get_running_loop().create_task(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        writer.close()
+
+
+async def serve(model, host: str = "127.0.0.1", port: int = 8765,
+                max_batch_size: int = 64, max_wait: float = 0.002,
+                started=None) -> None:
+    """
+    Serve a network model over TCP until cancelled
+
+    Parameters
+    ----------
+    model: Model or FrozenModel
+        network model
+    host: str, optional
+        host address (default: '127.0.0.1')
+    port: int, optional
+        port, 0 for any free port (default: 8765)
+    max_batch_size: int, optional
+        maximum number of input vectors in a micro-batch (default: 64)
+    max_wait: float, optional
+        maximum time (s) waited for a micro-batch to fill up
+        (default: 0.002)
+    started: asyncio.Future, optional
+        future set to the (host, port) address once the server listens
+    """
+    async with BatchingPredictor(model, max_batch_size, max_wait) as predictor:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle(predictor, reader, writer),
+            host, port)
+        async with server:
+            if started is not None:
+                started.set_result(server.sockets[0].getsockname()[:2])
+            await server.serve_forever()
+
+
+def main() -> None:
+    from pybann import Model
+
+    parser = argparse.ArgumentParser(
+        description="Serve a saved network model over TCP (JSON lines).")
+    parser.add_argument("model", help="saved network model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=0.002,
+                        help="maximum wait time of a micro-batch (s)")
+    args = parser.parse_args()
+
+    model = Model()
+    model.load(args.model)
+    try:
+        asyncio.run(serve(model.freeze(), args.host, args.port,
+                          args.max_batch_size, args.max_wait))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
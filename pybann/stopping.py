@@ -0,0 +1,111 @@
+"""stopping.py
+"""
+
+import numpy as np
+from pybann import Callback
+
+
+class EarlyStopping(Callback):
+    """
+    Early stopping of the training on a validation set.
+
+    Every `interval` epochs, the network model is evaluated on the
+    validation set (see `Model.evaluate`). The training stops when the
+    validation loss has not improved for `patience` evaluations in a row,
+    and the best weights and biases, kept in a single copy of the
+    parameter buffer, are restored at the end of the training. The
+    validation loss is logged as 'val_loss'.
+    """
+
+    def __init__(self, model, invalues: np.array, outvalues: np.array,
+                 patience: int = 10, interval: int = 1,
+                 min_delta: float = 0., loss='mse') -> None:
+        """
+        Initialize the early stopping
+
+        Parameters
+        ----------
+        model: Model
+            network model being trained
+        invalues: np.array
+            (N, n_inputs) array of validation input values
+        outvalues: np.array
+            (N, n_outputs) array of validation output values
+        patience: int, optional
+            number of evaluations without improvement before stopping
+            (default: 10)
+        interval: int, optional
+            number of epochs between two evaluations (default: 1)
+        min_delta: float, optional
+            minimum decrease of the validation loss counted as an
+            improvement (default: 0.)
+        loss: str or Loss, optional
+            loss function of the validation loss (default: 'mse')
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from pybann import Model, EarlyStopping
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> stopping = EarlyStopping(network, np.random.randn(20, 4),
+        ...                          np.random.rand(20, 3), patience=5)
+        >>> stopping.on_epoch_end(epoch=0, logs={})
+        False
+
+        """
+        self.model = model
+        self.invalues = invalues
+        self.outvalues = outvalues
+        self.patience = patience
+        self.interval = interval
+        self.min_delta = min_delta
+        self.loss = loss
+
+        self.losses = []
+        self.best = np.inf
+        self.best_epoch = None
+        self.stopped_epoch = None
+        self.wait = 0
+        self.parameters = None
+
+    def on_epoch_end(self, epoch: int, logs: dict) -> bool:
+        """
+        Evaluate the network model when due at the end of an epoch, and
+        return `True` when the training must stop.
+        """
+        if (epoch + 1) % self.interval != 0:
+            return False
+
+        loss = self.model.evaluate(self.invalues, self.outvalues,
+                                   loss=self.loss)['loss']
+        logs['val_loss'] = loss
+        self.losses.append(loss)
+        if loss < self.best - self.min_delta:
+            self.best = loss
+            self.best_epoch = epoch
+            self.wait = 0
+            if self.parameters is None:
+                self.parameters = np.array(self.model.parameters)
+            else:
+                self.parameters[...] = self.model.parameters
+            return False
+
+        self.wait += 1
+        if self.wait >= self.patience:
+            self.stopped_epoch = epoch
+            return True
+        return False
+
+    def on_train_end(self, logs: dict) -> None:
+        self.restore()
+
+    def restore(self) -> None:
+        """
+        Restore the best weights and biases of the network model.
+        """
+        if self.parameters is not None:
+            self.model.parameters[...] = self.parameters
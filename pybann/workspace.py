@@ -0,0 +1,117 @@
+"""workspace.py
+"""
+
+import numpy as np
+
+
+class Workspace:
+    """
+    Preallocated buffers for the feed forward and the backpropagation of
+    a minibatch.
+
+    The buffers are sized once for a given network model and a maximum
+    number of samples, so that the training loop can write all its
+    intermediate results in place instead of allocating new arrays for
+    each minibatch.
+    """
+
+    def __init__(self, layers, batchsize: int) -> None:
+        """
+        Initialize the workspace
+
+        The buffers have the same type as the weights of the layers.
+
+        Parameters
+        ----------
+        layers: list
+            list of the Layer objects of the network model
+        batchsize: int
+            maximum number of samples in a minibatch
+
+        Examples
+        --------
+
+        >>> from pybann import Model, Workspace
+        >>> network = Model()
+        >>> network.addInput(neurons=4)
+        >>> network.addLayer(neurons=8)
+        >>> network.addLayer(neurons=3)
+        >>> network.build()
+        >>> workspace = Workspace(network.layers, batchsize=10)
+        >>> activation, transfer, delta = workspace.views(5)
+        >>> activation[1].shape
+        (8, 5)
+
+        """
+        self.batchsize = batchsize
+        neurons = [layer.neurons for layer in layers]
+        dtype = layers[-1].weights.dtype
+
+        # Input and output values of a minibatch (one sample per row)
+        self.invalues = np.empty(neurons[0] * batchsize, dtype=dtype)
+        self.outvalues = np.empty(neurons[-1] * batchsize, dtype=dtype)
+
+        # Transfer, activation and delta values (one sample per column)
+        self.activation = [np.empty(n * batchsize, dtype=dtype)
+                           for n in neurons[1:]]
+        self.transfer = [np.empty(n * batchsize, dtype=dtype)
+                           for n in neurons[1:]]
+        self.delta = [np.empty(n * batchsize, dtype=dtype)
+                           for n in neurons[1:]]
+
+        # Gradients of a single minibatch
+        self.weightsUpdate = [np.empty((neurons[i], neurons[i-1]), dtype=dtype)
+                              for i in range(1, len(neurons))]
+        self.biasesUpdate = [np.empty((neurons[i], 1), dtype=dtype)
+                             for i in range(1, len(neurons))]
+
+        self._inputs = {}
+        self._views = {}
+
+    def inputs(self, nsamples: int) -> tuple:
+        """
+        Return the (nsamples, n_inputs) and (nsamples, n_outputs) input and
+        output buffers of a minibatch.
+        """
+        if nsamples not in self._inputs:
+            self._inputs[nsamples] = tuple(
+                buffer[:buffer.size // self.batchsize * nsamples]
+                .reshape(nsamples, -1)
+                for buffer in (self.invalues, self.outvalues))
+
+        return self._inputs[nsamples]
+
+    def views(self, nsamples: int) -> tuple:
+        """
+        Return the activation, transfer and delta buffers for a minibatch
+        of `nsamples` samples.
+
+        The views are contiguous (n, nsamples) arrays so that they can be
+        used as `out` argument of `np.dot`. They are created once for each
+        number of samples and reused afterwards. The first activation slot
+        is left to the caller for the input values of the minibatch.
+
+        Parameters
+        ----------
+        nsamples: int
+            number of samples in the minibatch (at most `batchsize`)
+
+        Returns
+        -------
+        activation: list
+            activation buffers, input slot included
+        transfer: list
+            transfer buffers
+        delta: list
+            delta buffers
+        """
+        if nsamples not in self._views:
+            def view(buffers):
+                return [buffer[:buffer.size // self.batchsize * nsamples]
+                        .reshape(-1, nsamples) for buffer in buffers]
+
+            self._views[nsamples] = (
+                [None] + view(self.activation), view(self.transfer),
+                view(self.delta))
+
+        return self._views[nsamples]
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from pybann import Activation
 
 class tests_activation(unittest.TestCase):
@@ -145,4 +146,103 @@ class tests_activation(unittest.TestCase):
 
         # Output
         for i in range(len(a)):
-            self.assertAlmostEqual(Activation.gaussian(a[i], deriv=True), o[i], delta=1.e-7)
\ No newline at end of file
+            self.assertAlmostEqual(Activation.gaussian(a[i], deriv=True), o[i], delta=1.e-7)
+
+    def test_float32(self):
+
+        # Input
+        a = np.array([-1., 0., 1.], dtype=np.float32)
+
+        # Output type
+        for name in ["sigmoid", "tanhyp", "relu", "softplus", "gaussian"]:
+            function = getattr(Activation, name)
+            self.assertEqual(function(a).dtype, np.float32)
+            self.assertEqual(function(a, deriv=True).dtype, np.float32)
+
+    def test_stability(self):
+
+        # Input
+        a = np.array([-1000., -50., 0., 50., 1000.])
+
+        # No overflow, finite output
+        with np.errstate(over='raise', invalid='raise', divide='raise'):
+            for name in ["sigmoid", "tanhyp", "relu", "softplus", "gaussian"]:
+                function = getattr(Activation, name)
+                self.assertTrue(np.all(np.isfinite(function(a))))
+                self.assertTrue(np.all(np.isfinite(function(a, deriv=True))))
+
+        np.testing.assert_allclose(Activation.sigmoid(a), [0., 0., 0.5, 1., 1.], atol=1.e-7)
+        np.testing.assert_allclose(Activation.softplus(a)[-2:], [50., 1000.])
+
+    def test_out(self):
+
+        # Input
+        a = np.linspace(-5., 5., 11)
+
+        for name in ["sigmoid", "tanhyp", "relu", "softplus", "gaussian"]:
+            function = getattr(Activation, name)
+            for deriv in [False, True]:
+                attempted = function(a, deriv=deriv)
+
+                # Output buffer
+                out = np.empty_like(a)
+                self.assertIs(function(a, deriv=deriv, out=out), out)
+                np.testing.assert_allclose(out, attempted)
+
+                # In place
+                b = a.copy()
+                function(b, deriv=deriv, out=b)
+                np.testing.assert_allclose(b, attempted)
+
+        # Leaky ReLU in place
+        b = a.copy()
+        Activation.relu(b, leak=0.1, out=b)
+        np.testing.assert_allclose(b, Activation.relu(a, leak=0.1))
+
+    def test_activated(self):
+
+        # Input
+        a = np.linspace(-5., 5., 11)
+
+        for name in ["sigmoid", "tanhyp", "relu", "softplus", "gaussian"]:
+            function = getattr(Activation, name)
+            activated = function(a)
+
+            # Derivative computed from the activated values
+            np.testing.assert_allclose(
+                function(a, deriv=True, activated=activated),
+                function(a, deriv=True), atol=1.e-12)
+
+            # Activated values are ignored for the function itself
+            np.testing.assert_allclose(
+                function(a, activated=np.zeros_like(a)), activated)
+
+    def test_softmax(self):
+
+        # Neurons along the rows of the columns of input vectors
+        a = np.array([[0., 1., -1.], [1., 1., 0.], [2., 1., 1000.]])
+        o = Activation.softmax(a)
+        np.testing.assert_allclose(np.sum(o, axis=0), 1.)
+        np.testing.assert_allclose(o[:, 0], np.exp([0., 1., 2.])
+                                   / np.sum(np.exp([0., 1., 2.])))
+
+        # Large input values do not overflow
+        np.testing.assert_array_equal(o[:, 2], [0., 0., 1.])
+
+        # Single vector and rows
+        np.testing.assert_allclose(Activation.softmax(a[:, 0]), o[:, 0])
+        np.testing.assert_allclose(Activation.softmax(a.T, axis=-1), o.T)
+
+        # Diagonal of the Jacobian, from the activated values
+        np.testing.assert_allclose(Activation.softmax(a, deriv=True),
+                                   o * (1. - o))
+        np.testing.assert_allclose(
+            Activation.softmax(a, deriv=True, activated=o), o * (1. - o))
+
+        # Output buffer and in place
+        out = np.empty_like(a)
+        self.assertIs(Activation.softmax(a, out=out), out)
+        np.testing.assert_allclose(out, o)
+        b = a.copy()
+        Activation.softmax(b, out=b)
+        np.testing.assert_allclose(b, o)
@@ -0,0 +1,50 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from pybann import binary
+
+
+class tests_binary(unittest.TestCase):
+
+    def test_write(self):
+
+        parameters = np.arange(10, dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            binary.write(filename, {'name': "Test model"}, parameters)
+
+            self.assertTrue(binary.is_binary(filename))
+            header, offset = binary.read_header(filename)
+
+            self.assertEqual(header['name'], "Test model")
+            self.assertEqual(np.dtype(header['dtype']), np.float32)
+            self.assertEqual(header['nparameters'], 10)
+
+            # Aligned parameter buffer at the end of the file
+            self.assertEqual(offset % binary.ALIGNMENT, 0)
+            self.assertEqual(os.path.getsize(filename), offset + 40)
+            np.testing.assert_array_equal(
+                np.fromfile(filename, dtype=np.float32, offset=offset),
+                parameters)
+
+    def test_read_header(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            binary.write(filename, {}, np.zeros(3))
+
+            # Unsupported major version
+            with open(filename, 'r+b') as f:
+                f.seek(len(binary.MAGIC))
+                f.write(bytes([binary.VERSION[0] + 1]))
+            with self.assertRaises(ValueError):
+                binary.read_header(filename)
+
+            # Not a binary file
+            with open(filename, 'wb') as f:
+                f.write(b'not a model file')
+            self.assertFalse(binary.is_binary(filename))
+            with self.assertRaises(ValueError):
+                binary.read_header(filename)
@@ -0,0 +1,106 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from pybann import PredictionCache
+from pybann import Callback
+from tests.utils import create_model
+
+
+class tests_cache(unittest.TestCase):
+
+    def test_predict_one(self):
+
+        testModel = create_model([4, 8, 3])
+        cache = PredictionCache(testModel)
+        inValues = np.random.randn(4)
+
+        outValues = cache.predict_one(inValues)
+        np.testing.assert_array_equal(outValues, testModel.forward(inValues))
+        self.assertIs(cache.predict_one(list(inValues)), outValues)
+        self.assertFalse(outValues.flags.writeable)
+
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1,
+            'nbytes': 56})
+
+    def test_eviction(self):
+
+        testModel = create_model([4, 8, 3])
+
+        # Room for 2 entries of 56 bytes
+        cache = PredictionCache(testModel, maxbytes=120)
+        inValues = np.random.randn(3, 4)
+
+        cache.predict_one(inValues[0])
+        cache.predict_one(inValues[1])
+        cache.predict_one(inValues[0])
+        cache.predict_one(inValues[2])
+
+        # The least recently used entry is evicted
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.nbytes, 112)
+        cache.predict_one(inValues[0])
+        self.assertEqual(cache.hits, 2)
+        cache.predict_one(inValues[1])
+        self.assertEqual(cache.misses, 4)
+
+    def test_predict(self):
+
+        testModel = create_model([4, 8, 3])
+        cache = PredictionCache(testModel.freeze())
+        inValues = np.random.randn(6, 4)
+
+        cache.predict_one(inValues[2])
+        outValues = cache.predict(np.concatenate([inValues, inValues[:2]]))
+
+        np.testing.assert_allclose(
+            outValues[:6], testModel.predict(inValues), rtol=1.e-12)
+        np.testing.assert_array_equal(outValues[6:], outValues[:2])
+        self.assertEqual(len(cache), 6)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 8)
+
+    def test_invalidation(self):
+
+        testModel = create_model([4, 8, 3])
+        cache = PredictionCache(testModel)
+        inValues = np.ones(4)
+
+        cache.predict_one(inValues)
+        testModel.SGD([(inValues, (1., 0., 0.))], nepoch=10)
+        np.testing.assert_array_equal(
+            cache.predict_one(inValues), testModel.forward(inValues))
+        self.assertEqual(cache.misses, 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            create_model([4, 8, 3]).save(filename)
+            testModel.load(filename, mmap_mode=None)
+
+        np.testing.assert_array_equal(
+            cache.predict_one(inValues), testModel.forward(inValues))
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(len(cache), 1)
+
+    def test_invalidation_interrupted(self):
+
+        class Interrupt(Callback):
+            def on_epoch_end(self, epoch, logs):
+                if epoch == 2:
+                    raise KeyboardInterrupt
+                return False
+
+        testModel = create_model([4, 8, 3])
+        cache = PredictionCache(testModel)
+        inValues = np.ones(4)
+
+        # The weights changed before the training was interrupted
+        cache.predict_one(inValues)
+        with self.assertRaises(KeyboardInterrupt):
+            testModel.SGD([(inValues, (1., 0., 0.))], nepoch=10,
+                          callbacks=[Interrupt()], verbose=False)
+        np.testing.assert_array_equal(
+            cache.predict_one(inValues), testModel.forward(inValues))
+        self.assertEqual(cache.misses, 2)
@@ -0,0 +1,131 @@
+import unittest
+import io
+import os
+import json
+import tempfile
+import contextlib
+import numpy as np
+from pybann import Callback
+from pybann import History
+from pybann import JSONLogger
+from pybann import Timer
+from pybann import Throughput
+from tests.utils import create_model
+
+
+class Recorder(Callback):
+
+    def __init__(self, stop=None):
+        self.calls = []
+        self.stop = stop
+
+    def on_train_begin(self, logs):
+        self.calls.append(('train_begin', None))
+
+    def on_epoch_begin(self, epoch, logs):
+        self.calls.append(('epoch_begin', epoch))
+
+    def on_batch_end(self, epoch, logs):
+        self.calls.append(('batch_end', epoch))
+
+    def on_epoch_end(self, epoch, logs):
+        self.calls.append(('epoch_end', epoch))
+        return epoch == self.stop
+
+    def on_train_end(self, logs):
+        self.calls.append(('train_end', None))
+
+
+class tests_callbacks(unittest.TestCase):
+
+    def create_dataset(self):
+
+        inputs = np.random.randn(40, 3)
+        targets = np.stack([inputs[:, 0] > 0, inputs[:, 0] <= 0], axis=1)
+        return list(zip(inputs, targets.astype(float)))
+
+    def test_hooks(self):
+
+        testModel = create_model([3, 6, 2])
+        recorder = Recorder(stop=2)
+        testModel.SGD(self.create_dataset(), batchsize=10, nepoch=10,
+                      callbacks=[recorder], verbose=False)
+
+        self.assertEqual(recorder.calls, [
+            ('train_begin', None),
+            ('epoch_begin', 0), ('batch_end', 0), ('epoch_end', 0),
+            ('epoch_begin', 1), ('batch_end', 1), ('epoch_end', 1),
+            ('epoch_begin', 2), ('batch_end', 2), ('epoch_end', 2),
+            ('train_end', None)])
+
+    def test_history(self):
+
+        testModel = create_model([3, 6, 2])
+        dataset = self.create_dataset()
+        history = History()
+        testModel.SGD(dataset, nepoch=50, callbacks=[history],
+                      validation=dataset[:10], interval=5, verbose=False)
+
+        self.assertEqual(len(history), 50)
+        np.testing.assert_array_equal(history['epoch'], np.arange(50))
+        self.assertEqual(set(history['samples']), {40})
+        self.assertEqual(len(history['val_loss']), 10)
+        for key in ('time', 'time_data', 'time_forward', 'time_backward',
+                    'time_update'):
+            self.assertTrue(np.all(history[key] >= 0.))
+
+        # Loss of the first minibatch, before its update
+        testModel = create_model([3, 6, 2])
+        inputs, targets = map(np.array, zip(*dataset))
+        self.assertAlmostEqual(history['loss'][0], testModel.evaluate(
+            inputs, targets)['loss'])
+        self.assertLess(history['loss'][-1], history['loss'][0])
+
+    def test_json_logger(self):
+
+        testModel = create_model([3, 6, 2])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'train.jsonl')
+            testModel.SGD(self.create_dataset(), nepoch=5,
+                          callbacks=[Throughput(), JSONLogger(filename)],
+                          verbose=False)
+            with open(filename) as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual([record['epoch'] for record in records],
+                         list(range(5)))
+        self.assertGreater(records[-1]['throughput'], 0.)
+        self.assertGreater(records[-1]['mean_throughput'], 0.)
+
+    def test_timer(self):
+
+        testModel = create_model([3, 6, 2])
+        timer = Timer()
+        testModel.SGD(self.create_dataset(), nepoch=20, callbacks=[timer],
+                      verbose=False)
+
+        summary = timer.summary()
+        self.assertEqual(set(summary), {'data', 'forward', 'backward',
+                                        'update'})
+        self.assertLessEqual(sum(step['fraction']
+                                 for step in summary.values()), 1.)
+
+    def test_parallel(self):
+
+        dataset = self.create_dataset()
+        for options in ({'nworkers': 2}, {'nthreads': 2}):
+            testModel = create_model([3, 6, 2])
+            history = History()
+            testModel.SGD(dataset, batchsize=10, nepoch=10,
+                          callbacks=[history, Recorder(stop=3)],
+                          verbose=False, **options)
+            self.assertEqual(len(history), 4)
+            self.assertTrue(np.all(history['loss'] > 0.))
+
+    def test_verbose(self):
+
+        testModel = create_model([3, 6, 2])
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            testModel.SGD(self.create_dataset(), nepoch=5, verbose=False)
+        self.assertEqual(stderr.getvalue(), '')
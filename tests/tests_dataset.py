@@ -0,0 +1,120 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from pybann import Dataset
+
+
+class tests_dataset(unittest.TestCase):
+
+    def test_initialize(self):
+
+        testDataset = Dataset(np.zeros((10, 4)), np.ones((10, 3)))
+
+        self.assertEqual(len(testDataset), 10)
+        self.assertTupleEqual(np.shape(testDataset.inputs), (10, 4))
+        self.assertTupleEqual(np.shape(testDataset.targets), (10, 3))
+        self.assertListEqual(list(testDataset.indices), list(range(10)))
+
+    def test_initialize_mismatch(self):
+
+        with self.assertRaises(ValueError):
+            Dataset(np.zeros((10, 4)), np.ones((9, 3)))
+
+    def test_from_pairs(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        testDataset = Dataset.from_pairs(dataset, dtype=np.float32)
+
+        self.assertEqual(testDataset.inputs.dtype, np.float32)
+        self.assertTrue(testDataset.inputs.flags['C_CONTIGUOUS'])
+        self.assertListEqual(list(testDataset.inputs[1]), [0., 1., 1., 0.])
+        self.assertListEqual(list(testDataset.targets[2]), [0., 0., 1.])
+
+    def test_shuffle(self):
+
+        inputs = np.arange(20.).reshape(10, 2)
+        testDataset = Dataset(inputs, inputs * 2.)
+        testDataset.shuffle(np.random.default_rng(0))
+
+        # Samples are not moved, indices are permuted
+        np.testing.assert_array_equal(testDataset.inputs, inputs)
+        self.assertListEqual(sorted(testDataset.indices), list(range(10)))
+        self.assertNotEqual(list(testDataset.indices), list(range(10)))
+
+        # Minibatches follow the permuted indices
+        invalues, outvalues = testDataset.batch(4, start=2)
+        np.testing.assert_array_equal(invalues, inputs[testDataset.indices[2:6]])
+        np.testing.assert_array_equal(outvalues, invalues * 2.)
+
+    def test_batch_out(self):
+
+        inputs = np.arange(20.).reshape(10, 2)
+        testDataset = Dataset(inputs, inputs[:, :1])
+        testDataset.shuffle(np.random.default_rng(0))
+
+        out = (np.empty((5, 2)), np.empty((5, 1), dtype=np.float32))
+        invalues, outvalues = testDataset.batch(5, out=out)
+
+        self.assertIs(invalues, out[0])
+        self.assertIs(outvalues, out[1])
+        np.testing.assert_array_equal(invalues, inputs[testDataset.indices[:5]])
+        np.testing.assert_array_equal(outvalues, inputs[testDataset.indices[:5], :1])
+
+    def test_batches(self):
+
+        testDataset = Dataset(np.arange(20.).reshape(10, 2), np.zeros((10, 1)))
+
+        batches = list(testDataset.batches(4))
+
+        self.assertListEqual([len(invalues) for invalues, _ in batches], [4, 4, 2])
+        np.testing.assert_array_equal(
+            np.concatenate([invalues for invalues, _ in batches]),
+            testDataset.inputs)
+
+    def test_load(self):
+
+        inputs = np.arange(20.).reshape(10, 2)
+        targets = np.arange(10, dtype=np.float32).reshape(10, 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            inputsFile = os.path.join(directory, "inputs.npy")
+            targetsFile = os.path.join(directory, "targets.npy")
+            Dataset(inputs, targets).save(inputsFile, targetsFile)
+
+            testDataset = Dataset.load(inputsFile, targetsFile)
+
+            # Values are memory-mapped, with the type of the files
+            self.assertTrue(testDataset.sorted)
+            self.assertIsInstance(testDataset.inputs.base, np.memmap)
+            self.assertEqual(testDataset.targets.dtype, np.float32)
+
+            # Minibatches are gathered in increasing index order
+            testDataset.shuffle(np.random.default_rng(0))
+            out = (np.empty((5, 2)), np.empty((5, 1)))
+            invalues, outvalues = testDataset.batch(5, start=3, out=out)
+            indices = np.sort(testDataset.indices[3:8])
+            np.testing.assert_array_equal(invalues, inputs[indices])
+            np.testing.assert_array_equal(outvalues, targets[indices])
+
+            del testDataset, invalues, outvalues
+
+    def test_load_nommap(self):
+
+        inputs = np.arange(20.).reshape(10, 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            inputsFile = os.path.join(directory, "inputs.npy")
+            targetsFile = os.path.join(directory, "targets.npy")
+            Dataset(inputs, inputs).save(inputsFile, targetsFile)
+
+            testDataset = Dataset.load(inputsFile, targetsFile, mmap=False)
+
+            self.assertFalse(testDataset.sorted)
+            self.assertNotIsInstance(testDataset.inputs.base, np.memmap)
+            np.testing.assert_array_equal(testDataset.inputs, inputs)
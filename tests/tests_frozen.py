@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from pybann import FrozenModel
+from tests.utils import create_model
+
+
+class tests_frozen(unittest.TestCase):
+
+    def test_initialize(self):
+
+        testModel = create_model([4, 8, 6, 3], ["relu", "tanhyp", "sigmoid"],
+                                 name="Test model")
+        frozen = testModel.freeze()
+
+        self.assertIsInstance(frozen, FrozenModel)
+        self.assertEqual(frozen.name, "Test model")
+        self.assertEqual(frozen.neurons, [4, 8, 6, 3])
+        self.assertEqual(frozen.parameters.nbytes, testModel.parameters.nbytes)
+
+        # Contiguous transposed weights, views into the parameters
+        for weights, biases, layer in zip(frozen.weights, frozen.biases,
+                                          testModel.layers[1:]):
+            self.assertTrue(weights.flags.c_contiguous)
+            self.assertTrue(np.shares_memory(weights, frozen.parameters))
+            self.assertTrue(np.shares_memory(biases, frozen.parameters))
+            np.testing.assert_array_equal(weights, layer.weights.T)
+            np.testing.assert_array_equal(biases, layer.biases[:, 0])
+            self.assertFalse(np.shares_memory(weights, testModel.parameters))
+
+    def test_predict(self):
+
+        testModel = create_model([4, 8, 6, 3], ["relu", "tanhyp", "sigmoid"],
+                                 name="Test model")
+        frozen = testModel.freeze()
+        inValues = np.random.randn(25, 4)
+
+        np.testing.assert_allclose(
+            frozen.predict(inValues, chunk_size=10),
+            testModel.predict(inValues), rtol=1.e-12)
+        np.testing.assert_allclose(
+            frozen.predict(inValues[0]), testModel.predict(inValues[:1]),
+            rtol=1.e-12)
+
+    def test_predict_one(self):
+
+        testModel = create_model([4, 8, 6, 3], ["relu", "tanhyp", "sigmoid"],
+                                 np.float32, name="Test model")
+        frozen = testModel.freeze()
+
+        for inValues in np.random.randn(5, 4):
+            outValues = frozen.predict_one(list(inValues))
+            self.assertEqual(outValues.shape, (3,))
+            self.assertEqual(outValues.dtype, np.float32)
+            np.testing.assert_allclose(
+                outValues, testModel.forward(inValues), atol=1.e-6)
+
+    def test_softmax(self):
+
+        np.random.seed(0)
+        testModel = create_model([4, 8, 3], ["relu", "softmax"])
+        frozen = testModel.freeze()
+        inValues = np.random.randn(20, 4)
+
+        np.testing.assert_allclose(frozen.predict(inValues),
+                                   testModel.predict(inValues))
+        np.testing.assert_allclose(frozen.predict_one(inValues[0]),
+                                   testModel.forward(inValues[0]))
+        np.testing.assert_allclose(np.sum(frozen.predict(inValues), axis=1),
+                                   1.)
@@ -1,4 +1,5 @@
 import unittest
+import tracemalloc
 import numpy as np
 from pybann import Model
 from pybann import GradientDescent
@@ -178,3 +179,199 @@ class tests_gradientdescent_batchsize0(unittest.TestCase):
         self.assertTupleEqual(np.shape(activation[2]), (3, 1))
         self.assertTupleEqual(np.shape(transfer[0]), (8, 1))
         self.assertTupleEqual(np.shape(transfer[1]), (3, 1))
+
+    def test_batchsplit(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        # Create Gradient descent instance
+        SGD = GradientDescent(dataset, 0, 0.05, 1000, 0.5, testModel.layers)
+        inValues, outValues = SGD.batchsplit(dataset)
+
+        self.assertTupleEqual(np.shape(inValues), (3, 4))
+        self.assertTupleEqual(np.shape(outValues), (3, 3))
+        self.assertListEqual(list(inValues[1]), [0., 1., 1., 0.])
+        self.assertListEqual(list(outValues[1]), [0., 1., 0.])
+
+    def test_backward_batch(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        # Create Gradient descent instance
+        SGD = GradientDescent(dataset, 0, 0.05, 1000, 0.5, testModel.layers)
+
+        # Per-sample gradients
+        SGD.init_update()
+        for data in dataset:
+            inValues, outValues = SGD.datasplit(data)
+            activation, transfer = SGD.forward(inValues)
+            SGD.backward(activation, transfer, outValues)
+        weightsUpdate = [layer.weightsUpdate.copy() for layer in SGD.layers[1:]]
+        biasesUpdate = [layer.biasesUpdate.copy() for layer in SGD.layers[1:]]
+
+        # Minibatch gradients
+        SGD.init_update()
+        inValues, outValues = SGD.batchsplit(dataset)
+        activation, transfer = SGD.forward(inValues)
+        SGD.backward(activation, transfer, outValues)
+
+        self.assertTupleEqual(np.shape(activation[1]), (8, 3))
+        for ilayer in range(1, len(SGD.layers)):
+            np.testing.assert_allclose(
+                SGD.layers[ilayer].weightsUpdate, weightsUpdate[ilayer-1],
+                atol=1.e-12)
+            np.testing.assert_allclose(
+                SGD.layers[ilayer].biasesUpdate, biasesUpdate[ilayer-1],
+                atol=1.e-12)
+
+    def test_update_buffers(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+        parameters = testModel.parameters.copy()
+
+        # Update layer by layer
+        SGD = GradientDescent(dataset, 0, 0.05, 1000, 0.5, testModel.layers)
+        testModel.gradients[:] = 1.
+        testModel.momentums[:] = 1.
+        SGD.update()
+        layerParameters = testModel.parameters.copy()
+
+        # Update the whole buffers at once
+        testModel.parameters[:] = parameters
+        testModel.momentums[:] = 1.
+        SGD = GradientDescent(
+            dataset, 0, 0.05, 1000, 0.5, testModel.layers,
+            buffers=(testModel.parameters, testModel.gradients,
+                     testModel.momentums))
+        SGD.update()
+
+        np.testing.assert_allclose(testModel.parameters, layerParameters)
+        np.testing.assert_allclose(testModel.parameters, parameters + 0.45)
+        np.testing.assert_allclose(testModel.momentums, 0.45)
+
+    def test_float32(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8, activation="relu")
+        testModel.addLayer(neurons=3, activation="tanhyp")
+
+        # Build
+        testModel.build(dtype=np.float32)
+
+        # Create Gradient descent instance
+        SGD = GradientDescent(
+            dataset, 0, 0.05, 1, 0.5, testModel.layers,
+            buffers=(testModel.parameters, testModel.gradients,
+                     testModel.momentums))
+        inValues, outValues = SGD.batchsplit(dataset)
+        activation, transfer = SGD.forward(inValues)
+        SGD.backward(activation, transfer, outValues)
+        SGD.update()
+
+        self.assertEqual(inValues.dtype, np.float32)
+        self.assertEqual(outValues.dtype, np.float32)
+        for array in activation + transfer + SGD.workspace.delta:
+            self.assertEqual(array.dtype, np.float32)
+        for ilayer in range(1, len(SGD.layers)):
+            self.assertEqual(SGD.layers[ilayer].activation(
+                transfer[ilayer-1]).dtype, np.float32)
+            self.assertEqual(SGD.layers[ilayer].activation(
+                transfer[ilayer-1], deriv=True).dtype, np.float32)
+        for array in SGD.optimizer.buffers.values():
+            self.assertEqual(array.dtype, np.float32)
+        for array in (testModel.parameters, testModel.gradients,
+                      testModel.momentums):
+            self.assertEqual(array.dtype, np.float32)
+
+    def test_steady_state_allocations(self):
+
+        rng = np.random.default_rng(0)
+        dataset = list(zip(rng.standard_normal((256, 32)),
+                           rng.random((256, 10))))
+
+        for activations in (["sigmoid", "sigmoid"], ["relu", "tanhyp"]):
+            testModel = Model()
+            testModel.addInput(neurons=32)
+            testModel.addLayer(neurons=64, activation=activations[0])
+            testModel.addLayer(neurons=10, activation=activations[1])
+            testModel.build()
+
+            SGD = GradientDescent(
+                dataset, 256, 0.05, 1, 0.5, testModel.layers,
+                buffers=(testModel.parameters, testModel.gradients,
+                         testModel.momentums))
+            inValues, outValues = SGD.batchsplit(dataset)
+
+            def step():
+                SGD.init_update()
+                activation, transfer = SGD.forward(inValues)
+                SGD.backward(activation, transfer, outValues)
+                SGD.update()
+
+            # Warm up (workspace and optimizer buffers)
+            step()
+
+            # Only small Python objects (lists of views) are allocated per
+            # batch, far less than a (64, 256) array of 131072 bytes
+            tracemalloc.start()
+            try:
+                step()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, 4096)
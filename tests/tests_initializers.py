@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from pybann import Initializer
+
+
+class tests_initializers(unittest.TestCase):
+
+    def test_scaling(self):
+
+        rng = np.random.default_rng(0)
+        shape, fan_in, fan_out = (400, 600), 600, 400
+
+        # Standard deviation scaled by the fan-in and fan-out
+        for name, std in [("normal", 1.),
+                          ("xavier", np.sqrt(2. / (fan_in + fan_out))),
+                          ("he", np.sqrt(2. / fan_in)),
+                          ("lecun", np.sqrt(1. / fan_in))]:
+            values = getattr(Initializer, name)(shape, fan_in, fan_out, rng)
+            self.assertEqual(values.shape, shape)
+            self.assertAlmostEqual(values.std(), std, delta=0.01 * std)
+            self.assertAlmostEqual(values.mean(), 0., delta=0.01 * std)
+
+        np.testing.assert_array_equal(
+            Initializer.zeros(shape, fan_in, fan_out, rng), 0.)
+
+    def test_rng(self):
+
+        # Reproducible given a seeded generator
+        np.testing.assert_array_equal(
+            Initializer.he((4, 3), 3, 4, np.random.default_rng(1)),
+            Initializer.he((4, 3), 3, 4, np.random.default_rng(1)))
+
+        # Global state by default, drawing the same values as np.random.randn
+        np.random.seed(0)
+        values = Initializer.normal((4, 3), 3, 4)
+        np.random.seed(0)
+        np.testing.assert_array_equal(values, np.random.randn(4, 3))
+
+        # No value drawn for zeros
+        rng = np.random.default_rng(2)
+        Initializer.zeros((4, 3), 3, 4, rng)
+        self.assertEqual(rng.standard_normal(),
+                         np.random.default_rng(2).standard_normal())
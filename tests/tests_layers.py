@@ -50,4 +50,28 @@ class tests_layers(unittest.TestCase):
         testLayer.add_weights(inputNeurons=8)
 
         self.assertTupleEqual(np.shape(testLayer.weights), (4, 8))
-        self.assertTupleEqual(np.shape(testLayer.weightsUpdate), (4, 8))
\ No newline at end of file
+        self.assertTupleEqual(np.shape(testLayer.weightsUpdate), (4, 8))
+
+    def test_bind_buffers(self):
+
+        testLayer = Layer(neurons=4)
+
+        buffers = (np.zeros(32), np.zeros(32), np.zeros(32))
+        testLayer.add_weights(inputNeurons=8, buffers=buffers)
+
+        self.assertTupleEqual(np.shape(testLayer.weights), (4, 8))
+        self.assertTrue(np.shares_memory(testLayer.weights, buffers[0]))
+        self.assertTrue(np.shares_memory(testLayer.weightsUpdate, buffers[1]))
+        self.assertTrue(np.shares_memory(testLayer.weightsUpdateSave, buffers[2]))
+        self.assertListEqual(list(testLayer.weights.flatten()), list(buffers[0]))
+
+    def test_add_initializer(self):
+
+        testLayer = Layer(neurons=4)
+        testLayer.add_initializer(weights="zeros", biases="zeros")
+
+        self.assertEqual(testLayer.weightsInit.__name__, "zeros")
+        testLayer.add_weights(inputNeurons=8, rng=np.random.default_rng(0))
+        testLayer.add_biases(rng=np.random.default_rng(0))
+        self.assertFalse(np.any(testLayer.weights))
+        self.assertFalse(np.any(testLayer.biases))
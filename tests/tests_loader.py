@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from pybann import CSVLoader
+from pybann import Dataset
+
+
+class tests_loader(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "test.csv")
+        with open(self.filename, 'w') as f:
+            f.write("a;b;c\n")
+            f.write("1.0;2.0;one\n")
+            f.write("3.0;4.0;two\n")
+            f.write("\n")
+            f.write("5.0;6.0;one\n")
+            f.write("7.0;8.0;three\n")
+            f.write("9.0;10.0;two\n")
+            f.write("\n")
+
+        self.labels = ["one", "two", "three"]
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_initialize(self):
+
+        testLoader = CSVLoader(self.filename, labels=self.labels,
+                               delimiter=";", skiprows=1)
+
+        self.assertListEqual(testLoader.inputs, [0, 1])
+        self.assertListEqual(testLoader.targets, [2])
+        self.assertEqual(testLoader.count(), 5)
+
+    def test_chunks(self):
+
+        testLoader = CSVLoader(self.filename, labels=self.labels,
+                               delimiter=";", chunksize=2, skiprows=1)
+
+        chunks = [(invalues.copy(), outvalues.copy())
+                  for invalues, outvalues in testLoader]
+
+        self.assertListEqual([len(invalues) for invalues, _ in chunks], [2, 2, 1])
+        np.testing.assert_array_equal(chunks[0][0], [[1., 2.], [3., 4.]])
+        np.testing.assert_array_equal(chunks[0][1], [[1., 0., 0.], [0., 1., 0.]])
+        np.testing.assert_array_equal(chunks[1][1], [[1., 0., 0.], [0., 0., 1.]])
+
+    def test_classify(self):
+
+        testLoader = CSVLoader(self.filename, labels=self.labels,
+                               delimiter=";", skiprows=1)
+
+        # Labels passed as str (NumPy >= 1.23) or bytes (NumPy < 1.23)
+        self.assertEqual(testLoader._classify(" two\n"), 1)
+        self.assertEqual(testLoader._classify(b" two\n"), 1)
+        self.assertEqual(testLoader._classify(b"four"), -1)
+
+    def test_numeric_targets(self):
+
+        filename = os.path.join(self.directory.name, "numeric.csv")
+        with open(filename, 'w') as f:
+            for i in range(5):
+                f.write("{},{},{}\n".format(i, 2*i, 3*i))
+
+        testLoader = CSVLoader(filename, targets=[1], dtype=np.float32)
+        testDataset = testLoader.load()
+
+        self.assertEqual(testDataset.inputs.dtype, np.float32)
+        np.testing.assert_array_equal(testDataset.inputs[:, 1], [0., 3., 6., 9., 12.])
+        np.testing.assert_array_equal(testDataset.targets[:, 0], [0., 2., 4., 6., 8.])
+
+    def test_unknown_label(self):
+
+        testLoader = CSVLoader(self.filename, labels=["one", "two"],
+                               delimiter=";", skiprows=1)
+
+        with self.assertRaises(ValueError):
+            testLoader.load()
+
+    def test_load(self):
+
+        testLoader = CSVLoader(self.filename, labels=self.labels,
+                               delimiter=";", chunksize=2, skiprows=1)
+        testDataset = testLoader.load()
+
+        self.assertIsInstance(testDataset, Dataset)
+        self.assertEqual(len(testDataset), 5)
+        np.testing.assert_array_equal(testDataset.inputs[:, 1], [2., 4., 6., 8., 10.])
+        np.testing.assert_array_equal(np.argmax(testDataset.targets, axis=1), [0, 1, 0, 2, 1])
+
+    def test_to_npy(self):
+
+        testLoader = CSVLoader(self.filename, labels=self.labels,
+                               delimiter=";", chunksize=2, skiprows=1)
+
+        inputsFile = os.path.join(self.directory.name, "inputs.npy")
+        targetsFile = os.path.join(self.directory.name, "targets.npy")
+        testLoader.to_npy(inputsFile, targetsFile)
+
+        testDataset = Dataset.load(inputsFile, targetsFile)
+        np.testing.assert_array_equal(testDataset.inputs, testLoader.load().inputs)
+        np.testing.assert_array_equal(testDataset.targets, testLoader.load().targets)
+        del testDataset
@@ -0,0 +1,161 @@
+import unittest
+import numpy as np
+from pybann import Model
+from pybann import Activation
+from pybann import GradientDescent
+from pybann import Loss
+from pybann import MSE
+from pybann import CrossEntropy
+
+
+class tests_losses(unittest.TestCase):
+
+    def gradient(self, loss, activation, transfer, targets, eps=1.e-6):
+
+        # Numerical gradient of the loss with respect to the transfer values
+        gradient = np.zeros_like(transfer)
+        for index in np.ndindex(transfer.shape):
+            shifted = transfer.copy()
+            shifted[index] += eps
+            upper = loss(activation(shifted), targets)
+            shifted[index] -= 2. * eps
+            lower = loss(activation(shifted), targets)
+            gradient[index] = (upper - lower) / (2. * eps)
+        return gradient
+
+    def delta(self, loss, activation, transfer, targets):
+
+        out = np.empty_like(transfer)
+        loss.delta(activation(transfer), targets, transfer.copy(), activation,
+                   out=out)
+        return out
+
+    def test_create(self):
+
+        self.assertIsInstance(Loss.create('mse'), MSE)
+        self.assertIsInstance(Loss.create('crossentropy'), CrossEntropy)
+        with self.assertRaises(KeyError):
+            Loss.create('hinge')
+
+    def test_mse(self):
+
+        np.random.seed(0)
+        transfer = np.random.randn(3, 5)
+        targets = np.random.rand(3, 5)
+        outputs = Activation.sigmoid(transfer)
+
+        self.assertAlmostEqual(MSE()(outputs, targets),
+                               np.sum((outputs - targets)**2))
+
+        # Stacked outputs
+        stacked = np.stack([outputs, 2. * outputs])
+        np.testing.assert_allclose(
+            MSE().stacked(stacked.copy(), targets),
+            [MSE()(values, targets) for values in stacked])
+
+        # Half the gradient of the squared errors
+        for name in ["sigmoid", "tanhyp", "softmax"]:
+            activation = getattr(Activation, name)
+            np.testing.assert_allclose(
+                self.delta(MSE(), activation, transfer, targets),
+                self.gradient(MSE(), activation, transfer, targets) / 2.,
+                atol=1.e-8)
+
+    def test_crossentropy(self):
+
+        np.random.seed(0)
+        transfer = np.random.randn(4, 6)
+        targets = np.eye(4)[:, np.random.randint(4, size=6)]
+        outputs = Activation.softmax(transfer)
+
+        self.assertAlmostEqual(CrossEntropy()(outputs, targets),
+                               -np.sum(np.log(outputs[targets == 1.])))
+
+        # Stacked outputs
+        stacked = np.stack([outputs, np.roll(outputs, 1, axis=0)])
+        np.testing.assert_allclose(
+            CrossEntropy().stacked(stacked.copy(), targets),
+            [CrossEntropy()(values, targets) for values in stacked])
+
+        # Fused gradient p - y
+        delta = self.delta(CrossEntropy(), Activation.softmax, transfer,
+                           targets)
+        np.testing.assert_array_equal(delta, outputs - targets)
+        np.testing.assert_allclose(
+            delta, self.gradient(CrossEntropy(), Activation.softmax,
+                                 transfer, targets), atol=1.e-8)
+
+    def test_crossentropy_large(self):
+
+        transfer = np.array([[1000., -1000.], [0., 1000.], [-1000., 0.]])
+        targets = np.array([[1., 0.], [0., 0.], [0., 1.]])
+        outputs = Activation.softmax(transfer)
+
+        delta = self.delta(CrossEntropy(), Activation.softmax, transfer,
+                           targets)
+        np.testing.assert_array_equal(delta, [[0., 0.], [0., 1.], [0., -1.]])
+
+        # Finite loss for an output value rounded to 0
+        loss = CrossEntropy()(outputs, targets)
+        self.assertTrue(np.isfinite(loss))
+        self.assertGreater(loss, 700.)
+
+    def test_output_activation(self):
+
+        testModel = Model()
+        testModel.addInput(neurons=2)
+        testModel.addLayer(neurons=3)
+        testModel.build()
+
+        with self.assertRaises(ValueError):
+            GradientDescent(
+                [((0., 1.), (1., 0., 0.))], 0, 0.1, 10, 0.5, testModel.layers,
+                loss=CrossEntropy())
+
+    def test_backward_gradient(self):
+
+        np.random.seed(0)
+        testModel = Model()
+        testModel.addInput(neurons=3)
+        testModel.addLayer(neurons=5, activation="tanhyp")
+        testModel.addLayer(neurons=4, activation="softmax")
+        testModel.build()
+
+        inValues = np.random.randn(6, 3)
+        outValues = np.eye(4)[np.random.randint(4, size=6)]
+
+        for loss in [MSE(), CrossEntropy()]:
+            SGD = GradientDescent(list(zip(inValues, outValues)), 0, 0.1, 1,
+                                  0.5, testModel.layers, loss=loss)
+            SGD.init_update()
+            activation, transfer = SGD.forward(inValues)
+            SGD.backward(activation, transfer, outValues)
+
+            # Numerical gradient of the loss with respect to the weights
+            for layer in testModel.layers[1:]:
+                gradient = np.zeros_like(layer.weights)
+                for index in np.ndindex(layer.weights.shape):
+                    value = layer.weights[index]
+                    layer.weights[index] = value + 1.e-6
+                    upper = loss(testModel.predict(inValues), outValues)
+                    layer.weights[index] = value - 1.e-6
+                    lower = loss(testModel.predict(inValues), outValues)
+                    layer.weights[index] = value
+                    gradient[index] = (upper - lower) / 2.e-6
+                if isinstance(loss, MSE):
+                    gradient /= 2.
+                np.testing.assert_allclose(layer.weightsUpdate, gradient,
+                                           atol=1.e-7)
+
+    def test_hidden_softmax(self):
+
+        testModel = Model()
+        testModel.addInput(neurons=2)
+        testModel.addLayer(neurons=4, activation="softmax")
+        testModel.addLayer(neurons=3)
+        testModel.build()
+
+        # The backpropagation through a hidden softmax is not supported
+        with self.assertRaises(ValueError):
+            GradientDescent(
+                [((0., 1.), (1., 0., 0.))], 0, 0.1, 10, 0.5, testModel.layers)
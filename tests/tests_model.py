@@ -1,7 +1,11 @@
 import unittest
 import os
+import pickle
+import tempfile
+import tracemalloc
 import numpy as np
 from pybann import Model
+from pybann import Dataset
 
 class tests_model(unittest.TestCase):
 
@@ -111,8 +115,14 @@ class tests_model(unittest.TestCase):
         testModel.addLayer(neurons=4)
         testModel.build()
 
-        testModel.save("tests_testsave")
-        self.assertTrue(os.path.isfile("tests_testsave"))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "network.bann")
+            testModel.save(filename)
+            self.assertTrue(os.path.isfile(filename))
+
+        # Not built
+        with self.assertRaises(ValueError):
+            Model().save(os.path.join(directory, "network.bann"))
 
     def test_load(self):
 
@@ -126,9 +136,395 @@ class tests_model(unittest.TestCase):
         testModel.addLayer(neurons=4)
         testModel.build()
 
-        testModel.save("tests_testsave")
-        testLoadModel = Model(name="Test model")
-        testLoadModel.load("tests_testsave")
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "network.bann")
+            testModel.save(filename)
+            testLoadModel = Model(name="Test model")
+            testLoadModel.load(filename, mmap_mode=None)
 
         self.assertTrue(isinstance(testLoadModel, Model))
-        self.assertEqual(testModel.name, testLoadModel.name)
\ No newline at end of file
+        self.assertEqual(testModel.name, testLoadModel.name)
+
+    def test_predict(self):
+
+        np.random.seed(0)
+
+        testModel = Model(name="Test model")
+
+        # Create a (3, 5, 4) model
+        testModel.addInput(neurons=3)
+        testModel.addLayer(neurons=5)
+        testModel.addLayer(neurons=4)
+        testModel.build()
+
+        inValues = np.random.randn(10, 3)
+        outValues = testModel.predict(inValues, chunk_size=4)
+
+        self.assertTupleEqual(np.shape(outValues), (10, 4))
+        for i in range(10):
+            np.testing.assert_allclose(
+                outValues[i], testModel.forward(inValues[i]), atol=1.e-12)
+
+    def test_build_buffers(self):
+
+        testModel = Model(name="Test model")
+
+        # Create a (3, 5, 4) model
+        testModel.addInput(neurons=3)
+        testModel.addLayer(neurons=5)
+        testModel.addLayer(neurons=4)
+        testModel.build()
+
+        self.assertEqual(len(testModel.parameters), 5*(3+1) + 4*(5+1))
+        for layer in testModel.layers[1:]:
+            self.assertTrue(np.shares_memory(layer.weights, testModel.parameters))
+            self.assertTrue(np.shares_memory(layer.biases, testModel.parameters))
+            self.assertTrue(np.shares_memory(layer.weightsUpdate, testModel.gradients))
+            self.assertTrue(np.shares_memory(layer.biasesUpdateSave, testModel.momentums))
+
+        # Buffers are bound again after unpickling
+        testLoadModel = pickle.loads(pickle.dumps(testModel))
+        testLoadModel.parameters[:] = 0.
+        for layer in testLoadModel.layers[1:]:
+            self.assertEqual(np.sum(np.abs(layer.weights)), 0.)
+            self.assertEqual(np.sum(np.abs(layer.biases)), 0.)
+
+    def test_SGD_optimizer(self):
+
+        np.random.seed(0)
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        for optimizer in ["momentum", "nesterov", "rmsprop", "adam"]:
+            testModel = Model(name="Test model")
+            testModel.addInput(neurons=4)
+            testModel.addLayer(neurons=8)
+            testModel.addLayer(neurons=3)
+            testModel.build()
+
+            testModel.SGD(dataset, alpha=0.05, nepoch=1000, optimizer=optimizer)
+
+            for inValues, outValues in dataset:
+                self.assertEqual(np.argmax(testModel.forward(inValues)),
+                                 np.argmax(outValues))
+
+    def test_build_dtype(self):
+
+        testModel = Model(name="Test model")
+
+        # Create a (3, 5, 4) model
+        testModel.addInput(neurons=3)
+        testModel.addLayer(neurons=5)
+        testModel.addLayer(neurons=4)
+        testModel.build(dtype=np.float32)
+
+        self.assertEqual(testModel.dtype, np.float32)
+        for layer in testModel.layers[1:]:
+            self.assertEqual(layer.weights.dtype, np.float32)
+            self.assertEqual(layer.biasesUpdateSave.dtype, np.float32)
+
+        self.assertEqual(testModel.forward([1., 1., 1.]).dtype, np.float32)
+        self.assertEqual(testModel.predict(np.ones((10, 3))).dtype, np.float32)
+
+    def test_SGD_mmap(self):
+
+        np.random.seed(0)
+
+        # Create a dataset
+        inputs = np.array([[1., 1., 0., 0.], [0., 1., 1., 0.], [0., 0., 1., 1.]])
+        targets = np.eye(3)
+
+        testModel = Model(name="Test model")
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+        testModel.build(dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as directory:
+            inputsFile = os.path.join(directory, "inputs.npy")
+            targetsFile = os.path.join(directory, "targets.npy")
+            np.save(inputsFile, inputs)
+            np.save(targetsFile, targets)
+
+            dataset = Dataset.load(inputsFile, targetsFile)
+            testModel.SGD(dataset, batchsize=2, alpha=0.5, nepoch=2000)
+            del dataset
+
+        np.testing.assert_array_equal(
+            np.argmax(testModel.predict(inputs), axis=1), [0, 1, 2])
+
+    def create_model(self, dtype=np.float64):
+
+        np.random.seed(0)
+
+        testModel = Model(name="Test model")
+
+        # Create a (3, 5, 4) model
+        testModel.addInput(neurons=3, label="Input")
+        testModel.addLayer(neurons=5, activation="relu", label="Hidden")
+        testModel.addLayer(neurons=4, activation="tanhyp")
+        testModel.build(dtype)
+
+        return testModel
+
+    def test_load_binary(self):
+
+        testModel = self.create_model(np.float32)
+        inValues = np.random.randn(10, 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            testModel.save(filename)
+
+            for mmap_mode in ['c', 'r', None]:
+                testLoadModel = Model()
+                testLoadModel.load(filename, mmap_mode=mmap_mode)
+
+                self.assertEqual(testLoadModel.name, "Test model")
+                self.assertEqual(testLoadModel.dtype, np.float32)
+                self.assertEqual(testLoadModel.layers[1].label, "Hidden")
+                self.assertEqual(
+                    testLoadModel.layers[1].activation.__name__, "relu")
+                self.assertIsNone(testLoadModel.gradients)
+                self.assertIsNone(testLoadModel.layers[1].weightsUpdate)
+                self.assertEqual(isinstance(testLoadModel.parameters, np.memmap),
+                                 mmap_mode is not None)
+                self.assertTrue(np.shares_memory(
+                    testLoadModel.layers[2].weights, testLoadModel.parameters))
+                np.testing.assert_array_equal(
+                    testLoadModel.predict(inValues), testModel.predict(inValues))
+                del testLoadModel
+
+    def test_load_train(self):
+
+        testModel = self.create_model()
+        dataset = [((1., 0., 0.), (1., 0., 0., 0.)),
+                   ((0., 1., 0.), (0., 1., 0., 0.))]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            testModel.save(filename)
+
+            # Copy on write or copy of the read-only parameters
+            for mmap_mode in ['c', 'r']:
+                testLoadModel = Model()
+                testLoadModel.load(filename, mmap_mode=mmap_mode)
+                testLoadModel.SGD(dataset, nepoch=10)
+
+                self.assertEqual(testLoadModel.gradients.shape,
+                                 testModel.parameters.shape)
+                self.assertFalse(np.array_equal(
+                    testLoadModel.parameters, testModel.parameters))
+                del testLoadModel
+
+            # The file is never modified
+            testLoadModel = Model()
+            testLoadModel.load(filename)
+            np.testing.assert_array_equal(
+                testLoadModel.parameters, testModel.parameters)
+            del testLoadModel
+
+    def test_load_pickle(self):
+
+        testModel = self.create_model()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.bann")
+            testModel.save(filename, pickled=True)
+
+            testLoadModel = Model()
+            testLoadModel.load(filename)
+
+        self.assertEqual(len(testLoadModel.layers), 3)
+        np.testing.assert_array_equal(
+            testLoadModel.parameters, testModel.parameters)
+        np.testing.assert_array_equal(
+            testLoadModel.momentums, testModel.momentums)
+
+    def test_evaluate(self):
+
+        testModel = self.create_model()
+        inValues = np.random.randn(30, 3)
+        outValues = np.eye(4)[np.random.randint(4, size=30)]
+
+        results = testModel.evaluate(inValues, outValues, chunk_size=7)
+
+        # Loop over the samples
+        loss = 0.
+        confusion = np.zeros((4, 4), dtype=int)
+        for values, expected in zip(inValues, outValues):
+            result = testModel.forward(values)
+            loss += np.sum((expected - result)**2)
+            confusion[np.argmax(expected), np.argmax(result)] += 1
+
+        self.assertAlmostEqual(results['loss'], loss / 30.)
+        np.testing.assert_array_equal(results['confusion'], confusion)
+        self.assertAlmostEqual(results['accuracy'],
+                               np.trace(confusion) / 30.)
+
+    def test_evaluate_binary(self):
+
+        np.random.seed(0)
+        testModel = Model()
+        testModel.addInput(neurons=2)
+        testModel.addLayer(neurons=1)
+        testModel.build()
+
+        inValues = np.random.randn(20, 2)
+        results = testModel.evaluate(inValues, np.ones((20, 1)))
+        predicted = testModel.predict(inValues)[:, 0] > 0.5
+
+        self.assertEqual(results['confusion'].shape, (2, 2))
+        self.assertEqual(results['confusion'][1, 1], np.sum(predicted))
+        self.assertAlmostEqual(results['accuracy'], np.mean(predicted))
+
+    def test_SGD_validation(self):
+
+        np.random.seed(0)
+        inputs = np.random.randn(60, 3)
+        targets = (inputs[:, :1] > 0).astype(float)
+        dataset = Dataset(inputs[:40], targets[:40])
+        validation = Dataset(inputs[40:], targets[40:])
+
+        testModel = Model()
+        testModel.addInput(neurons=3)
+        testModel.addLayer(neurons=6)
+        testModel.addLayer(neurons=1)
+        testModel.build()
+
+        testModel.SGD(dataset, alpha=0.5, nepoch=100000, validation=validation,
+                      patience=5, interval=10)
+
+        # Stopped early (otherwise too long) with the best weights restored
+        loss = testModel.evaluate(validation.inputs, validation.targets)['loss']
+        self.assertLess(loss, 0.1)
+
+    def test_profile(self):
+
+        testModel = self.create_model()
+        gradients = testModel.gradients.copy()
+        profile = testModel.profile(np.random.randn(10, 3), repeat=3)
+
+        self.assertEqual([layer['layer'] for layer in profile], [1, 2])
+        self.assertEqual([layer['parameters'] for layer in profile],
+                         [5 * 4, 4 * 6])
+        self.assertEqual(profile[0]['activation'], 'relu')
+        self.assertEqual(profile[0]['nbytes']['weightsUpdateSave'],
+                         5 * 3 * 8)
+        self.assertEqual(profile[1]['flops_forward'], (2 * 5 + 2) * 4 * 10)
+        for layer in profile:
+            self.assertGreater(layer['time_forward'], 0.)
+            self.assertGreater(layer['time_backward'], 0.)
+            self.assertGreaterEqual(layer['peak_backward'], 0)
+
+        # Gradients of the network model left untouched
+        np.testing.assert_array_equal(testModel.gradients, gradients)
+
+    def test_profile_without_reset_peak(self):
+
+        # Python 3.8, without tracemalloc.reset_peak
+        reset_peak = tracemalloc.__dict__.pop('reset_peak', None)
+        try:
+            profile = self.create_model().profile(np.random.randn(10, 3))
+        finally:
+            if reset_peak is not None:
+                tracemalloc.reset_peak = reset_peak
+
+        for layer in profile:
+            self.assertGreaterEqual(layer['peak_forward'], 0)
+            self.assertGreaterEqual(layer['peak_backward'], 0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_profile_binary(self):
+
+        testModel = self.create_model(np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'network.bann')
+            testModel.save(filename)
+            loadedModel = Model()
+            loadedModel.load(filename)
+
+            profile = loadedModel.profile(np.random.randn(10, 3))
+            self.assertEqual(profile[0]['nbytes']['weights'], 5 * 3 * 4)
+            self.assertEqual(profile[0]['nbytes']['weightsUpdate'], 0)
+            self.assertIsNone(loadedModel.gradients)
+            del loadedModel
+
+    def test_str(self):
+
+        testModel = self.create_model()
+        lines = str(testModel).splitlines()
+
+        self.assertEqual(len(lines), 6)
+        self.assertIn("Hidden", lines[3])
+        self.assertIn("relu", lines[3])
+        self.assertEqual(lines[-1], "Total: 44 parameters, {} bytes".format(
+            3 * 44 * 8))
+
+    def test_SGD_crossentropy(self):
+
+        np.random.seed(0)
+        inputs = np.random.randn(90, 2)
+        labels = (inputs[:, 0] > 0).astype(int) + (inputs[:, 1] > 0)
+        targets = np.eye(3)[labels]
+        dataset = Dataset(inputs, targets)
+
+        testModel = Model()
+        testModel.addInput(neurons=2)
+        testModel.addLayer(neurons=8, activation="tanhyp")
+        testModel.addLayer(neurons=3, activation="softmax")
+        testModel.build()
+
+        before = testModel.evaluate(inputs, targets, loss="crossentropy")
+        testModel.SGD(dataset, alpha=0.01, nepoch=500, loss="crossentropy",
+                      validation=dataset, patience=100, verbose=False)
+        after = testModel.evaluate(inputs, targets, loss="crossentropy")
+
+        self.assertLess(after['loss'], before['loss'] / 2.)
+        self.assertGreater(after['accuracy'], 0.9)
+
+        # Output layer not fused with the cross-entropy
+        testModel = self.create_model()
+        with self.assertRaises(ValueError):
+            testModel.SGD(dataset, loss="crossentropy")
+
+    def test_build_init(self):
+
+        def create_model(seed=None):
+            testModel = Model(seed=seed)
+            testModel.addInput(neurons=300)
+            testModel.addLayer(neurons=200, activation="relu", init="he",
+                               bias_init="zeros")
+            testModel.addLayer(neurons=4, activation="tanhyp", init="xavier")
+            testModel.build()
+            return testModel
+
+        testModel = create_model(seed=1)
+        self.assertFalse(np.any(testModel.layers[1].biases))
+        self.assertAlmostEqual(testModel.layers[1].weights.std(),
+                               np.sqrt(2. / 300), delta=1.e-3)
+        self.assertAlmostEqual(testModel.layers[2].weights.std(),
+                               np.sqrt(2. / 204), delta=1.e-2)
+
+        # Reproducible given the seed of the network model, independently
+        # of the global state
+        np.random.seed(5)
+        np.testing.assert_array_equal(create_model(seed=1).parameters,
+                                      testModel.parameters)
+        self.assertFalse(np.array_equal(create_model(seed=2).parameters,
+                                        testModel.parameters))
+
+        # Global state without seed
+        np.random.seed(0)
+        parameters = create_model().parameters
+        np.random.seed(0)
+        np.testing.assert_array_equal(create_model().parameters, parameters)
+
+        # The random generator is pickled with the network model
+        copied = pickle.loads(pickle.dumps(testModel))
+        np.testing.assert_array_equal(copied.rng.standard_normal(3),
+                                      testModel.rng.standard_normal(3))
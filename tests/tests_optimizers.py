@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from pybann import Optimizer, Momentum, Nesterov, RMSProp, Adam
+
+
+class tests_optimizers(unittest.TestCase):
+
+    def setUp(self):
+
+        np.random.seed(0)
+        self.parameters = np.random.randn(10)
+        self.gradients = [np.random.randn(10) for _ in range(3)]
+
+    def run_optimizer(self, optimizer):
+
+        parameters = self.parameters.copy()
+        update = np.zeros(10)
+        save = np.zeros(10)
+        for gradient in self.gradients:
+            update[:] = gradient
+            optimizer.step([(parameters, update, save)])
+        return parameters
+
+    def test_create(self):
+
+        self.assertIsInstance(Optimizer.create('momentum'), Momentum)
+        self.assertIsInstance(Optimizer.create('nesterov'), Nesterov)
+        self.assertIsInstance(Optimizer.create('rmsprop'), RMSProp)
+        self.assertIsInstance(Optimizer.create('adam'), Adam)
+        self.assertEqual(Optimizer.create('momentum', momentum=0.9).momentum, 0.9)
+        self.assertEqual(Optimizer.create('adam', alpha=0.1).alpha, 0.1)
+
+    def test_momentum(self):
+
+        parameters = self.parameters.copy()
+        velocity = np.zeros(10)
+        for gradient in self.gradients:
+            velocity = 0.5 * velocity - 0.05 * gradient
+            parameters = parameters + velocity
+
+        np.testing.assert_allclose(
+            self.run_optimizer(Momentum(alpha=0.05, momentum=0.5)), parameters)
+
+    def test_nesterov(self):
+
+        parameters = self.parameters.copy()
+        velocity = np.zeros(10)
+        for gradient in self.gradients:
+            velocity = 0.5 * velocity - 0.05 * gradient
+            parameters = parameters + 0.5 * velocity - 0.05 * gradient
+
+        np.testing.assert_allclose(
+            self.run_optimizer(Nesterov(alpha=0.05, momentum=0.5)), parameters)
+
+    def test_rmsprop(self):
+
+        parameters = self.parameters.copy()
+        average = np.zeros(10)
+        for gradient in self.gradients:
+            average = 0.9 * average + 0.1 * gradient**2
+            parameters = parameters - 0.01 * gradient / (np.sqrt(average) + 1.e-8)
+
+        np.testing.assert_allclose(
+            self.run_optimizer(RMSProp(alpha=0.01)), parameters)
+
+    def test_adam(self):
+
+        parameters = self.parameters.copy()
+        mean = np.zeros(10)
+        variance = np.zeros(10)
+        for t, gradient in enumerate(self.gradients, 1):
+            mean = 0.9 * mean + 0.1 * gradient
+            variance = 0.999 * variance + 0.001 * gradient**2
+            parameters = parameters - 0.01 * (mean / (1 - 0.9**t)) / (
+                np.sqrt(variance / (1 - 0.999**t)) + 1.e-8)
+
+        np.testing.assert_allclose(
+            self.run_optimizer(Adam(alpha=0.01)), parameters)
+
+    def test_inplace(self):
+
+        parameters = self.parameters.copy()
+        update = self.gradients[0].copy()
+        save = np.zeros(10)
+
+        optimizer = Adam()
+        optimizer.step([(parameters, update, save)])
+        scratch = optimizer.buffers[('scratch', 0)]
+        optimizer.step([(parameters, update, save)])
+
+        self.assertIs(optimizer.buffers[('scratch', 0)], scratch)
+        self.assertFalse(np.allclose(parameters, self.parameters))
@@ -0,0 +1,136 @@
+import unittest
+import numpy as np
+from pybann import Dataset
+from pybann import GradientDescent
+from pybann import ParallelGradientDescent
+from pybann import HogwildGradientDescent
+from pybann import IslandSwarm
+from pybann import Callback
+from tests.utils import create_model
+
+
+class tests_parallel(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = np.random.default_rng(0)
+        inputs = rng.standard_normal((40, 4))
+        self.dataset = Dataset(inputs, (inputs[:, :3] > 0).astype(float))
+
+    def test_initialize(self):
+
+        testModel = create_model([4, 8, 3])
+
+        SGD = ParallelGradientDescent(
+            self.dataset, 10, 0.05, 100, 0.5, testModel, nworkers=3)
+
+        self.assertEqual(SGD.nworkers, 3)
+        self.assertIs(SGD.model, testModel)
+        self.assertIs(SGD.buffers[0], testModel.parameters)
+
+    def test_run(self):
+
+        # Serial training
+        serialModel = create_model([4, 8, 3])
+        GradientDescent(
+            self.dataset, 10, 0.05, 5, 0.5, serialModel.layers,
+            buffers=(serialModel.parameters, serialModel.gradients,
+                     serialModel.momentums), seed=1).run()
+
+        # Parallel training, more workers than samples in a shard
+        for nworkers in [2, 3]:
+            parallelModel = create_model([4, 8, 3])
+            ParallelGradientDescent(
+                self.dataset, 10, 0.05, 5, 0.5, parallelModel,
+                seed=1, nworkers=nworkers).run()
+
+            np.testing.assert_allclose(
+                parallelModel.parameters, serialModel.parameters, atol=1.e-10)
+
+    def test_reproducible(self):
+
+        parameters = []
+        for _ in range(2):
+            testModel = create_model([4, 8, 3])
+            testModel.SGD(self.dataset, batchsize=10, nepoch=5, seed=2, nworkers=2)
+            parameters.append(testModel.parameters.copy())
+
+        np.testing.assert_array_equal(parameters[0], parameters[1])
+
+    def loss(self, testModel):
+
+        results = testModel.predict(self.dataset.inputs)
+        return np.mean(np.sum((self.dataset.targets - results)**2, axis=1))
+
+    def test_hogwild(self):
+
+        testModel = create_model([4, 8, 3])
+        gradients = testModel.gradients.copy()
+        initial = self.loss(testModel)
+
+        SGD = HogwildGradientDescent(
+            self.dataset, 5, 0.05, 200, 0.5, testModel, seed=3, nthreads=2)
+        self.assertIs(SGD.buffers[0], testModel.parameters)
+        SGD.run()
+
+        # The threads update the shared weights, with private gradients
+        self.assertLess(self.loss(testModel), initial)
+        np.testing.assert_array_equal(testModel.gradients, gradients)
+        self.assertTrue(np.shares_memory(
+            testModel.layers[1].weights, testModel.parameters))
+
+    def test_hogwild_error(self):
+
+        class Failing(Callback):
+            def on_epoch_end(self, epoch, logs):
+                if epoch == 3:
+                    raise ArithmeticError("epoch 3")
+                return False
+
+        SGD = HogwildGradientDescent(
+            self.dataset, 5, 0.05, 200, 0.5, create_model([4, 8, 3]), seed=3,
+            nthreads=2, callbacks=[Failing()], verbose=False)
+
+        # The exception of the first thread is raised once all have stopped
+        with self.assertRaises(ArithmeticError):
+            SGD.run()
+        self.assertTrue(SGD.stopped)
+
+    def test_SGD_nthreads(self):
+
+        testModel = create_model([4, 8, 3])
+        initial = self.loss(testModel)
+        testModel.SGD(self.dataset, batchsize=5, nepoch=200, nthreads=3)
+        self.assertLess(self.loss(testModel), initial)
+
+        with self.assertRaises(ValueError):
+            testModel.SGD(self.dataset, nepoch=1, nworkers=2, nthreads=2)
+
+    def test_islands(self):
+
+        testModel = create_model([4, 8, 3])
+        initial = self.loss(testModel)
+
+        swarm = IslandSwarm(self.dataset, testModel, nparticles=8, nepoch=30,
+                            seed=0, islands=3, migration=5)
+        self.assertEqual(len(swarm.swarms), 3)
+        swarm.run()
+
+        # Best particle of all the islands
+        self.assertLess(self.loss(testModel), initial)
+        self.assertAlmostEqual(self.loss(testModel), np.min(swarm.losses))
+
+        with self.assertRaises(ValueError):
+            IslandSwarm(self.dataset, testModel, topology='star')
+
+    def test_PSO_islands(self):
+
+        parameters = []
+        for topology in ['ring', 'ring', 'full']:
+            testModel = create_model([4, 8, 3])
+            testModel.PSO(self.dataset, nparticles=8, nepoch=20, seed=1,
+                          islands=2, migration=4, topology=topology)
+            parameters.append(testModel.parameters.copy())
+
+        # Reproducible given a seed
+        np.testing.assert_array_equal(parameters[0], parameters[1])
@@ -0,0 +1,105 @@
+import unittest
+import pickle
+import numpy as np
+from pybann import Dataset
+from pybann import ParticleSwarm
+from pybann import CrossEntropy
+from tests.utils import create_model
+
+
+class tests_pso(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = np.random.default_rng(0)
+        inputs = rng.standard_normal((40, 4))
+        self.dataset = Dataset(inputs, (inputs[:, :3] > 0).astype(float))
+
+    def loss(self, testModel):
+
+        results = testModel.predict(self.dataset.inputs)
+        return np.mean(np.sum((self.dataset.targets - results)**2, axis=1))
+
+    def test_initialize(self):
+
+        testModel = create_model([4, 8, 3], ["tanhyp", "sigmoid"])
+        swarm = ParticleSwarm(self.dataset, testModel, nparticles=5, seed=0)
+
+        self.assertEqual(swarm.positions.shape, (5, len(testModel.parameters)))
+        np.testing.assert_array_equal(swarm.positions[0], testModel.parameters)
+
+        # Layer views into the positions
+        biases, weights = swarm.views[1]
+        self.assertEqual(biases.shape, (5, 8, 1))
+        self.assertEqual(weights.shape, (5, 8, 4))
+        self.assertTrue(np.shares_memory(weights, swarm.positions))
+        np.testing.assert_array_equal(weights[0], testModel.layers[1].weights)
+        np.testing.assert_array_equal(biases[0], testModel.layers[1].biases)
+
+    def test_pickle(self):
+
+        testModel = create_model([4, 8, 3], ["tanhyp", "sigmoid"])
+        swarm = pickle.loads(pickle.dumps(
+            ParticleSwarm(self.dataset, testModel, nparticles=5, seed=0)))
+
+        # Layer views bound back to the positions
+        self.assertTrue(np.shares_memory(swarm.views[2][1], swarm.positions))
+
+    def test_evaluate(self):
+
+        testModel = create_model([4, 8, 3], ["tanhyp", "sigmoid"])
+        swarm = ParticleSwarm(self.dataset, testModel, nparticles=5, seed=0)
+        losses = swarm.evaluate(self.dataset.inputs, self.dataset.targets)
+
+        # Same losses as the feed forward of each particle
+        for position, loss in zip(swarm.positions, losses):
+            testModel.parameters[...] = position
+            self.assertAlmostEqual(loss, self.loss(testModel))
+
+    def test_evaluate_crossentropy(self):
+
+        testModel = create_model([4, 3], ["softmax"])
+        targets = np.eye(3)[np.argmax(self.dataset.inputs[:, :3], axis=1)]
+
+        swarm = ParticleSwarm(self.dataset, testModel, nparticles=5, seed=0,
+                              loss=CrossEntropy())
+        losses = swarm.evaluate(self.dataset.inputs, targets)
+
+        for position, loss in zip(swarm.positions, losses):
+            testModel.parameters[...] = position
+            self.assertAlmostEqual(loss, CrossEntropy()(
+                testModel.predict(self.dataset.inputs), targets) / 40)
+
+        # The cross-entropy requires a softmax output layer
+        with self.assertRaises(ValueError):
+            ParticleSwarm(self.dataset, create_model([4, 8, 3],
+                                                     ["tanhyp", "sigmoid"]),
+                          loss=CrossEntropy())
+
+    def test_run(self):
+
+        testModel = create_model([4, 8, 3], ["tanhyp", "sigmoid"])
+        initial = self.loss(testModel)
+
+        swarm = ParticleSwarm(
+            self.dataset, testModel, nparticles=16, nepoch=50, seed=0)
+        swarm.run()
+
+        self.assertLess(self.loss(testModel), initial)
+        self.assertAlmostEqual(self.loss(testModel), np.min(swarm.losses))
+        np.testing.assert_array_equal(
+            testModel.parameters, swarm.bests[swarm.best])
+
+    def test_PSO(self):
+
+        parameters = []
+        for _ in range(2):
+            testModel = create_model([4, 8, 3], ["tanhyp", "sigmoid"],
+                                     np.float32)
+            testModel.PSO(self.dataset, nparticles=8, nepoch=20,
+                          batchsize=10, seed=1)
+            self.assertEqual(testModel.parameters.dtype, np.float32)
+            parameters.append(testModel.parameters.copy())
+
+        # Reproducible given a seed
+        np.testing.assert_array_equal(parameters[0], parameters[1])
@@ -0,0 +1,176 @@
+import unittest
+import asyncio
+import json
+import numpy as np
+from unittest import mock
+from pybann import BatchingPredictor
+from pybann.serving import Statistics, serve
+from tests.utils import create_model
+
+
+class tests_serving(unittest.TestCase):
+
+    def test_statistics(self):
+
+        stats = Statistics(window=3)
+        stats.record_batch(2)
+        stats.record_batch(4)
+        for latency in [0.001, 0.002, 0.003, 0.004]:
+            stats.record_latency(latency)
+
+        summary = stats.summary()
+        self.assertEqual(summary['requests'], 6)
+        self.assertEqual(summary['batches'], 2)
+        self.assertEqual(summary['batch_size'], 3.)
+        self.assertAlmostEqual(summary['p50'], 3.)
+        self.assertEqual(len(stats.latencies), 3)
+
+    def test_statistics_throughput(self):
+
+        # One request completed every 10 ms, each of latency 10 ms
+        stats = Statistics(window=10)
+        with mock.patch('time.perf_counter',
+                        side_effect=[0.01 * i for i in range(1, 101)]):
+            for _ in range(100):
+                stats.record_latency(0.01)
+
+        # Over the window, not the time since the first request
+        summary = stats.summary()
+        self.assertEqual(summary['requests'], 0)
+        self.assertAlmostEqual(summary['throughput'], 100.)
+
+    def test_predict(self):
+
+        testModel = create_model([4, 8, 3], ["relu", "sigmoid"])
+        inValues = np.random.randn(50, 4)
+
+        async def main():
+            async with BatchingPredictor(testModel.freeze(), max_batch_size=16,
+                                         max_wait=0.01) as predictor:
+                results = await asyncio.gather(
+                    *[predictor.predict(values) for values in inValues])
+            return results, predictor.stats.summary()
+
+        results, summary = asyncio.run(main())
+
+        np.testing.assert_allclose(results, testModel.predict(inValues))
+
+        # Concurrent requests are coalesced in micro-batches
+        self.assertEqual(summary['requests'], 50)
+        self.assertEqual(summary['batches'], 4)
+        self.assertGreater(summary['p99'], 0.)
+
+    def test_predict_error(self):
+
+        testModel = create_model([4, 8, 3], ["relu", "sigmoid"])
+
+        async def main():
+            async with BatchingPredictor(testModel) as predictor:
+                with self.assertRaises(ValueError):
+                    await predictor.predict(np.ones(5))
+                with self.assertRaises(ValueError):
+                    await predictor.predict(np.array(['a', 'b', 'c', 'd']))
+                return await predictor.predict(np.ones(4))
+
+        # The predictor keeps serving after an error
+        np.testing.assert_allclose(
+            asyncio.run(main()), testModel.forward(np.ones(4)))
+
+    def test_predict_invalid_request(self):
+
+        testModel = create_model([4, 8, 3], ["relu", "sigmoid"])
+        inValues = [np.ones(4), np.zeros(4), ['a', 'b', 'c', 'd'], -np.ones(4)]
+
+        async def main():
+            async with BatchingPredictor(testModel,
+                                         max_wait=0.01) as predictor:
+                results = await asyncio.gather(
+                    *[predictor.predict(values) for values in inValues],
+                    return_exceptions=True)
+            return results, predictor.stats.summary()
+
+        results, summary = asyncio.run(main())
+
+        # The invalid request fails alone, the others being batched
+        self.assertIsInstance(results[2], ValueError)
+        for i in (0, 1, 3):
+            np.testing.assert_allclose(
+                results[i], testModel.forward(np.asarray(inValues[i])))
+        self.assertEqual(summary['batches'], 1)
+        self.assertEqual(summary['errors'], 0)
+
+    def test_predict_feed_forward_error(self):
+
+        testModel = create_model([4, 8, 3], ["relu", "sigmoid"])
+
+        async def main():
+            async with BatchingPredictor(testModel) as predictor:
+                with mock.patch.object(testModel, 'predict',
+                                       side_effect=ArithmeticError):
+                    with self.assertRaises(ArithmeticError):
+                        await predictor.predict(np.ones(4))
+                return await predictor.predict(np.ones(4))
+
+        # The predictor keeps serving after an error of the feed forward
+        np.testing.assert_allclose(
+            asyncio.run(main()), testModel.forward(np.ones(4)))
+
+    def test_predict_stopped(self):
+
+        predictor = BatchingPredictor(
+            create_model([4, 8, 3], ["relu", "sigmoid"]))
+
+        async def main():
+            async with predictor:
+                await predictor.predict(np.ones(4))
+            await predictor.predict(np.ones(4))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(asyncio.wait_for(main(), timeout=5.))
+
+    def test_predict_not_started(self):
+
+        predictor = BatchingPredictor(create_model([4, 8, 3],
+                                                   ["relu", "sigmoid"]))
+        with self.assertRaises(RuntimeError):
+            asyncio.run(predictor.predict(np.ones(4)))
+
+    def test_serve(self):
+
+        testModel = create_model([4, 8, 3], ["relu", "sigmoid"])
+        inValues = np.random.randn(10, 4)
+
+        async def main():
+            started = asyncio.get_running_loop().create_future()
+            server = asyncio.ensure_future(serve(testModel, port=0,
+                                                 started=started))
+            host, port = await started
+
+            reader, writer = await asyncio.open_connection(host, port)
+            for i, values in enumerate(inValues):
+                writer.write(json.dumps(
+                    {'id': i, 'inputs': values.tolist()}).encode() + b'\n')
+            writer.write(b'not json\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline())
+                         for _ in range(len(inValues) + 1)]
+
+            writer.write(b'{"stats": true}\n')
+            stats = json.loads(await reader.readline())
+            writer.close()
+
+            server.cancel()
+            try:
+                await server
+            except asyncio.CancelledError:
+                pass
+            return responses, stats
+
+        responses, stats = asyncio.run(main())
+
+        outputs = {response['id']: response['outputs']
+                   for response in responses if 'id' in response}
+        np.testing.assert_allclose([outputs[i] for i in range(10)],
+                                   testModel.predict(inValues))
+        self.assertEqual(sum('error' in response for response in responses), 1)
+        self.assertEqual(stats['requests'], 10)
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from pybann import EarlyStopping
+from pybann import GradientDescent
+from tests.utils import create_model
+
+
+class tests_stopping(unittest.TestCase):
+
+    def test_call(self):
+
+        testModel = create_model([3, 6, 1])
+        inValues = np.random.randn(10, 3)
+        outValues = np.random.rand(10, 1)
+        stopping = EarlyStopping(testModel, inValues, outValues,
+                                 patience=2, interval=3)
+
+        # Evaluated every 3 epochs
+        logs = {}
+        self.assertFalse(stopping.on_epoch_end(0, logs))
+        self.assertEqual(len(stopping.losses), 0)
+        self.assertNotIn('val_loss', logs)
+        self.assertFalse(stopping.on_epoch_end(2, logs))
+        self.assertEqual(stopping.best_epoch, 2)
+        self.assertEqual(logs['val_loss'], stopping.best)
+        best = testModel.parameters.copy()
+
+        # No improvement
+        testModel.parameters[...] = 100.
+        self.assertFalse(stopping.on_epoch_end(5, {}))
+        self.assertTrue(stopping.on_epoch_end(8, {}))
+        self.assertEqual(stopping.stopped_epoch, 8)
+
+        stopping.restore()
+        np.testing.assert_array_equal(testModel.parameters, best)
+
+    def test_run(self):
+
+        testModel = create_model([3, 6, 1])
+        inputs = np.random.randn(60, 3)
+        targets = (inputs[:, :1] > 0).astype(float)
+        stopping = EarlyStopping(testModel, inputs[40:], targets[40:],
+                                 patience=5, interval=10)
+
+        SGD = GradientDescent(
+            list(zip(inputs[:40], targets[:40])), 0, 0.5, 100000, 0.5,
+            testModel.layers, buffers=(testModel.parameters,
+                                       testModel.gradients,
+                                       testModel.momentums),
+            callbacks=[stopping], verbose=False)
+        SGD.run()
+
+        self.assertIsNotNone(stopping.stopped_epoch)
+        self.assertEqual(stopping.stopped_epoch,
+                         stopping.best_epoch + 5 * 10)
+        self.assertEqual(len(stopping.losses),
+                         (stopping.stopped_epoch + 1) // 10)
+        self.assertEqual(stopping.best, min(stopping.losses))
+
+        # Best weights and biases restored at the end of the training
+        self.assertEqual(testModel.evaluate(inputs[40:], targets[40:])['loss'],
+                         stopping.best)
@@ -0,0 +1,106 @@
+import unittest
+import numpy as np
+from pybann import Model
+from pybann import Workspace
+from pybann import GradientDescent
+
+
+class tests_workspace(unittest.TestCase):
+
+    def test_initialize(self):
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        testWorkspace = Workspace(testModel.layers, batchsize=10)
+
+        self.assertEqual(testWorkspace.batchsize, 10)
+        self.assertEqual(len(testWorkspace.activation), 2)
+        self.assertEqual(len(testWorkspace.transfer), 2)
+        self.assertEqual(len(testWorkspace.delta), 2)
+        self.assertTupleEqual(np.shape(testWorkspace.weightsUpdate[0]), (8, 4))
+        self.assertTupleEqual(np.shape(testWorkspace.biasesUpdate[1]), (3, 1))
+
+    def test_views(self):
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        testWorkspace = Workspace(testModel.layers, batchsize=10)
+        activation, transfer, delta = testWorkspace.views(5)
+
+        self.assertIsNone(activation[0])
+        self.assertTupleEqual(np.shape(activation[1]), (8, 5))
+        self.assertTupleEqual(np.shape(transfer[1]), (3, 5))
+        self.assertTupleEqual(np.shape(delta[0]), (8, 5))
+        self.assertTrue(activation[1].flags['C_CONTIGUOUS'])
+        self.assertTrue(np.shares_memory(activation[1], testWorkspace.activation[0]))
+
+        # Views are reused
+        self.assertIs(testWorkspace.views(5)[1][0], transfer[0])
+
+    def test_inputs(self):
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        testWorkspace = Workspace(testModel.layers, batchsize=10)
+        inValues, outValues = testWorkspace.inputs(5)
+
+        self.assertTupleEqual(np.shape(inValues), (5, 4))
+        self.assertTupleEqual(np.shape(outValues), (5, 3))
+        self.assertTrue(np.shares_memory(inValues, testWorkspace.invalues))
+
+    def test_forward(self):
+
+        # Create a dataset
+        dataset = []
+        dataset.append([(1., 1., 0., 0.), (1., 0., 0.)])
+        dataset.append([(0., 1., 1., 0.), (0., 1., 0.)])
+        dataset.append([(0., 0., 1., 1.), (0., 0., 1.)])
+
+        # Create a model
+        testModel = Model()
+
+        # Add Layers
+        testModel.addInput(neurons=4)
+        testModel.addLayer(neurons=8)
+        testModel.addLayer(neurons=3)
+
+        # Build
+        testModel.build()
+
+        # Forward writes in the workspace buffers
+        SGD = GradientDescent(dataset, 0, 0.05, 1000, 0.5, testModel.layers)
+        inValues, outValues = SGD.batchsplit(dataset)
+        activation, transfer = SGD.forward(inValues)
+
+        self.assertTrue(np.shares_memory(activation[-1], SGD.workspace.activation[-1]))
+        self.assertTrue(np.shares_memory(transfer[0], SGD.workspace.transfer[0]))
+        for i in range(3):
+            np.testing.assert_allclose(
+                activation[-1][:, i], testModel.forward(inValues[i]), atol=1.e-12)
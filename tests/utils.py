@@ -0,0 +1,52 @@
+"""utils.py
+"""
+
+import numpy as np
+from pybann import Model
+
+
+def create_model(layers: list, activations: list = None, dtype=np.float64,
+                 name: str = "New model") -> Model:
+    """
+    Return a built network model of the test cases
+
+    The weights and biases are drawn from the `np.random` global state
+    seeded with 0, so that the network model is the same for every call.
+
+    Parameters
+    ----------
+    layers: list of int
+        numbers of neurons of the layers, input layer first
+    activations: list of str, optional
+        activation functions of the layers after the input layer
+        (default: 'sigmoid')
+    dtype: data-type, optional
+        type of the weights and biases (default: np.float64)
+    name: str, optional
+        name of the network model
+
+    Examples
+    --------
+
+    >>> from tests.utils import create_model
+    >>> create_model([4, 8, 3], ["relu", "sigmoid"]).layers[1].neurons
+    8
+
+    """
+    if activations is None:
+        activations = ["sigmoid"] * (len(layers) - 1)
+
+    np.random.seed(0)
+
+    # Create a model
+    testModel = Model(name=name)
+
+    # Add Layers
+    testModel.addInput(neurons=layers[0])
+    for neurons, activation in zip(layers[1:], activations):
+        testModel.addLayer(neurons=neurons, activation=activation)
+
+    # Build
+    testModel.build(dtype)
+
+    return testModel